@@ -1,6 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from threading import Lock
+from typing import Annotated
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 
@@ -10,12 +11,15 @@ from ..dependencies import (
     get_price_repo,
     get_user_repo,
     get_ingestion_service,
+    get_scrape_run_repo,
+    get_scrape_job_repo,
     get_current_user,
     require_admin,
 )
 from ..domain.enums import ProductCategory, ShopName
 from ..domain.models import Product, Shop, User
-from ..domain.repositories import RepositoryError
+from ..domain.pagination import InvalidCursor
+from ..domain.repositories import PriceRepository, RepositoryError, ScrapeRunRepository
 from ..infrastructure.mongo.connection import get_database
 from ..schemas.admin import (
     AdminStatsResponse,
@@ -26,6 +30,9 @@ from ..schemas.admin import (
     AdminSystemSummary,
     AdminScrapeResponse,
     AdminScrapeStatusResponse,
+    AdminScrapeMetricsResponse,
+    AdminScrapeRunMetrics,
+    AdminScraperMetrics,
     AdminProductCreateRequest,
     AdminProductUpdateRequest,
     AdminProductResponse,
@@ -41,6 +48,8 @@ from ..schemas.admin import (
     AdminDeleteResponse,
 )
 from ..services.auth_service import hash_password, ADMIN_EMAIL
+from ..services.ingestion_service import IngestionService
+from ..services.scraping.metrics import run_totals
 from ..config import settings
 
 router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
@@ -52,6 +61,7 @@ class _ScrapeState:
     total: int = 0
     completed: int = 0
     current_store: str | None = None
+    current_stores: list[str] = field(default_factory=list)
     started_at: datetime | None = None
     finished_at: datetime | None = None
     last_error: str | None = None
@@ -61,6 +71,11 @@ _scrape_state = _ScrapeState()
 _scrape_lock = Lock()
 
 
+def _store_label(scraper) -> str:
+    store_value = getattr(scraper, "store", None)
+    return getattr(store_value, "value", None) or str(store_value or "")
+
+
 def _run_scrape_with_progress(ingestion_service) -> None:
     now = datetime.now(timezone.utc)
     scrapers = list(getattr(ingestion_service, "scrapers", []))
@@ -69,26 +84,38 @@ def _run_scrape_with_progress(ingestion_service) -> None:
         _scrape_state.total = len(scrapers)
         _scrape_state.completed = 0
         _scrape_state.current_store = None
+        _scrape_state.current_stores = []
         _scrape_state.started_at = _scrape_state.started_at or now
         _scrape_state.finished_at = None
         _scrape_state.last_error = None
-    for index, scraper in enumerate(scrapers, start=1):
-        store_value = getattr(scraper, "store", None)
-        store_label = getattr(store_value, "value", None) or str(store_value or "")
+
+    # Scrapers run concurrently, so progress tracks the set of in-flight stores.
+    def on_start(scraper) -> None:
         with _scrape_lock:
-            _scrape_state.current_store = store_label or None
-        try:
-            ingestion_service._ingest_scraper(scraper, now)
-        except Exception as exc:
-            with _scrape_lock:
-                _scrape_state.last_error = str(exc) or "Scrape failed"
-        finally:
-            with _scrape_lock:
-                _scrape_state.completed = index
-    with _scrape_lock:
-        _scrape_state.running = False
-        _scrape_state.current_store = None
-        _scrape_state.finished_at = datetime.now(timezone.utc)
+            _scrape_state.current_stores.append(_store_label(scraper))
+            _scrape_state.current_store = _scrape_state.current_stores[0]
+
+    def on_done(scraper, outcome) -> None:
+        label = _store_label(scraper)
+        with _scrape_lock:
+            if label in _scrape_state.current_stores:
+                _scrape_state.current_stores.remove(label)
+            _scrape_state.current_store = _scrape_state.current_stores[0] if _scrape_state.current_stores else None
+            _scrape_state.completed = min(_scrape_state.total, _scrape_state.completed + 1)
+            if outcome.error:
+                _scrape_state.last_error = f"{label}: {outcome.error}"
+
+    try:
+        ingestion_service.run_all(on_start=on_start, on_done=on_done)
+    except Exception as exc:
+        with _scrape_lock:
+            _scrape_state.last_error = str(exc) or "Scrape failed"
+    finally:
+        with _scrape_lock:
+            _scrape_state.running = False
+            _scrape_state.current_store = None
+            _scrape_state.current_stores = []
+            _scrape_state.finished_at = datetime.now(timezone.utc)
 
 
 def _normalize_text(value: str | None) -> str | None:
@@ -263,6 +290,8 @@ def admin_insights(
         scrape_retries=settings.scrape_retries,
         scrape_backoff_sec=settings.scrape_backoff_sec,
         scrape_delay_sec=settings.scrape_delay_sec,
+        scrape_rate_per_sec=settings.scrape_rate_per_sec,
+        scrape_rate_burst=settings.scrape_rate_burst,
     )
 
     return AdminInsightsResponse(
@@ -273,11 +302,42 @@ def admin_insights(
     )
 
 
+def _queued_scrape_status(job_repo, ingestion_service) -> AdminScrapeStatusResponse:
+    """Progress of the latest queued run, as reported by the workers' jobs."""
+    run_id = job_repo.latest_run_id()
+    jobs = job_repo.jobs_for_run(run_id) if run_id else []
+    stores = {scraper.key: _store_label(scraper) for scraper in getattr(ingestion_service, "scrapers", [])}
+    running = [stores.get(job.scraper_key, job.scraper_key) for job in jobs if job.status == "running"]
+    finished = [job for job in jobs if job.status in ("done", "failed")]
+    open_jobs = len(finished) < len(jobs)
+    finished_at = None
+    if jobs and not open_jobs:
+        finished_at = max((job.finished_at for job in finished if job.finished_at), default=None)
+    last_error = None
+    for job in finished:
+        if job.error:
+            last_error = f"{stores.get(job.scraper_key, job.scraper_key)}: {job.error}"
+    return AdminScrapeStatusResponse(
+        running=open_jobs,
+        total=len(jobs),
+        completed=len(finished),
+        current_store=running[0] if running else None,
+        current_stores=running,
+        started_at=jobs[0].run_started_at if jobs else None,
+        finished_at=finished_at,
+        last_error=last_error,
+    )
+
+
 @router.post("/scrape", response_model=AdminScrapeResponse, status_code=status.HTTP_202_ACCEPTED)
 def admin_scrape(
     background_tasks: BackgroundTasks,
     ingestion_service=Depends(get_ingestion_service),
 ):
+    if settings.scrape_queue:
+        # Workers claim the jobs; this process only queues them.
+        run_id = ingestion_service.enqueue_run(get_scrape_job_repo())
+        return AdminScrapeResponse(status="ok", message=f"Scrape queued as run {run_id}")
     with _scrape_lock:
         if _scrape_state.running:
             return AdminScrapeResponse(status="running", message="Scrape already running")
@@ -285,6 +345,7 @@ def admin_scrape(
         _scrape_state.total = len(getattr(ingestion_service, "scrapers", []))
         _scrape_state.completed = 0
         _scrape_state.current_store = None
+        _scrape_state.current_stores = []
         _scrape_state.started_at = datetime.now(timezone.utc)
         _scrape_state.finished_at = None
         _scrape_state.last_error = None
@@ -293,31 +354,77 @@ def admin_scrape(
 
 
 @router.get("/scrape/status", response_model=AdminScrapeStatusResponse)
-def admin_scrape_status():
+def admin_scrape_status(ingestion_service: Annotated[IngestionService, Depends(get_ingestion_service)]):
+    if settings.scrape_queue:
+        return _queued_scrape_status(get_scrape_job_repo(), ingestion_service)
     with _scrape_lock:
         return AdminScrapeStatusResponse(
             running=_scrape_state.running,
             total=_scrape_state.total,
             completed=_scrape_state.completed,
             current_store=_scrape_state.current_store,
+            current_stores=list(_scrape_state.current_stores),
             started_at=_scrape_state.started_at,
             finished_at=_scrape_state.finished_at,
             last_error=_scrape_state.last_error,
         )
 
 
+@router.get("/scrape/metrics", response_model=AdminScrapeMetricsResponse)
+def admin_scrape_metrics(
+    run_repo: Annotated[ScrapeRunRepository | None, Depends(get_scrape_run_repo)],
+    limit: int = Query(5, ge=1, le=50),
+):
+    if run_repo is None:
+        return AdminScrapeMetricsResponse(runs=[])
+    runs = []
+    for run in run_repo.recent_runs(limit):
+        duration = (run.finished_at - run.started_at).total_seconds() if run.finished_at else None
+        scrapers = [
+            AdminScraperMetrics(
+                scraper=key,
+                status=state.status,
+                items=state.items,
+                error=state.error,
+                metrics=state.metrics,
+            )
+            for key, state in sorted(run.scrapers.items())
+        ]
+        runs.append(
+            AdminScrapeRunMetrics(
+                id=run.id,
+                status=run.status,
+                started_at=run.started_at,
+                finished_at=run.finished_at,
+                totals=run_totals((state.metrics for state in run.scrapers.values() if state.metrics), duration),
+                scrapers=scrapers,
+            )
+        )
+    return AdminScrapeMetricsResponse(runs=runs)
+
+
 @router.get("/products", response_model=AdminProductListResponse)
 def admin_list_products(
     q: str | None = Query(None, description="Search by name"),
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Numbered paging; prefer `after` for next pages"),
+    after: str | None = Query(None, description="next_after token from the previous page"),
+    with_total: bool = Query(True, description="Also count all matches"),
     product_repo=Depends(get_product_repo),
 ):
-    products = product_repo.search(q, limit=limit, offset=offset)
-    total = product_repo.count(q)
+    next_after = None
+    if offset and after is None:
+        products = product_repo.search(q, limit=limit, offset=offset)
+    else:
+        try:
+            page = product_repo.page(q, limit=limit, after=after)
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+        products, next_after = page.items, page.next_after
     return AdminProductListResponse(
         items=[_to_product_response(product) for product in products],
-        total=total,
+        total=product_repo.count(q) if with_total else None,
+        next_after=next_after,
     )
 
 
@@ -349,6 +456,7 @@ def admin_create_product(
 def admin_update_product(
     sku: str,
     payload: AdminProductUpdateRequest,
+    price_repo: Annotated[PriceRepository, Depends(get_price_repo)],
     product_repo=Depends(get_product_repo),
 ):
     existing = product_repo.get_by_sku(sku)
@@ -362,6 +470,7 @@ def admin_update_product(
         if not name:
             raise HTTPException(status_code=400, detail="Product name required")
         existing.name = name
+    previous_category = existing.category
     if "category" in updates and updates["category"] is not None:
         existing.category = _parse_category(updates["category"])
     if "brand" in updates:
@@ -374,6 +483,9 @@ def admin_update_product(
     if "image_urls" in updates:
         existing.image_urls = _normalize_urls(updates["image_urls"])
     product_repo.upsert(existing)
+    if existing.category != previous_category:
+        # Prices carry a copy of the category for /prices/cheapest.
+        price_repo.set_category(sku, existing.category.value)
     return _to_product_response(existing)
 
 
@@ -449,14 +561,24 @@ def admin_delete_shop(
 def admin_list_users(
     q: str | None = Query(None, description="Search by email or name"),
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Numbered paging; prefer `after` for next pages"),
+    after: str | None = Query(None, description="next_after token from the previous page"),
+    with_total: bool = Query(True, description="Also count all matches"),
     user_repo=Depends(get_user_repo),
 ):
-    users = user_repo.list_users(q, limit=limit, offset=offset)
-    total = user_repo.count(q)
+    next_after = None
+    if offset and after is None:
+        users = user_repo.list_users(q, limit=limit, offset=offset)
+    else:
+        try:
+            page = user_repo.page_users(q, limit=limit, after=after)
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+        users, next_after = page.items, page.next_after
     return AdminUserListResponse(
         items=[_to_user_response(user) for user in users],
-        total=total,
+        total=user_repo.count(q) if with_total else None,
+        next_after=next_after,
     )
 
 
@@ -32,6 +32,7 @@ def _to_price_response(price: PricePoint) -> PriceResponse:
         product_url=price.product_url,
         in_stock=price.in_stock,
         timestamp=price.timestamp,
+        last_seen_at=price.last_seen_at,
     )
 
 
@@ -37,6 +37,122 @@ class Settings(BaseSettings):
         default=0.0,
         validation_alias=AliasChoices("SCRAPE_DELAY_SEC"),
     )
+    scrape_rate_per_sec: float = Field(
+        default=0.0,
+        validation_alias=AliasChoices("SCRAPE_RATE_PER_SEC"),
+    )
+    scrape_rate_burst: int = Field(
+        default=1,
+        validation_alias=AliasChoices("SCRAPE_RATE_BURST"),
+    )
+    scrape_host_rates: str = Field(
+        default="",
+        validation_alias=AliasChoices("SCRAPE_HOST_RATES"),
+    )
+    scrape_workers: int = Field(
+        default=4,
+        validation_alias=AliasChoices("SCRAPE_WORKERS"),
+    )
+    scrape_scraper_timeout_sec: float = Field(
+        default=600.0,
+        validation_alias=AliasChoices("SCRAPE_SCRAPER_TIMEOUT_SEC"),
+    )
+    scrape_run_deadline_sec: float = Field(
+        default=1800.0,
+        validation_alias=AliasChoices("SCRAPE_RUN_DEADLINE_SEC"),
+    )
+    scrape_queue: bool = Field(
+        default=False,
+        validation_alias=AliasChoices("SCRAPE_QUEUE"),
+    )
+    scrape_job_lease_sec: float = Field(
+        default=120.0,
+        validation_alias=AliasChoices("SCRAPE_JOB_LEASE_SEC"),
+    )
+    scrape_job_max_attempts: int = Field(
+        default=3,
+        validation_alias=AliasChoices("SCRAPE_JOB_MAX_ATTEMPTS"),
+    )
+    scrape_worker_poll_sec: float = Field(
+        default=5.0,
+        validation_alias=AliasChoices("SCRAPE_WORKER_POLL_SEC"),
+    )
+    scrape_resume: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("SCRAPE_RESUME"),
+    )
+    scrape_resume_max_age_min: float = Field(
+        default=720.0,
+        validation_alias=AliasChoices("SCRAPE_RESUME_MAX_AGE_MIN"),
+    )
+    scrape_async: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("SCRAPE_ASYNC"),
+    )
+    scrape_host_concurrency: int = Field(
+        default=4,
+        validation_alias=AliasChoices("SCRAPE_HOST_CONCURRENCY"),
+    )
+    scrape_parse_workers: int = Field(
+        default=0,
+        validation_alias=AliasChoices("SCRAPE_PARSE_WORKERS"),
+    )
+    scrape_cache_dir: str = Field(
+        default=".scrape-cache",
+        validation_alias=AliasChoices("SCRAPE_CACHE_DIR"),
+    )
+    scrape_http_cache: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("SCRAPE_HTTP_CACHE"),
+    )
+    scrape_http_cache_max_entries: int = Field(
+        default=20000,
+        validation_alias=AliasChoices("SCRAPE_HTTP_CACHE_MAX_ENTRIES"),
+    )
+    scrape_http_cache_max_age_days: float = Field(
+        default=14.0,
+        validation_alias=AliasChoices("SCRAPE_HTTP_CACHE_MAX_AGE_DAYS"),
+    )
+    scrape_page_cache: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("SCRAPE_PAGE_CACHE"),
+    )
+    scrape_gallery_workers: int = Field(
+        default=4,
+        validation_alias=AliasChoices("SCRAPE_GALLERY_WORKERS"),
+    )
+    scrape_gallery_ttl_hours: float = Field(
+        default=24.0,
+        validation_alias=AliasChoices("SCRAPE_GALLERY_TTL_HOURS"),
+    )
+    price_dedup: bool = Field(
+        default=False,
+        validation_alias=AliasChoices("PRICE_DEDUP"),
+    )
+    price_timeseries: bool = Field(
+        default=False,
+        validation_alias=AliasChoices("PRICE_TIMESERIES"),
+    )
+    price_cache_check_sec: float = Field(
+        default=5.0,
+        validation_alias=AliasChoices("PRICE_CACHE_CHECK_SEC"),
+    )
+    ingest_batch_size: int = Field(
+        default=500,
+        validation_alias=AliasChoices("INGEST_BATCH_SIZE"),
+    )
+    ingest_pipeline_queue: int = Field(
+        default=2,
+        validation_alias=AliasChoices("INGEST_PIPELINE_QUEUE"),
+    )
+    ingest_identity_map: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("INGEST_IDENTITY_MAP"),
+    )
+    ingest_matching: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("INGEST_MATCHING"),
+    )
     auth_password_iterations: int = Field(
         default=120000,
         validation_alias=AliasChoices("AUTH_PASSWORD_ITERATIONS"),
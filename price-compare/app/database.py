@@ -1,16 +1,28 @@
+from .config import settings
 from .infrastructure.mongo.connection import get_database, get_auth_database
+from .infrastructure.mongo.repositories import MongoTimeSeriesPriceRepository
 
 # Legacy module kept for backward compatibility with scripts.
 db = get_database()
 products_col = db["products"]
 stores_col = db["shops"]
 prices_col = db["prices"]
+latest_prices_col = db["latest_prices"]
 users_col = get_auth_database()["users"]
 
 
 def ensure_indexes():
     products_col.create_index("sku", unique=True)
+    products_col.create_index("canonical_sku")
+    products_col.create_index("search_tokens")
     stores_col.create_index("code", unique=True)
     prices_col.create_index([("product_sku", 1), ("store_code", 1), ("timestamp", -1)])
+    prices_col.create_index([("canonical_sku", 1), ("timestamp", -1)], sparse=True)
+    latest_prices_col.create_index([("product_sku", 1), ("store_code", 1)], unique=True)
+    latest_prices_col.create_index("price_id")
+    latest_prices_col.create_index([("canonical_sku", 1), ("price", 1)], sparse=True)
+    latest_prices_col.create_index([("category", 1), ("price", 1)])
+    if settings.price_timeseries:
+        MongoTimeSeriesPriceRepository.ensure_collection(db)
     users_col.create_index("email", unique=True)
     users_col.create_index("refresh_token_hash")
@@ -8,10 +8,15 @@ from .infrastructure.mongo.repositories import (
     MongoProductRepository,
     MongoShopRepository,
     MongoPriceRepository,
+    MongoTimeSeriesPriceRepository,
+    MongoScrapeJobRepository,
+    MongoScrapeRunRepository,
     MongoUserRepository,
 )
 from .infrastructure.caching import CachingPriceRepository
 from .services.scraping.factory import ScraperFactory
+from .services.scraping.engine import AsyncFetchEngine
+from .services.scraping.parse_pool import ParsePool
 from .services.ingestion_service import IngestionService
 from .services.comparison_service import ComparisonService
 from .services.pricing import default_pricing_strategies, PricingStrategy
@@ -31,9 +36,28 @@ def get_shop_repo():
     return MongoShopRepository(get_database())
 
 
+@lru_cache(maxsize=1)
+def get_price_store() -> MongoPriceRepository:
+    """Uncached Mongo price repository for the configured history backend."""
+    backend = MongoTimeSeriesPriceRepository if settings.price_timeseries else MongoPriceRepository
+    return backend(get_database(), dedup=settings.price_dedup)
+
+
 @lru_cache(maxsize=1)
 def get_price_repo():
-    return CachingPriceRepository(MongoPriceRepository(get_database()))
+    return CachingPriceRepository(get_price_store())
+
+
+@lru_cache(maxsize=1)
+def get_scrape_run_repo() -> MongoScrapeRunRepository | None:
+    if not settings.scrape_resume:
+        return None
+    return MongoScrapeRunRepository(get_database())
+
+
+@lru_cache(maxsize=1)
+def get_scrape_job_repo() -> MongoScrapeJobRepository:
+    return MongoScrapeJobRepository(get_database())
 
 
 @lru_cache(maxsize=1)
@@ -86,6 +110,18 @@ def get_scrapers():
     return tuple(factory.build_all())
 
 
+@lru_cache(maxsize=1)
+def get_fetch_engine() -> AsyncFetchEngine | None:
+    if not settings.scrape_async:
+        return None
+    return AsyncFetchEngine()
+
+
+@lru_cache(maxsize=1)
+def get_parse_pool() -> ParsePool | None:
+    return ParsePool.from_settings()
+
+
 @lru_cache(maxsize=1)
 def get_pricing_strategies() -> tuple[PricingStrategy, ...]:
     return tuple(default_pricing_strategies())
@@ -99,9 +135,20 @@ def get_ingestion_service():
         price_repo=get_price_repo(),
         scrapers=get_scrapers(),
         pricing_strategies=get_pricing_strategies(),
+        fetch_engine=get_fetch_engine(),
+        parse_pool=get_parse_pool(),
+        run_ledger=get_scrape_run_repo(),
     )
 
 
+def start_scrape() -> None:
+    """Scheduled and startup scrapes: queue jobs for workers with SCRAPE_QUEUE, else ingest in-process."""
+    if settings.scrape_queue:
+        get_ingestion_service().enqueue_run(get_scrape_job_repo())
+    else:
+        get_ingestion_service().run_all()
+
+
 @lru_cache(maxsize=1)
 def get_comparison_service():
     return ComparisonService(
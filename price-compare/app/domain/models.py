@@ -14,6 +14,7 @@ class Product:
     brand: Optional[str] = None
     image_url: Optional[str] = None
     image_urls: Optional[list[str]] = None
+    canonical_sku: Optional[str] = None
     id: Optional[str] = None
 
 
@@ -37,7 +38,12 @@ class PricePoint:
     product_url: str
     in_stock: bool
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    canonical_sku: Optional[str] = None
+    # Copied from the product so category queries need no join.
+    category: Optional[ProductCategory] = None
     id: Optional[str] = None
+    # Under PRICE_DEDUP, the last run that saw this price unchanged.
+    last_seen_at: Optional[datetime] = None
 
 
 @dataclass(slots=True)
@@ -50,3 +56,53 @@ class User:
     role: str = "user"
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     id: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ScraperCheckpoint:
+    """Progress of one scraper within a scrape run.
+
+    `cursor` counts the scraper's target pages whose items are persisted;
+    `status` is "running" until the scraper finishes as "done" or "failed",
+    when its fetch, parse and write `metrics` are recorded.
+    """
+
+    cursor: int = 0
+    items: int = 0
+    status: str = "running"
+    error: Optional[str] = None
+    metrics: Optional[dict] = None
+
+
+@dataclass(slots=True)
+class ScrapeRun:
+    """Ledger entry for one ingestion run; a run left "running" was interrupted and can resume."""
+
+    started_at: datetime
+    status: str = "running"
+    scrapers: dict[str, ScraperCheckpoint] = field(default_factory=dict)
+    finished_at: Optional[datetime] = None
+    id: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ScrapeJob:
+    """One scraper's share of a queued run, held by a worker under a renewable lease.
+
+    `status` moves from "queued" to "running" when a worker claims it and to
+    "done" or "failed" when it finishes; a running job whose lease expired is
+    claimed again by another worker.
+    """
+
+    run_id: str
+    scraper_key: str
+    run_started_at: datetime
+    status: str = "queued"
+    attempts: int = 0
+    worker_id: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    items: int = 0
+    error: Optional[str] = None
+    enqueued_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+    id: Optional[str] = None
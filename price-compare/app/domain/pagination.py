@@ -0,0 +1,41 @@
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class InvalidCursor(ValueError):
+    """Raised when an `after` token cannot be decoded."""
+
+
+@dataclass(slots=True)
+class Page(Generic[T]):
+    """One page of a keyset-paginated listing; `next_after` is None on the last page."""
+
+    items: List[T] = field(default_factory=list)
+    next_after: Optional[str] = None
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque token for the sort key of the last item on a page."""
+    encoded = [{"$dt": value.isoformat()} if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(encoded, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> List[Any]:
+    """Sort key values from `encode_cursor`; raises InvalidCursor unless there are exactly `size` of them."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("Invalid cursor")
+    try:
+        return [datetime.fromisoformat(value["$dt"]) if isinstance(value, dict) else value for value in values]
+    except (KeyError, TypeError, ValueError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
@@ -1,18 +1,57 @@
 import abc
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
-from .models import Product, Shop, PricePoint, User
+from typing import List, Optional, Sequence
+from .models import Product, Shop, PricePoint, ScrapeJob, ScrapeRun, User
+from .pagination import InvalidCursor, Page, decode_cursor, encode_cursor
 
 
 class RepositoryError(Exception):
     """Raised when a repository operation fails."""
 
 
+def _offset_page(fetch, limit: int, after: Optional[str]) -> Page:
+    """Page through an offset-based `fetch(limit, offset)`, for repositories without keyset support."""
+    offset = decode_cursor(after, 1)[0] if after else 0
+    if not isinstance(offset, int) or offset < 0:
+        raise InvalidCursor("Invalid cursor")
+    items = fetch(limit + 1, offset)
+    if len(items) <= limit:
+        return Page(items=items)
+    return Page(items=items[:limit], next_after=encode_cursor([offset + limit]))
+
+
+@dataclass(slots=True)
+class BulkWriteResult:
+    """Outcome of a bulk write: ids by input position (None on failure) and errors by position."""
+
+    ids: List[Optional[str]]
+    errors: dict[int, str] = field(default_factory=dict)
+
+
 class ProductRepository(abc.ABC):
     @abc.abstractmethod
     def upsert(self, product: Product) -> str:
         """Insert or update a product and return its persistent id."""
 
+    def upsert_many(self, products: Sequence[Product]) -> BulkWriteResult:
+        """Upsert several products; failures are reported per item instead of raised."""
+        result = BulkWriteResult(ids=[])
+        for index, product in enumerate(products):
+            try:
+                result.ids.append(self.upsert(product))
+            except Exception as exc:
+                result.ids.append(None)
+                result.errors[index] = str(exc) or type(exc).__name__
+        return result
+
+    def list_identities(self) -> List[Product]:
+        """Return every product with its id and ingested fields, for warming identity maps.
+
+        The default returns nothing, so every scraped product is upserted.
+        """
+        return []
+
     @abc.abstractmethod
     def get_by_sku(self, sku: str) -> Optional[Product]:
         """Fetch a single product."""
@@ -26,6 +65,10 @@ class ProductRepository(abc.ABC):
     ) -> List[Product]:
         """Search products by name or return all if query is None."""
 
+    def page(self, query: Optional[str] = None, limit: int = 50, after: Optional[str] = None) -> Page[Product]:
+        """Return the page of `search` results after the `after` token of the previous page."""
+        return _offset_page(lambda size, offset: self.search(query, limit=size, offset=offset), limit, after)
+
     @abc.abstractmethod
     def count(self, query: Optional[str] = None) -> int:
         """Return the total count for a product query."""
@@ -62,10 +105,25 @@ class PriceRepository(abc.ABC):
     def add_price(self, price: PricePoint, product_id: str, store_id: str) -> str:
         """Persist a price observation and return its id."""
 
+    def add_prices(self, entries: Sequence[tuple[PricePoint, str, str]]) -> BulkWriteResult:
+        """Persist several (price, product_id, store_id) observations, reporting failures per item."""
+        result = BulkWriteResult(ids=[])
+        for index, (price, product_id, store_id) in enumerate(entries):
+            try:
+                result.ids.append(self.add_price(price, product_id, store_id))
+            except Exception as exc:
+                result.ids.append(None)
+                result.errors[index] = str(exc) or type(exc).__name__
+        return result
+
     @abc.abstractmethod
     def latest_for_product(self, product_sku: str) -> List[PricePoint]:
         """Return latest prices for a product across shops, sorted by price asc."""
 
+    def latest_for_canonical(self, canonical_sku: str) -> List[PricePoint]:
+        """Return the cheapest latest price per shop across listings matched to one canonical product."""
+        return []
+
     @abc.abstractmethod
     def history_for_product(self, product_sku: str, limit: int = 30) -> List[PricePoint]:
         """Return historical price points for a product ordered by timestamp desc."""
@@ -74,6 +132,10 @@ class PriceRepository(abc.ABC):
     def cheapest_by_category(self, category: str, limit: int = 10) -> List[PricePoint]:
         """Return cheapest price per product for a category."""
 
+    def set_category(self, product_sku: str, category: str) -> int:
+        """Restamp a product's prices after its category changed; returns the updated count."""
+        return 0
+
     @abc.abstractmethod
     def latest_stores_for_products(self, product_skus: List[str]) -> dict[str, List[str]]:
         """Return store codes that have prices for each product sku."""
@@ -99,6 +161,81 @@ class PriceRepository(abc.ABC):
         """Delete all prices for a store and return the deleted count."""
 
 
+class ScrapeRunRepository(abc.ABC):
+    @abc.abstractmethod
+    def start_run(self, started_at: datetime) -> ScrapeRun:
+        """Record a new running scrape run and return it with its id."""
+
+    @abc.abstractmethod
+    def find_resumable(self, since: datetime) -> Optional[ScrapeRun]:
+        """Return the latest run still marked running that started at or after `since`."""
+
+    @abc.abstractmethod
+    def abandon_stale(self, before: datetime) -> int:
+        """Mark runs still running that started before `before` as abandoned; return how many."""
+
+    @abc.abstractmethod
+    def checkpoint(self, run_id: str, scraper_key: str, cursor: int, items: int) -> None:
+        """Record that a scraper has persisted its first `cursor` target pages."""
+
+    @abc.abstractmethod
+    def finish_scraper(
+        self,
+        run_id: str,
+        scraper_key: str,
+        status: str,
+        items: int,
+        error: Optional[str] = None,
+        metrics: Optional[dict] = None,
+    ) -> None:
+        """Mark a scraper as done or failed within a run, recording its metrics."""
+
+    @abc.abstractmethod
+    def finish_run(self, run_id: str, status: str = "completed") -> None:
+        """Close a run so it is no longer resumed."""
+
+    @abc.abstractmethod
+    def recent_runs(self, limit: int = 10) -> List[ScrapeRun]:
+        """Return the latest runs, newest first."""
+
+    @abc.abstractmethod
+    def get_run(self, run_id: str) -> Optional[ScrapeRun]:
+        """Return a run by id."""
+
+
+class ScrapeJobRepository(abc.ABC):
+    @abc.abstractmethod
+    def enqueue(self, jobs: Sequence[ScrapeJob]) -> List[str]:
+        """Queue jobs and return their ids."""
+
+    @abc.abstractmethod
+    def claim(self, worker_id: str, now: datetime, lease_sec: float, max_attempts: int) -> Optional[ScrapeJob]:
+        """Atomically take the oldest queued job, or a running one whose lease expired.
+
+        Expired jobs that already used `max_attempts` are never claimed; see `fail_expired`.
+        """
+
+    @abc.abstractmethod
+    def fail_expired(self, now: datetime, max_attempts: int) -> List[str]:
+        """Fail running jobs whose lease expired on their last attempt; return their run ids."""
+
+    @abc.abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str, lease_expires_at: datetime) -> bool:
+        """Extend the lease; False when the worker no longer holds the job."""
+
+    @abc.abstractmethod
+    def complete(self, job_id: str, worker_id: str, status: str, items: int, error: Optional[str] = None) -> bool:
+        """Finish a job as done or failed; False when the worker no longer holds it."""
+
+    @abc.abstractmethod
+    def jobs_for_run(self, run_id: str) -> List[ScrapeJob]:
+        """Return the jobs of one run in enqueue order."""
+
+    @abc.abstractmethod
+    def latest_run_id(self) -> Optional[str]:
+        """Return the run id of the most recently enqueued job."""
+
+
 class UserRepository(abc.ABC):
     @abc.abstractmethod
     def create(self, user: User) -> str:
@@ -121,6 +258,10 @@ class UserRepository(abc.ABC):
     ) -> List[User]:
         """List users by email or name."""
 
+    def page_users(self, query: Optional[str] = None, limit: int = 50, after: Optional[str] = None) -> Page[User]:
+        """Return the page of `list_users` results after the `after` token of the previous page."""
+        return _offset_page(lambda size, offset: self.list_users(query, limit=size, offset=offset), limit, after)
+
     @abc.abstractmethod
     def update(self, user: User) -> User:
         """Update an existing user and return the updated instance."""
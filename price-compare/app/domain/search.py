@@ -0,0 +1,28 @@
+import re
+import unicodedata
+from typing import Optional
+
+# Letters and digits split apart, so "iPhone15 128GB" and "iphone 15 128 gb" tokenize alike.
+_TOKEN_PATTERN = re.compile(r"[a-z]+|[0-9]+")
+
+
+def search_tokens(text: Optional[str]) -> list[str]:
+    """Lowercased, accent-free word tokens of `text`, in order, without duplicates."""
+    if not text:
+        return []
+    folded = unicodedata.normalize("NFKD", text)
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch)).lower()
+    return list(dict.fromkeys(_TOKEN_PATTERN.findall(folded)))
+
+
+def matches_query(name: Optional[str], query: Optional[str]) -> bool:
+    """Whether `name` matches a search: every query token in full, the last one as a prefix.
+
+    This is the rule the indexed Mongo search applies; in-memory repositories use it to agree.
+    """
+    wanted = search_tokens(query)
+    if not wanted:
+        return not query
+    tokens = search_tokens(name)
+    *whole, last = wanted
+    return all(token in tokens for token in whole) and any(token.startswith(last) for token in tokens)
@@ -1,21 +1,38 @@
 from __future__ import annotations
 
 import functools
-from typing import Dict, List
+import time
+from datetime import datetime
+from typing import Dict, List, Sequence
+from ..config import settings
 from ..domain.models import PricePoint
-from ..domain.repositories import PriceRepository
+from ..domain.repositories import BulkWriteResult, PriceRepository
 
 
 class CachingPriceRepository(PriceRepository):
-    """Decorator repository that caches read queries."""
+    """Decorator repository that caches read queries.
 
-    def __init__(self, inner: PriceRepository) -> None:
+    Writes through this instance invalidate the affected entries. Writes from
+    other processes (queue workers, scripts) are noticed by comparing the
+    store's newest price timestamp, checked at most every `check_sec`
+    seconds; when it moved, the whole cache is dropped.
+    """
+
+    def __init__(self, inner: PriceRepository, check_sec: float | None = None) -> None:
         self.inner = inner
+        self.check_sec = check_sec if check_sec is not None else settings.price_cache_check_sec
+        self._stamp: datetime | None = None
+        self._checked_at: float | None = None
         self._latest_cache: Dict[str, List[PricePoint]] = {}
+        self._canonical_cache: Dict[str, List[PricePoint]] = {}
         self._history_cache: Dict[tuple[str, int], List[PricePoint]] = {}
         self._cheapest_cache: Dict[tuple[str, int], List[PricePoint]] = {}
 
-    def _invalidate(self, product_sku: str | None = None) -> None:
+    def _invalidate(self, product_sku: str | None = None, canonical_sku: str | None = None) -> None:
+        if canonical_sku:
+            self._canonical_cache.pop(canonical_sku, None)
+        elif not product_sku:
+            self._canonical_cache.clear()
         if product_sku:
             self._latest_cache.pop(product_sku, None)
             keys = [k for k in self._history_cache if k[0] == product_sku]
@@ -26,18 +43,43 @@ class CachingPriceRepository(PriceRepository):
             self._history_cache.clear()
         self._cheapest_cache.clear()
 
+    def _check_stamp(self) -> None:
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_sec:
+            return
+        self._checked_at = now
+        stamp = self.inner.latest_timestamp()
+        if stamp != self._stamp:
+            self._stamp = stamp
+            self._invalidate()
+
     def add_price(self, price: PricePoint, product_id: str, store_id: str) -> str:
-        self._invalidate(price.product_sku)
+        self._invalidate(price.product_sku, price.canonical_sku)
         return self.inner.add_price(price, product_id, store_id)
 
+    def add_prices(self, entries: Sequence[tuple[PricePoint, str, str]]) -> BulkWriteResult:
+        for sku, canonical_sku in {(price.product_sku, price.canonical_sku) for price, _, _ in entries}:
+            self._invalidate(sku, canonical_sku)
+        return self.inner.add_prices(entries)
+
     def latest_for_product(self, product_sku: str) -> List[PricePoint]:
+        self._check_stamp()
         if product_sku in self._latest_cache:
             return self._latest_cache[product_sku]
         result = self.inner.latest_for_product(product_sku)
         self._latest_cache[product_sku] = result
         return result
 
+    def latest_for_canonical(self, canonical_sku: str) -> List[PricePoint]:
+        self._check_stamp()
+        if canonical_sku in self._canonical_cache:
+            return self._canonical_cache[canonical_sku]
+        result = self.inner.latest_for_canonical(canonical_sku)
+        self._canonical_cache[canonical_sku] = result
+        return result
+
     def history_for_product(self, product_sku: str, limit: int = 30) -> List[PricePoint]:
+        self._check_stamp()
         key = (product_sku, limit)
         if key in self._history_cache:
             return self._history_cache[key]
@@ -46,6 +88,7 @@ class CachingPriceRepository(PriceRepository):
         return result
 
     def cheapest_by_category(self, category: str, limit: int = 10) -> List[PricePoint]:
+        self._check_stamp()
         key = (category, limit)
         if key in self._cheapest_cache:
             return self._cheapest_cache[key]
@@ -53,10 +96,16 @@ class CachingPriceRepository(PriceRepository):
         self._cheapest_cache[key] = result
         return result
 
+    def set_category(self, product_sku: str, category: str) -> int:
+        self._invalidate(product_sku)
+        self._canonical_cache.clear()
+        return self.inner.set_category(product_sku, category)
+
     def latest_stores_for_products(self, product_skus: List[str]) -> dict[str, List[str]]:
         return self.inner.latest_stores_for_products(product_skus)
 
     def latest_prices_for_products(self, product_skus: List[str]) -> dict[str, List[PricePoint]]:
+        self._check_stamp()
         missing = [sku for sku in product_skus if sku not in self._latest_cache]
         if missing:
             fetched = self.inner.latest_prices_for_products(missing)
@@ -71,6 +120,8 @@ class CachingPriceRepository(PriceRepository):
 
     def delete_for_product(self, product_sku: str) -> int:
         self._invalidate(product_sku)
+        # The canonical product the listing belonged to is unknown here.
+        self._canonical_cache.clear()
         return self.inner.delete_for_product(product_sku)
 
     def delete_for_store(self, store_code: str) -> int:
@@ -1,19 +1,25 @@
 import logging
-from datetime import datetime, timezone
-from typing import List, Optional
+import re
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence
 from urllib.parse import urlparse
 from bson import ObjectId
-from pymongo import ReturnDocument
-from pymongo.errors import DuplicateKeyError
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from pymongo.database import Database
 from ...domain.enums import ProductCategory, ShopName
-from ...domain.models import Product, Shop, PricePoint, User
+from ...domain.models import Product, Shop, PricePoint, ScrapeJob, ScrapeRun, ScraperCheckpoint, User
+from ...domain.pagination import Page, decode_cursor, encode_cursor
+from ...domain.search import search_tokens
 from ...domain.repositories import (
     ProductRepository,
     ShopRepository,
     PriceRepository,
+    ScrapeJobRepository,
+    ScrapeRunRepository,
     UserRepository,
     RepositoryError,
+    BulkWriteResult,
 )
 
 logger = logging.getLogger(__name__)
@@ -47,6 +53,55 @@ def _normalize_neptun_url(value: str | None) -> str | None:
     return f"https://www.neptun-ks.com/categories/{slug}{suffix}"
 
 
+# Fields that make an observation a new price point; anything else only refreshes last_seen_at.
+PRICE_CHANGE_FIELDS = ("price", "currency", "in_stock", "product_url")
+
+
+def _same_price(previous: dict, doc: dict) -> bool:
+    return all(previous.get(field) == doc.get(field) for field in PRICE_CHANGE_FIELDS)
+
+
+def _keyset_filter(order: list[tuple[str, int]], values: list) -> dict:
+    """Documents strictly after `values` in `order`, a list of (field, 1 | -1) sort keys.
+
+    Missing fields sort below every value, so they come first ascending and last descending;
+    range operators never match them, hence the explicit null clauses.
+    """
+    clauses = []
+    for position, (name, direction) in enumerate(order):
+        prefix = {earlier: values[index] for index, (earlier, _) in enumerate(order[:position])}
+        value = values[position]
+        if value is None:
+            if direction == 1:
+                clauses.append({**prefix, name: {"$ne": None}})
+            continue
+        clauses.append({**prefix, name: {"$gt" if direction == 1 else "$lt": value}})
+        if direction == -1:
+            clauses.append({**prefix, name: None})
+    return {"$or": clauses}
+
+
+def _page(docs: list[dict], order: list[tuple[str, int]], limit: int) -> tuple[list[dict], Optional[str]]:
+    """Trim a `limit + 1` fetch to one page and encode the cursor of its last document."""
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    return docs, encode_cursor([docs[-1].get(name) for name, _ in order])
+
+
+# Listing orders; the product ones are index-backed by (name, sku), relevance runs on the matched set only.
+_NAME_ORDER = [("name", 1), ("sku", 1)]
+_RELEVANCE_ORDER = [("_exact", -1), ("_leading", -1), ("_length", 1), ("name", 1), ("sku", 1)]
+_USER_ORDER = [("created_at", -1), ("email", 1)]
+
+
+def _parse_category(value: str | None) -> ProductCategory | None:
+    try:
+        return ProductCategory(value) if value else None
+    except ValueError:
+        return None
+
+
 def _object_id(value: str | ObjectId | None) -> ObjectId | None:
     if value is None:
         return None
@@ -54,22 +109,59 @@ def _object_id(value: str | ObjectId | None) -> ObjectId | None:
 
 
 class MongoProductRepository(ProductRepository):
+    """Products keyed by SKU.
+
+    Name searches run on `search_tokens`, the normalized word tokens of the
+    name under a multikey index: every query token must match a token in
+    full except the last, which matches as an anchored prefix, so each
+    keystroke is an index range scan instead of a collection scan.
+    """
+
     def __init__(self, db: Database):
         self.collection = db["products"]
         self.collection.create_index("sku", unique=True)
+        self.collection.create_index("canonical_sku")
+        self.collection.create_index("search_tokens")
+        self.collection.create_index([("name", 1), ("sku", 1)])
+
+    @staticmethod
+    def _search_fields(name: str | None) -> dict:
+        tokens = search_tokens(name)
+        return {"search_tokens": tokens, "search_name": " ".join(tokens)}
+
+    def backfill_search_fields(self) -> int:
+        """Tokenize products stored before search tokens existed; returns how many were updated.
+
+        Ingestion skips unchanged products, so they would otherwise never get tokens.
+        """
+        operations = [
+            UpdateOne({"_id": doc["_id"]}, {"$set": self._search_fields(doc.get("name"))})
+            for doc in self.collection.find({"search_tokens": {"$exists": False}}, {"name": 1})
+        ]
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+            logger.info("Added search tokens to %s products", len(operations))
+        return len(operations)
+
+    def _product_doc(self, product: Product) -> dict:
+        doc = {
+            "sku": product.sku,
+            "name": product.name,
+            "category": product.category.value,
+            "brand": product.brand,
+            **self._search_fields(product.name),
+        }
+        if product.image_url is not None:
+            doc["image_url"] = product.image_url
+        if product.image_urls is not None:
+            doc["image_urls"] = product.image_urls
+        if product.canonical_sku is not None:
+            doc["canonical_sku"] = product.canonical_sku
+        return doc
 
     def upsert(self, product: Product) -> str:
         try:
-            doc = {
-                "sku": product.sku,
-                "name": product.name,
-                "category": product.category.value,
-                "brand": product.brand,
-            }
-            if product.image_url is not None:
-                doc["image_url"] = product.image_url
-            if product.image_urls is not None:
-                doc["image_urls"] = product.image_urls
+            doc = self._product_doc(product)
             saved = self.collection.find_one_and_update(
                 {"sku": product.sku},
                 {"$set": doc},
@@ -81,6 +173,67 @@ class MongoProductRepository(ProductRepository):
             logger.exception("Product upsert failed: %s", exc)
             raise RepositoryError from exc
 
+    def upsert_many(self, products: Sequence[Product]) -> BulkWriteResult:
+        """Upsert with one unordered bulk_write, then resolve ids with a single `$in` query."""
+        result = BulkWriteResult(ids=[None] * len(products))
+        # Repeated SKUs in a batch collapse to the last version, as sequential upserts would.
+        positions: dict[str, list[int]] = {}
+        latest: dict[str, Product] = {}
+        for index, product in enumerate(products):
+            positions.setdefault(product.sku, []).append(index)
+            latest[product.sku] = product
+        if not latest:
+            return result
+        skus = list(latest)
+        operations = [UpdateOne({"sku": sku}, {"$set": self._product_doc(latest[sku])}, upsert=True) for sku in skus]
+        failed: set[str] = set()
+        try:
+            self.collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as exc:
+            for error in exc.details.get("writeErrors", []):
+                sku = skus[error["index"]]
+                failed.add(sku)
+                for index in positions[sku]:
+                    result.errors[index] = error.get("errmsg") or "write failed"
+        except Exception as exc:
+            logger.exception("Bulk product upsert failed: %s", exc)
+            raise RepositoryError from exc
+        found = self.collection.find({"sku": {"$in": [sku for sku in skus if sku not in failed]}}, {"_id": 1, "sku": 1})
+        for doc in found:
+            for index in positions.get(doc["sku"], []):
+                result.ids[index] = str(doc["_id"])
+        for sku in skus:
+            for index in positions[sku]:
+                if result.ids[index] is None and index not in result.errors:
+                    result.errors[index] = "product not found after upsert"
+        return result
+
+    def list_identities(self) -> List[Product]:
+        """One projection query over the fields ingestion writes."""
+        projection = {
+            "_id": 1,
+            "sku": 1,
+            "name": 1,
+            "category": 1,
+            "brand": 1,
+            "image_url": 1,
+            "image_urls": 1,
+            "canonical_sku": 1,
+        }
+        return [
+            Product(
+                id=str(doc["_id"]),
+                sku=doc["sku"],
+                name=doc.get("name", ""),
+                category=ProductCategory(doc.get("category", ProductCategory.SMARTPHONE.value)),
+                brand=doc.get("brand"),
+                image_url=doc.get("image_url"),
+                image_urls=doc.get("image_urls"),
+                canonical_sku=doc.get("canonical_sku"),
+            )
+            for doc in self.collection.find({}, projection)
+        ]
+
     def get_by_sku(self, sku: str) -> Optional[Product]:
         doc = self.collection.find_one({"sku": sku})
         if not doc:
@@ -94,51 +247,101 @@ class MongoProductRepository(ProductRepository):
             brand=doc.get("brand"),
             image_url=doc.get("image_url"),
             image_urls=doc.get("image_urls"),
+            canonical_sku=doc.get("canonical_sku"),
         )
 
+    def _search_filter(self, query: Optional[str]) -> Optional[dict]:
+        """Index-backed filter for a name query: {} for no query, None when the query has nothing searchable."""
+        if not query:
+            return {}
+        tokens = search_tokens(query)
+        if not tokens:
+            return None
+        *whole, last = tokens
+        # Tokens are plain [a-z0-9] runs, and the prefix is escaped anyway: user input never becomes a pattern.
+        clauses = [{"search_tokens": token} for token in whole]
+        clauses.append({"search_tokens": {"$regex": f"^{re.escape(last)}"}})
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    _PROJECTION = {
+        "_id": 1,
+        "sku": 1,
+        "name": 1,
+        "category": 1,
+        "brand": 1,
+        "image_url": 1,
+        "image_urls": 1,
+        "canonical_sku": 1,
+    }
+
+    def _search_pipeline(self, filter_: dict, query: Optional[str]) -> list[dict]:
+        pipeline: list[dict] = [{"$match": filter_}]
+        if filter_:
+            tokens = search_tokens(query)
+            pipeline.append(
+                {
+                    # Relevance: query tokens matched in full, then names starting with the query, then shorter names.
+                    "$addFields": {
+                        "_exact": {"$size": {"$setIntersection": ["$search_tokens", tokens]}},
+                        "_leading": {
+                            "$cond": [{"$eq": [{"$indexOfCP": ["$search_name", " ".join(tokens)]}, 0]}, 1, 0]
+                        },
+                        "_length": {"$size": "$search_tokens"},
+                    }
+                }
+            )
+        return pipeline
+
     def search(
         self,
         query: Optional[str] = None,
         limit: Optional[int] = None,
         offset: int = 0,
     ) -> List[Product]:
-        filter_ = {"name": {"$regex": query, "$options": "i"}} if query else {}
-        cursor = (
-            self.collection.find(
-                filter_,
-                {
-                    "_id": 1,
-                    "sku": 1,
-                    "name": 1,
-                    "category": 1,
-                    "brand": 1,
-                    "image_url": 1,
-                    "image_urls": 1,
-                },
-            )
-            .sort([("name", 1), ("sku", 1)])
-            .skip(max(offset, 0))
-        )
+        """Products matching `query`, most relevant first; all products by name without one."""
+        filter_ = self._search_filter(query)
+        if filter_ is None:
+            return []
+        order = _RELEVANCE_ORDER if filter_ else _NAME_ORDER
+        pipeline = self._search_pipeline(filter_, query) + [{"$sort": dict(order)}, {"$skip": max(offset, 0)}]
         if limit:
-            cursor = cursor.limit(limit)
-        results = []
-        for doc in cursor:
-            category = doc.get("category", ProductCategory.SMARTPHONE.value)
-            results.append(
-                Product(
-                    id=str(doc["_id"]),
-                    sku=doc["sku"],
-                    name=doc["name"],
-                    category=ProductCategory(category),
-                    brand=doc.get("brand"),
-                    image_url=doc.get("image_url"),
-                    image_urls=doc.get("image_urls"),
-                )
-            )
-        return results
+            pipeline.append({"$limit": limit})
+        pipeline.append({"$project": self._PROJECTION})
+        return [self._doc_to_product(doc) for doc in self.collection.aggregate(pipeline)]
+
+    def page(self, query: Optional[str] = None, limit: int = 50, after: Optional[str] = None) -> Page[Product]:
+        """Keyset page of `search`: resumes after the previous page's last sort key instead of skipping."""
+        filter_ = self._search_filter(query)
+        if filter_ is None:
+            return Page()
+        order = _RELEVANCE_ORDER if filter_ else _NAME_ORDER
+        pipeline = self._search_pipeline(filter_, query)
+        if after:
+            pipeline.append({"$match": _keyset_filter(order, decode_cursor(after, len(order)))})
+        pipeline += [{"$sort": dict(order)}, {"$limit": limit + 1}]
+        docs, next_after = _page(list(self.collection.aggregate(pipeline)), order, limit)
+        return Page(items=[self._doc_to_product(doc) for doc in docs], next_after=next_after)
+
+    @staticmethod
+    def _doc_to_product(doc: dict) -> Product:
+        return Product(
+            id=str(doc["_id"]),
+            sku=doc["sku"],
+            name=doc["name"],
+            category=ProductCategory(doc.get("category", ProductCategory.SMARTPHONE.value)),
+            brand=doc.get("brand"),
+            image_url=doc.get("image_url"),
+            image_urls=doc.get("image_urls"),
+            canonical_sku=doc.get("canonical_sku"),
+        )
 
     def count(self, query: Optional[str] = None) -> int:
-        filter_ = {"name": {"$regex": query, "$options": "i"}} if query else {}
+        filter_ = self._search_filter(query)
+        if filter_ is None:
+            return 0
+        if not filter_:
+            # Collection metadata: no scan for the unfiltered total.
+            return int(self.collection.estimated_document_count())
         return int(self.collection.count_documents(filter_))
 
     def delete(self, sku: str) -> bool:
@@ -186,32 +389,265 @@ class MongoShopRepository(ShopRepository):
 
 
 class MongoPriceRepository(PriceRepository):
-    def __init__(self, db: Database):
-        self.collection = db["prices"]
-        self.collection.create_index([("product_sku", 1), ("store_code", 1), ("timestamp", -1)])
-        self.collection.create_index("timestamp")
+    """Price observations per (product, store).
+
+    With `dedup` enabled an observation that matches the latest stored point
+    for its (sku, store) on PRICE_CHANGE_FIELDS is not inserted; the stored
+    point's `last_seen_at` is bumped instead, so a point covers the interval
+    from `timestamp` to `last_seen_at` in which the listing was seen
+    unchanged. Latest-price reads report `last_seen_at` as the point's
+    timestamp, matching an insert-per-run history. History lists one entry
+    per change, carrying the interval's end in `last_seen_at`.
+
+    Latest-price reads go to `latest_prices`, one document per (sku, store)
+    holding a copy of its newest point (`price_id` refers back to it). It is
+    upserted next to every history write, so those reads are indexed lookups
+    whose cost does not grow with the history.
+    """
+
+    # Where the history collection keeps a point's (sku, store) key.
+    SKU_FIELD = "product_sku"
+    STORE_FIELD = "store_code"
+
+    def __init__(self, db: Database, dedup: bool = False):
+        self.collection = self._history_collection(db)
+        self.latest = db["latest_prices"]
+        self.latest.create_index([("product_sku", 1), ("store_code", 1)], unique=True)
+        self.latest.create_index("price_id")
+        self.latest.create_index([("canonical_sku", 1), ("price", 1)], sparse=True)
+        self.latest.create_index([("category", 1), ("price", 1)])
         self.products = db["products"]
+        self.dedup = dedup
+
+    def _history_collection(self, db: Database):
+        collection = db["prices"]
+        collection.create_index([("product_sku", 1), ("store_code", 1), ("timestamp", -1)])
+        collection.create_index("timestamp")
+        collection.create_index("last_seen_at")
+        collection.create_index([("canonical_sku", 1), ("timestamp", -1)], sparse=True)
+        return collection
+
+    def _to_stored(self, doc: dict) -> dict:
+        """History document for a point built by `_price_doc`."""
+        return doc
+
+    def _from_stored(self, doc: dict) -> dict:
+        """Inverse of `_to_stored`."""
+        return doc
+
+    def _from_stored_stages(self) -> list[dict]:
+        """Aggregation stages doing `_from_stored` on the server."""
+        return []
+
+    def _price_doc(self, price: PricePoint, product_id: str, store_id: str) -> dict:
+        doc = {
+            "product_id": _object_id(product_id),
+            "store_id": _object_id(store_id),
+            "product_sku": price.product_sku,
+            "store_code": price.store.value,
+            "price": price.price,
+            "currency": price.currency,
+            "product_url": price.product_url,
+            "in_stock": price.in_stock,
+            "timestamp": price.timestamp,
+        }
+        if self.dedup:
+            doc["last_seen_at"] = price.timestamp
+        if price.canonical_sku is not None:
+            doc["canonical_sku"] = price.canonical_sku
+        if price.category is not None:
+            doc["category"] = price.category.value
+        return doc
+
+    def _latest_docs(self, keys: set[tuple[str, str]]) -> dict[tuple[str, str], dict]:
+        """Latest stored point per (sku, store_code), keyed by the point's own _id."""
+        if not keys:
+            return {}
+        query = {
+            "product_sku": {"$in": sorted({sku for sku, _ in keys})},
+            "store_code": {"$in": sorted({store for _, store in keys})},
+        }
+        latest: dict[tuple[str, str], dict] = {}
+        for doc in self.latest.find(query):
+            key = (doc["product_sku"], doc["store_code"])
+            if key in keys:
+                latest[key] = {**doc, "_id": doc["price_id"]}
+        return latest
+
+    def _upsert_latest(self, docs: list[dict]) -> None:
+        """Point `latest_prices` at newly inserted points unless a newer one is already there."""
+        newest: dict[tuple[str, str], dict] = {}
+        for doc in docs:
+            key = (doc["product_sku"], doc["store_code"])
+            if key not in newest or doc["timestamp"] >= newest[key]["timestamp"]:
+                newest[key] = doc
+        if not newest:
+            return
+        ops = []
+        for (sku, store), doc in newest.items():
+            fields = {name: value for name, value in doc.items() if name != "_id"}
+            fields["price_id"] = doc["_id"]
+            ops.append(
+                UpdateOne(
+                    {"product_sku": sku, "store_code": store, "timestamp": {"$lte": doc["timestamp"]}},
+                    {"$set": fields},
+                    upsert=True,
+                )
+            )
+        try:
+            self.latest.bulk_write(ops, ordered=False)
+        except BulkWriteError as exc:
+            # A point older than the stored one matches nothing, and its upsert then hits the unique key.
+            errors = [error for error in exc.details.get("writeErrors", []) if error.get("code") != 11000]
+            if errors:
+                logger.warning("Updating latest prices failed for %s keys: %s", len(errors), errors[0].get("errmsg"))
+
+    def ensure_latest(self) -> Optional[int]:
+        """Fill an empty `latest_prices` from history written before it existed; None when nothing was to do."""
+        if self.latest.estimated_document_count() or self.collection.find_one({}, {"_id": 1}) is None:
+            return None
+        return self.rebuild_latest()
+
+    def rebuild_latest(self) -> int:
+        """Recompute `latest_prices` from the full history; returns the number of (sku, store) entries."""
+        sku, store = self.SKU_FIELD, self.STORE_FIELD
+        pipeline = [
+            {"$sort": {sku: 1, store: 1, "timestamp": -1}},
+            {"$group": {"_id": {"sku": f"${sku}", "store": f"${store}"}, "latest": {"$first": "$$ROOT"}}},
+            {"$replaceRoot": {"newRoot": "$latest"}},
+            *self._from_stored_stages(),
+            {"$set": {"price_id": "$_id"}},
+            {"$unset": "_id"},
+            {
+                "$merge": {
+                    "into": self.latest.name,
+                    "on": ["product_sku", "store_code"],
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert",
+                }
+            },
+        ]
+        self.collection.aggregate(pipeline, allowDiskUse=True)
+        count = int(self.latest.count_documents({}))
+        logger.info("Rebuilt latest prices: %s entries", count)
+        return count
 
     def add_price(self, price: PricePoint, product_id: str, store_id: str) -> str:
         try:
-            doc = {
-                "product_id": _object_id(product_id),
-                "store_id": _object_id(store_id),
-                "product_sku": price.product_sku,
-                "store_code": price.store.value,
-                "price": price.price,
-                "currency": price.currency,
-                "product_url": price.product_url,
-                "in_stock": price.in_stock,
-                "timestamp": price.timestamp,
-            }
-            inserted = self.collection.insert_one(doc)
-            return str(inserted.inserted_id)
+            doc = self._price_doc(price, product_id, store_id)
+            if self.dedup:
+                key = (doc["product_sku"], doc["store_code"])
+                previous = self._latest_docs({key}).get(key)
+                if previous and _same_price(previous, doc):
+                    self._touch([previous["_id"]], doc["last_seen_at"], doc.get("canonical_sku"), doc.get("category"))
+                    return str(previous["_id"])
+            doc["_id"] = ObjectId()
+            self.collection.insert_one(self._to_stored(doc))
+            self._upsert_latest([doc])
+            return str(doc["_id"])
         except Exception as exc:  # pragma: no cover - defensive logging
             logger.exception("Adding price failed: %s", exc)
             raise RepositoryError from exc
 
-    def _doc_to_price(self, doc) -> PricePoint:
+    def add_prices(self, entries: Sequence[tuple[PricePoint, str, str]]) -> BulkWriteResult:
+        """Insert with one unordered insert_many; a bad document only fails its own slot."""
+        result = BulkWriteResult(ids=[None] * len(entries))
+        docs: list[dict] = []
+        positions: list[int] = []
+        for index, (price, product_id, store_id) in enumerate(entries):
+            try:
+                docs.append(self._price_doc(price, product_id, store_id))
+                positions.append(index)
+            except Exception as exc:
+                result.errors[index] = str(exc) or type(exc).__name__
+        if not docs:
+            return result
+        if self.dedup:
+            docs, positions = self._drop_unchanged(docs, positions, result)
+            if not docs:
+                return result
+        for doc in docs:
+            doc.setdefault("_id", ObjectId())
+        try:
+            self.collection.insert_many([self._to_stored(doc) for doc in docs], ordered=False)
+        except BulkWriteError as exc:
+            for error in exc.details.get("writeErrors", []):
+                result.errors[positions[error["index"]]] = error.get("errmsg") or "write failed"
+        except Exception as exc:
+            logger.exception("Bulk price insert failed: %s", exc)
+            raise RepositoryError from exc
+        failed_ids: dict[str, str] = {}
+        inserted: list[dict] = []
+        for doc, index in zip(docs, positions, strict=True):
+            if index in result.errors:
+                failed_ids[str(doc["_id"])] = result.errors[index]
+            else:
+                result.ids[index] = str(doc["_id"])
+                inserted.append(doc)
+        self._upsert_latest(inserted)
+        if failed_ids:
+            # Repeats that were folded into a document that failed to insert fail with it.
+            for index, id_ in enumerate(result.ids):
+                if id_ in failed_ids:
+                    result.ids[index] = None
+                    result.errors[index] = failed_ids[id_]
+        return result
+
+    def _drop_unchanged(
+        self, docs: list[dict], positions: list[int], result: BulkWriteResult
+    ) -> tuple[list[dict], list[int]]:
+        """Resolve unchanged observations to their stored point and return only real changes."""
+        latest = self._latest_docs({(doc["product_sku"], doc["store_code"]) for doc in docs})
+        changed: list[dict] = []
+        changed_positions: list[int] = []
+        touched: dict[tuple[datetime, Optional[str], Optional[str]], list[ObjectId]] = {}
+        pending: set[ObjectId] = set()
+        for doc, index in zip(docs, positions, strict=True):
+            key = (doc["product_sku"], doc["store_code"])
+            previous = latest.get(key)
+            if previous is not None and _same_price(previous, doc):
+                result.ids[index] = str(previous["_id"])
+                if previous["_id"] in pending:
+                    # Repeated in this batch: carry the heartbeat on the document about to be inserted.
+                    previous["last_seen_at"] = max(previous["last_seen_at"], doc["last_seen_at"])
+                    for name in ("canonical_sku", "category"):
+                        if name in doc:
+                            previous[name] = doc[name]
+                else:
+                    touch_key = (doc["last_seen_at"], doc.get("canonical_sku"), doc.get("category"))
+                    touched.setdefault(touch_key, []).append(previous["_id"])
+                continue
+            doc["_id"] = ObjectId()
+            pending.add(doc["_id"])
+            latest[key] = doc
+            changed.append(doc)
+            changed_positions.append(index)
+        for (seen_at, canonical_sku, category), ids in touched.items():
+            self._touch(ids, seen_at, canonical_sku, category)
+        return changed, changed_positions
+
+    def _touch(
+        self,
+        ids: list[ObjectId],
+        seen_at: datetime,
+        canonical_sku: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> None:
+        # $max keeps the heartbeat monotonic if runs overlap.
+        update: dict = {"$max": {"last_seen_at": seen_at}}
+        fields: dict = {}
+        if canonical_sku is not None:
+            # A listing matched after its price was stored joins its canonical product without a new point.
+            fields["canonical_sku"] = canonical_sku
+        if category is not None:
+            fields["category"] = category
+        if fields:
+            update["$set"] = fields
+        self.collection.update_many({"_id": {"$in": ids}}, update)
+        self.latest.update_many({"price_id": {"$in": ids}}, update)
+
+    def _doc_to_price(self, doc, seen: bool = False) -> PricePoint:
+        """Map a price document; `seen` reports the last sighting instead of when the point was recorded."""
         code = doc.get("store_code") or doc.get("store") or ""
         try:
             store = ShopName(code)
@@ -224,82 +660,87 @@ class MongoPriceRepository(PriceRepository):
         if store == ShopName.NEPTUN:
             product_url = _normalize_neptun_url(product_url)
         return PricePoint(
-            id=str(doc.get("_id")),
+            id=str(doc.get("price_id") or doc.get("_id")),
             product_sku=doc["product_sku"],
             store=store,
             price=doc["price"],
             currency=doc["currency"],
             product_url=product_url,
             in_stock=doc.get("in_stock", True),
-            timestamp=doc["timestamp"],
+            timestamp=(doc.get("last_seen_at") or doc["timestamp"]) if seen else doc["timestamp"],
+            canonical_sku=doc.get("canonical_sku"),
+            category=_parse_category(doc.get("category")),
+            last_seen_at=doc.get("last_seen_at"),
         )
 
     def latest_for_product(self, product_sku: str) -> List[PricePoint]:
-        pipeline = [
-            {"$match": {"product_sku": product_sku}},
-            {"$sort": {"timestamp": -1}},
-            {"$group": {"_id": "$store_code", "latest": {"$first": "$$ROOT"}}},
-            {"$replaceRoot": {"newRoot": "$latest"}},
-            {"$sort": {"price": 1}},
-        ]
-        docs = list(self.collection.aggregate(pipeline))
-        return [self._doc_to_price(doc) for doc in docs]
+        cursor = self.latest.find({"product_sku": product_sku}).sort("price", 1)
+        return [self._doc_to_price(doc, seen=True) for doc in cursor]
+
+    def latest_for_canonical(self, canonical_sku: str) -> List[PricePoint]:
+        """Cheapest matched listing per store."""
+        cheapest: dict[str, dict] = {}
+        for doc in self.latest.find({"canonical_sku": canonical_sku}).sort("price", 1):
+            cheapest.setdefault(doc["store_code"], doc)
+        return [self._doc_to_price(doc, seen=True) for doc in cheapest.values()]
 
     def history_for_product(self, product_sku: str, limit: int = 30) -> List[PricePoint]:
-        cursor = (
-            self.collection.find({"product_sku": product_sku})
-            .sort("timestamp", -1)
-            .limit(limit)
-        )
-        return [self._doc_to_price(doc) for doc in cursor]
+        """Newest points first; under dedup each one stands for the runs up to its `last_seen_at`."""
+        cursor = self.collection.find({self.SKU_FIELD: product_sku}).sort("timestamp", -1).limit(limit)
+        return [self._doc_to_price(self._from_stored(doc)) for doc in cursor]
 
     def cheapest_by_category(self, category: str, limit: int = 10) -> List[PricePoint]:
-        pipeline = [
-            {
-                "$lookup": {
-                    "from": "products",
-                    "localField": "product_sku",
-                    "foreignField": "sku",
-                    "as": "product",
-                }
-            },
-            {"$unwind": "$product"},
-            {"$match": {"product.category": category}},
-            {"$sort": {"timestamp": -1}},
-            {"$group": {"_id": {"sku": "$product_sku", "store": "$store_code"}, "latest": {"$first": "$$ROOT"}}},
-            {"$replaceRoot": {"newRoot": "$latest"}},
-            {"$sort": {"price": 1}},
-            {"$limit": limit},
+        """Top-k of the category's latest prices, read off the (category, price) index."""
+        cursor = self.latest.find({"category": category}).sort("price", 1).limit(limit)
+        return [self._doc_to_price(doc, seen=True) for doc in cursor]
+
+    def _category_targets(self) -> list:
+        """Collections carrying a category copy, the one whose update count is reported first."""
+        return [self.collection, self.latest]
+
+    def set_category(self, product_sku: str, category: str) -> int:
+        results = [
+            target.update_many({"product_sku": product_sku}, {"$set": {"category": category}})
+            for target in self._category_targets()
         ]
-        docs = list(self.collection.aggregate(pipeline))
-        return [self._doc_to_price(doc) for doc in docs]
+        return int(results[0].modified_count)
+
+    def ensure_categories(self) -> Optional[int]:
+        """Backfill categories when some latest price has none yet; None when nothing was to do."""
+        if self.latest.find_one({"category": {"$exists": False}}, {"_id": 1}) is None:
+            return None
+        return self.backfill_categories()
+
+    def backfill_categories(self, batch_size: int = 1000) -> int:
+        """Stamp each product's category onto its prices and latest prices; returns updated price count."""
+        updated = 0
+        skus_by_category: dict[str, list[str]] = {}
+        for doc in self.products.find({}, {"sku": 1, "category": 1}):
+            category = doc.get("category") or ProductCategory.SMARTPHONE.value
+            skus_by_category.setdefault(category, []).append(doc["sku"])
+        for category, skus in skus_by_category.items():
+            for start in range(0, len(skus), batch_size):
+                query = {"product_sku": {"$in": skus[start : start + batch_size]}, "category": {"$ne": category}}
+                results = [
+                    target.update_many(query, {"$set": {"category": category}}) for target in self._category_targets()
+                ]
+                updated += results[0].modified_count
+        return int(updated)
 
     def latest_stores_for_products(self, product_skus: List[str]) -> dict[str, List[str]]:
         if not product_skus:
             return {}
-        pipeline = [
-            {"$match": {"product_sku": {"$in": product_skus}}},
-            {"$group": {"_id": "$product_sku", "stores": {"$addToSet": "$store_code"}}},
-        ]
-        docs = list(self.collection.aggregate(pipeline))
-        return {doc["_id"]: sorted(doc.get("stores", [])) for doc in docs}
+        stores: dict[str, List[str]] = {}
+        for doc in self.latest.find({"product_sku": {"$in": product_skus}}, {"product_sku": 1, "store_code": 1}):
+            stores.setdefault(doc["product_sku"], []).append(doc["store_code"])
+        return {sku: sorted(codes) for sku, codes in stores.items()}
 
     def latest_prices_for_products(self, product_skus: List[str]) -> dict[str, List[PricePoint]]:
         if not product_skus:
             return {}
-        pipeline = [
-            {"$match": {"product_sku": {"$in": product_skus}}},
-            {"$sort": {"timestamp": -1}},
-            {"$group": {"_id": {"sku": "$product_sku", "store": "$store_code"}, "latest": {"$first": "$$ROOT"}}},
-            {"$replaceRoot": {"newRoot": "$latest"}},
-            {"$group": {"_id": "$product_sku", "offers": {"$push": "$$ROOT"}}},
-        ]
-        docs = list(self.collection.aggregate(pipeline))
         result: dict[str, List[PricePoint]] = {}
-        for doc in docs:
-            offers = [self._doc_to_price(item) for item in doc.get("offers", [])]
-            offers.sort(key=lambda p: p.price)
-            result[doc["_id"]] = offers
+        for doc in self.latest.find({"product_sku": {"$in": product_skus}}).sort("price", 1):
+            result.setdefault(doc["product_sku"], []).append(self._doc_to_price(doc, seen=True))
         return result
 
     def count(self) -> int:
@@ -307,21 +748,133 @@ class MongoPriceRepository(PriceRepository):
 
     def latest_timestamp(self) -> Optional[datetime]:
         doc = self.collection.find_one({}, {"timestamp": 1}, sort=[("timestamp", -1)])
-        return doc.get("timestamp") if doc else None
+        latest = doc.get("timestamp") if doc else None
+        # Deduplicated runs only move last_seen_at; older documents may not have it.
+        seen = self.collection.find_one({}, {"last_seen_at": 1}, sort=[("last_seen_at", -1)])
+        if seen and seen.get("last_seen_at") and (latest is None or seen["last_seen_at"] > latest):
+            return seen["last_seen_at"]
+        return latest
 
     def delete_for_product(self, product_sku: str) -> int:
-        result = self.collection.delete_many({"product_sku": product_sku})
+        result = self.collection.delete_many({self.SKU_FIELD: product_sku})
+        self.latest.delete_many({"product_sku": product_sku})
         return int(result.deleted_count)
 
     def delete_for_store(self, store_code: str) -> int:
-        result = self.collection.delete_many({"store_code": store_code})
+        result = self.collection.delete_many({self.STORE_FIELD: store_code})
+        self.latest.delete_many({"store_code": store_code})
         return int(result.deleted_count)
 
 
+class MongoTimeSeriesPriceRepository(MongoPriceRepository):
+    """Price history in a native time-series collection (`price_series`).
+
+    Points are stored with `timestamp` as the time field and `meta`
+    ({sku, store}) as the meta field, so Mongo buckets and compresses each
+    listing's observations together and history reads scan one series.
+    Every observation is inserted: dedup exists to save space, which the
+    bucketing already does, and it would need in-place updates of stored
+    measurements. Latest-price reads still go to `latest_prices`.
+    """
+
+    COLLECTION = "price_series"
+    SKU_FIELD = "meta.sku"
+    STORE_FIELD = "meta.store"
+
+    def __init__(self, db: Database, dedup: bool = False):
+        if dedup:
+            logger.info("Price dedup does not apply to the time-series backend; storing every observation")
+        super().__init__(db, dedup=False)
+
+    @classmethod
+    def ensure_collection(cls, db: Database):
+        """Create the time-series collection and its series index if they are missing."""
+        if cls.COLLECTION not in db.list_collection_names(filter={"name": cls.COLLECTION}):
+            db.create_collection(
+                cls.COLLECTION,
+                timeseries={"timeField": "timestamp", "metaField": "meta", "granularity": "hours"},
+            )
+        collection = db[cls.COLLECTION]
+        collection.create_index([("meta.sku", 1), ("meta.store", 1), ("timestamp", -1)])
+        return collection
+
+    def _history_collection(self, db: Database):
+        return self.ensure_collection(db)
+
+    def _to_stored(self, doc: dict) -> dict:
+        skipped = ("product_sku", "store_code", "last_seen_at")
+        stored = {name: value for name, value in doc.items() if name not in skipped}
+        stored["meta"] = {"sku": doc["product_sku"], "store": doc["store_code"]}
+        return stored
+
+    def _from_stored(self, doc: dict) -> dict:
+        meta = doc.get("meta") or {}
+        flat = {name: value for name, value in doc.items() if name not in ("meta", "source_id")}
+        flat.update(product_sku=meta.get("sku"), store_code=meta.get("store"), last_seen_at=doc["timestamp"])
+        return flat
+
+    def _from_stored_stages(self) -> list[dict]:
+        return [
+            {"$set": {"product_sku": "$meta.sku", "store_code": "$meta.store", "last_seen_at": "$timestamp"}},
+            {"$unset": ["meta", "source_id"]},
+        ]
+
+    def _category_targets(self) -> list:
+        # Measurements keep the category they were observed under; category reads use latest prices.
+        return [self.latest]
+
+    def latest_timestamp(self) -> Optional[datetime]:
+        doc = self.collection.find_one({}, {"timestamp": 1}, sort=[("timestamp", -1)])
+        return doc.get("timestamp") if doc else None
+
+    def migrate_from(self, source, batch_size: int = 1000, after: Optional[ObjectId] = None):
+        """Copy points from a plain `prices` collection in `_id` order, yielding (copied, last _id) per batch.
+
+        Ids are kept, so `latest_prices.price_id` stays valid. A deduplicated
+        point also gets a measurement at its `last_seen_at`, so the series
+        keeps the end of the interval it was seen unchanged.
+        Every copied measurement records its source point in `source_id`.
+        Only the first batch after `after` can have been cut short by a
+        crash, so measurements it already copied are skipped, not duplicated.
+        """
+        query = {"_id": {"$gt": after}} if after is not None else {}
+        batch: list[dict] = []
+        resumed = True
+        for doc in source.find(query).sort("_id", 1):
+            batch.extend(self._migrated(doc))
+            if len(batch) >= batch_size:
+                yield self._insert_migrated(batch, resumed), doc["_id"]
+                batch, resumed = [], False
+        if batch:
+            yield self._insert_migrated(batch, resumed), doc["_id"]
+
+    def _migrated(self, doc: dict) -> list[dict]:
+        stored = self._to_stored({**doc, "source_id": doc["_id"]})
+        last_seen_at = doc.get("last_seen_at")
+        if last_seen_at is None or last_seen_at <= doc["timestamp"]:
+            return [stored]
+        return [stored, {**stored, "_id": ObjectId(), "timestamp": last_seen_at}]
+
+    def _insert_migrated(self, batch: list[dict], resumed: bool) -> int:
+        if resumed:
+            ids = [doc["source_id"] for doc in batch]
+            copied = {
+                (doc["source_id"], doc["timestamp"])
+                for doc in self.collection.find(
+                    {"source_id": {"$gte": min(ids), "$lte": max(ids)}}, {"source_id": 1, "timestamp": 1}
+                )
+            }
+            batch = [doc for doc in batch if (doc["source_id"], doc["timestamp"]) not in copied]
+        if batch:
+            self.collection.insert_many(batch, ordered=False)
+        return len(batch)
+
+
 class MongoUserRepository(UserRepository):
     def __init__(self, db: Database):
         self.collection = db["users"]
         self.collection.create_index("email", unique=True)
+        self.collection.create_index([("created_at", -1), ("email", 1)])
 
     def create(self, user: User) -> str:
         try:
@@ -374,51 +927,61 @@ class MongoUserRepository(UserRepository):
             created_at=created_at,
         )
 
+    _PROJECTION = {
+        "_id": 1,
+        "email": 1,
+        "password_hash": 1,
+        "name": 1,
+        "role": 1,
+        "created_at": 1,
+    }
+
+    @staticmethod
+    def _user_filter(query: Optional[str]) -> dict:
+        if not query:
+            return {}
+        return {
+            "$or": [
+                {"email": {"$regex": query, "$options": "i"}},
+                {"name": {"$regex": query, "$options": "i"}},
+            ]
+        }
+
+    @staticmethod
+    def _doc_to_user(doc: dict) -> User:
+        return User(
+            id=str(doc["_id"]),
+            email=doc["email"],
+            password_hash=doc.get("password_hash", ""),
+            name=doc.get("name"),
+            role=doc.get("role", "user"),
+            created_at=doc.get("created_at") or datetime.now(timezone.utc),
+        )
+
     def list_users(
         self,
         query: Optional[str] = None,
         limit: int = 50,
         offset: int = 0,
     ) -> List[User]:
-        filter_ = {}
-        if query:
-            filter_ = {
-                "$or": [
-                    {"email": {"$regex": query, "$options": "i"}},
-                    {"name": {"$regex": query, "$options": "i"}},
-                ]
-            }
         cursor = (
-            self.collection.find(
-                filter_,
-                {
-                    "_id": 1,
-                    "email": 1,
-                    "password_hash": 1,
-                    "name": 1,
-                    "role": 1,
-                    "created_at": 1,
-                },
-            )
-            .sort([("created_at", -1), ("email", 1)])
+            self.collection.find(self._user_filter(query), self._PROJECTION)
+            .sort(_USER_ORDER)
             .skip(max(offset, 0))
         )
         if limit:
             cursor = cursor.limit(limit)
-        users: List[User] = []
-        for doc in cursor:
-            created_at = doc.get("created_at") or datetime.now(timezone.utc)
-            users.append(
-                User(
-                    id=str(doc["_id"]),
-                    email=doc["email"],
-                    password_hash=doc.get("password_hash", ""),
-                    name=doc.get("name"),
-                    role=doc.get("role", "user"),
-                    created_at=created_at,
-                )
-            )
-        return users
+        return [self._doc_to_user(doc) for doc in cursor]
+
+    def page_users(self, query: Optional[str] = None, limit: int = 50, after: Optional[str] = None) -> Page[User]:
+        """Keyset page of `list_users` over (created_at desc, email)."""
+        filter_ = self._user_filter(query)
+        if after:
+            keyset = _keyset_filter(_USER_ORDER, decode_cursor(after, len(_USER_ORDER)))
+            filter_ = {"$and": [filter_, keyset]} if filter_ else keyset
+        cursor = self.collection.find(filter_, self._PROJECTION).sort(_USER_ORDER).limit(limit + 1)
+        docs, next_after = _page(list(cursor), _USER_ORDER, limit)
+        return Page(items=[self._doc_to_user(doc) for doc in docs], next_after=next_after)
 
     def update(self, user: User) -> User:
         if not user.id:
@@ -456,15 +1019,9 @@ class MongoUserRepository(UserRepository):
             raise RepositoryError from exc
 
     def count(self, query: Optional[str] = None) -> int:
-        filter_ = {}
-        if query:
-            filter_ = {
-                "$or": [
-                    {"email": {"$regex": query, "$options": "i"}},
-                    {"name": {"$regex": query, "$options": "i"}},
-                ]
-            }
-        return int(self.collection.count_documents(filter_))
+        if not query:
+            return int(self.collection.estimated_document_count())
+        return int(self.collection.count_documents(self._user_filter(query)))
 
     def delete(self, user_id: str) -> bool:
         if not user_id:
@@ -555,3 +1112,228 @@ class MongoUserRepository(UserRepository):
         except Exception as exc:  # pragma: no cover - defensive logging
             logger.exception("Refresh token clear failed: %s", exc)
             raise RepositoryError from exc
+
+
+def _utc(value: datetime | None) -> datetime | None:
+    # The client is not tz-aware, so stored datetimes come back naive UTC.
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class MongoScrapeRunRepository(ScrapeRunRepository):
+    """Scrape-run ledger: one document per run with a sub-document per scraper key."""
+
+    def __init__(self, db: Database):
+        self.collection = db["scrape_runs"]
+        self.collection.create_index([("status", 1), ("started_at", -1)])
+        self.collection.create_index([("started_at", -1)])
+
+    def start_run(self, started_at: datetime) -> ScrapeRun:
+        doc = {"started_at": started_at, "updated_at": started_at, "status": "running", "scrapers": {}}
+        inserted = self.collection.insert_one(doc)
+        return ScrapeRun(id=str(inserted.inserted_id), started_at=started_at)
+
+    def find_resumable(self, since: datetime) -> Optional[ScrapeRun]:
+        doc = self.collection.find_one(
+            {"status": "running", "started_at": {"$gte": since}},
+            sort=[("started_at", -1)],
+        )
+        if not doc:
+            return None
+        return self._doc_to_run(doc)
+
+    def recent_runs(self, limit: int = 10) -> List[ScrapeRun]:
+        cursor = self.collection.find({}).sort("started_at", -1).limit(limit)
+        return [self._doc_to_run(doc) for doc in cursor]
+
+    def get_run(self, run_id: str) -> Optional[ScrapeRun]:
+        try:
+            doc = self.collection.find_one({"_id": _object_id(run_id)})
+        except Exception:
+            # Queued runs recorded without a ledger use ids that are not ObjectIds.
+            return None
+        return self._doc_to_run(doc) if doc else None
+
+    def _doc_to_run(self, doc: dict) -> ScrapeRun:
+        scrapers = {
+            key: ScraperCheckpoint(
+                cursor=int(state.get("cursor", 0)),
+                items=int(state.get("items", 0)),
+                status=state.get("status", "running"),
+                error=state.get("error"),
+                metrics=state.get("metrics"),
+            )
+            for key, state in (doc.get("scrapers") or {}).items()
+        }
+        return ScrapeRun(
+            id=str(doc["_id"]),
+            started_at=_utc(doc["started_at"]),
+            status=doc["status"],
+            scrapers=scrapers,
+            finished_at=_utc(doc.get("finished_at")),
+        )
+
+    def abandon_stale(self, before: datetime) -> int:
+        result = self.collection.update_many(
+            {"status": "running", "started_at": {"$lt": before}},
+            {"$set": {"status": "abandoned", "finished_at": datetime.now(timezone.utc)}},
+        )
+        return int(result.modified_count)
+
+    def checkpoint(self, run_id: str, scraper_key: str, cursor: int, items: int) -> None:
+        now = datetime.now(timezone.utc)
+        self.collection.update_one(
+            {"_id": _object_id(run_id)},
+            {
+                "$set": {
+                    f"scrapers.{scraper_key}.status": "running",
+                    f"scrapers.{scraper_key}.items": items,
+                    f"scrapers.{scraper_key}.updated_at": now,
+                    "updated_at": now,
+                },
+                # Pages commit in order, but never move a cursor backwards.
+                "$max": {f"scrapers.{scraper_key}.cursor": cursor},
+            },
+        )
+
+    def finish_scraper(
+        self,
+        run_id: str,
+        scraper_key: str,
+        status: str,
+        items: int,
+        error: Optional[str] = None,
+        metrics: Optional[dict] = None,
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        fields = {
+            f"scrapers.{scraper_key}.status": status,
+            f"scrapers.{scraper_key}.items": items,
+            f"scrapers.{scraper_key}.error": error,
+            f"scrapers.{scraper_key}.updated_at": now,
+            "updated_at": now,
+        }
+        if metrics is not None:
+            fields[f"scrapers.{scraper_key}.metrics"] = metrics
+        self.collection.update_one({"_id": _object_id(run_id)}, {"$set": fields})
+
+    def finish_run(self, run_id: str, status: str = "completed") -> None:
+        now = datetime.now(timezone.utc)
+        self.collection.update_one(
+            {"_id": _object_id(run_id)},
+            {"$set": {"status": status, "finished_at": now, "updated_at": now}},
+        )
+
+
+class MongoScrapeJobRepository(ScrapeJobRepository):
+    """Per-scraper job queue; claims are single find_one_and_update calls, so workers never share a job."""
+
+    def __init__(self, db: Database):
+        self.collection = db["scrape_jobs"]
+        self.collection.create_index([("status", 1), ("enqueued_at", 1)])
+        self.collection.create_index([("status", 1), ("lease_expires_at", 1)])
+        self.collection.create_index([("run_id", 1), ("enqueued_at", 1)])
+
+    def enqueue(self, jobs: Sequence[ScrapeJob]) -> List[str]:
+        if not jobs:
+            return []
+        docs = [
+            {
+                "run_id": job.run_id,
+                "scraper_key": job.scraper_key,
+                "run_started_at": job.run_started_at,
+                "status": job.status,
+                "attempts": job.attempts,
+                "worker_id": None,
+                "lease_expires_at": None,
+                "items": 0,
+                "error": None,
+                "enqueued_at": job.enqueued_at,
+                "finished_at": None,
+            }
+            for job in jobs
+        ]
+        inserted = self.collection.insert_many(docs)
+        return [str(id_) for id_ in inserted.inserted_ids]
+
+    def claim(self, worker_id: str, now: datetime, lease_sec: float, max_attempts: int) -> Optional[ScrapeJob]:
+        doc = self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": "queued"},
+                    {"status": "running", "lease_expires_at": {"$lt": now}},
+                ],
+                "attempts": {"$lt": max_attempts},
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "worker_id": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=lease_sec),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("enqueued_at", 1), ("_id", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        return self._doc_to_job(doc) if doc else None
+
+    def fail_expired(self, now: datetime, max_attempts: int) -> List[str]:
+        # A worker that died on its last attempt leaves a job nobody may retry.
+        query = {"status": "running", "lease_expires_at": {"$lt": now}, "attempts": {"$gte": max_attempts}}
+        expired = list(self.collection.find(query, {"run_id": 1}))
+        if not expired:
+            return []
+        self.collection.update_many(
+            {**query, "_id": {"$in": [doc["_id"] for doc in expired]}},
+            {"$set": {"status": "failed", "error": "Lease expired", "finished_at": now, "worker_id": None}},
+        )
+        return sorted({doc["run_id"] for doc in expired})
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_expires_at: datetime) -> bool:
+        result = self.collection.update_one(
+            {"_id": _object_id(job_id), "worker_id": worker_id, "status": "running"},
+            {"$set": {"lease_expires_at": lease_expires_at}},
+        )
+        return result.matched_count == 1
+
+    def complete(self, job_id: str, worker_id: str, status: str, items: int, error: Optional[str] = None) -> bool:
+        result = self.collection.update_one(
+            {"_id": _object_id(job_id), "worker_id": worker_id, "status": "running"},
+            {
+                "$set": {
+                    "status": status,
+                    "items": items,
+                    "error": error,
+                    "finished_at": datetime.now(timezone.utc),
+                    "lease_expires_at": None,
+                }
+            },
+        )
+        return result.matched_count == 1
+
+    def jobs_for_run(self, run_id: str) -> List[ScrapeJob]:
+        cursor = self.collection.find({"run_id": run_id}).sort([("enqueued_at", 1), ("_id", 1)])
+        return [self._doc_to_job(doc) for doc in cursor]
+
+    def latest_run_id(self) -> Optional[str]:
+        doc = self.collection.find_one({}, {"run_id": 1}, sort=[("enqueued_at", -1), ("_id", -1)])
+        return doc["run_id"] if doc else None
+
+    @staticmethod
+    def _doc_to_job(doc: dict) -> ScrapeJob:
+        return ScrapeJob(
+            id=str(doc["_id"]),
+            run_id=doc["run_id"],
+            scraper_key=doc["scraper_key"],
+            run_started_at=_utc(doc["run_started_at"]),
+            status=doc.get("status", "queued"),
+            attempts=int(doc.get("attempts", 0)),
+            worker_id=doc.get("worker_id"),
+            lease_expires_at=_utc(doc.get("lease_expires_at")),
+            items=int(doc.get("items", 0)),
+            error=doc.get("error"),
+            enqueued_at=_utc(doc["enqueued_at"]),
+            finished_at=_utc(doc.get("finished_at")),
+        )
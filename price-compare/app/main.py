@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from pathlib import Path
 from contextlib import asynccontextmanager
@@ -9,7 +10,7 @@ from .api import products, shops, prices, compare, auth, admin
 from .api.error_handlers import register_exception_handlers
 from .config import settings, ensure_secure_settings
 from .database import ensure_indexes
-from .dependencies import get_ingestion_service
+from .dependencies import get_parse_pool, get_price_store, get_product_repo, start_scrape
 from .security.jwt import JWTError, decode_jwt
 
 logger = logging.getLogger(__name__)
@@ -55,7 +56,7 @@ def render_page(
 
 
 scheduler = BackgroundScheduler()
-scheduler.add_job(lambda: get_ingestion_service().run_all(), "interval", minutes=settings.scrape_interval_min)
+scheduler.add_job(start_scrape, "interval", minutes=settings.scrape_interval_min)
 
 
 @asynccontextmanager
@@ -63,8 +64,14 @@ async def lifespan(app: FastAPI):
     ensure_secure_settings()
     try:
         ensure_indexes()
+        # Derived fields and collections for data written before they existed.
+        price_store = get_price_store()
+        price_store.ensure_latest()
+        price_store.ensure_categories()
+        get_product_repo().backfill_search_fields()
         if settings.scrape_on_startup:
-            get_ingestion_service().run_all()
+            # run_all drives its own event loop for concurrent fetching, so keep it off this one.
+            await asyncio.to_thread(start_scrape)
         scheduler.start()
     except Exception as exc:  # pragma: no cover - defensive
         logger.exception("Startup hook failed: %s", exc)
@@ -73,6 +80,9 @@ async def lifespan(app: FastAPI):
     finally:
         if scheduler.running:
             scheduler.shutdown()
+        parse_pool = get_parse_pool()
+        if parse_pool is not None:
+            parse_pool.shutdown()
 
 
 app = FastAPI(title="KS Price Compare", lifespan=lifespan)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -40,6 +40,8 @@ class AdminSystemSummary(BaseModel):
     scrape_retries: int
     scrape_backoff_sec: float
     scrape_delay_sec: float
+    scrape_rate_per_sec: float = 0.0
+    scrape_rate_burst: int = 1
 
 
 class AdminInsightsResponse(BaseModel):
@@ -59,11 +61,36 @@ class AdminScrapeStatusResponse(BaseModel):
     total: int
     completed: int
     current_store: Optional[str] = None
+    current_stores: List[str] = []
     started_at: Optional[datetime] = None
     finished_at: Optional[datetime] = None
     last_error: Optional[str] = None
 
 
+class AdminScraperMetrics(BaseModel):
+    scraper: str
+    status: str
+    items: int
+    error: Optional[str] = None
+    metrics: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Pages, bytes, HTTP latency percentiles, parse CPU, gallery requests, write time and stages",
+    )
+
+
+class AdminScrapeRunMetrics(BaseModel):
+    id: str
+    status: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    totals: Dict[str, Any]
+    scrapers: List[AdminScraperMetrics]
+
+
+class AdminScrapeMetricsResponse(BaseModel):
+    runs: List[AdminScrapeRunMetrics]
+
+
 class AdminProductResponse(BaseModel):
     sku: str
     name: str
@@ -92,7 +119,10 @@ class AdminProductUpdateRequest(BaseModel):
 
 class AdminProductListResponse(BaseModel):
     items: List[AdminProductResponse]
-    total: int
+    # None when the caller passed with_total=false.
+    total: Optional[int] = None
+    # Token for the next page (`after=`); None on the last page and for offset paging.
+    next_after: Optional[str] = None
 
 
 class AdminShopResponse(BaseModel):
@@ -138,7 +168,10 @@ class AdminUserUpdateRequest(BaseModel):
 
 class AdminUserListResponse(BaseModel):
     items: List[AdminUserResponse]
-    total: int
+    # None when the caller passed with_total=false.
+    total: Optional[int] = None
+    # Token for the next page (`after=`); None on the last page and for offset paging.
+    next_after: Optional[str] = None
 
 
 class AdminDeleteResponse(BaseModel):
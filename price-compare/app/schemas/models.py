@@ -34,6 +34,8 @@ class PriceResponse(BaseModel):
     product_url: str
     in_stock: bool
     timestamp: datetime
+    # With PRICE_DEDUP, history entries are change points seen unchanged until this time.
+    last_seen_at: Optional[datetime] = None
 
 
 class CompareResponse(BaseModel):
@@ -14,7 +14,10 @@ class ComparisonService:
         product = self.product_repo.get_by_sku(sku)
         if not product:
             return None, [], None
-        offers = self.price_repo.latest_for_product(product.sku)
+        # Listings matched at ingest share a canonical SKU, so one keyed read covers every shop.
+        offers = self.price_repo.latest_for_canonical(product.canonical_sku) if product.canonical_sku else []
+        if not offers:
+            offers = self.price_repo.latest_for_product(product.sku)
         cheapest = min(offers, key=lambda p: p.price) if offers else None
         return product, offers, cheapest
 
@@ -0,0 +1,92 @@
+import logging
+import threading
+from typing import Iterable, Sequence
+
+from ..domain.models import Product, Shop
+from ..domain.repositories import ProductRepository, ShopRepository
+
+logger = logging.getLogger(__name__)
+
+
+def _same_product(stored: Product, product: Product) -> bool:
+    """True when upserting `product` would leave the stored document unchanged."""
+    if (stored.name, stored.category, stored.brand) != (product.name, product.category, product.brand):
+        return False
+    # Upserts only $set optional fields that are present, so a missing one changes nothing.
+    if product.canonical_sku is not None and product.canonical_sku != stored.canonical_sku:
+        return False
+    if product.image_url is not None and product.image_url != stored.image_url:
+        return False
+    if product.image_urls is not None and product.image_urls != stored.image_urls:
+        return False
+    return True
+
+
+class IdentityMap:
+    """SKU → product and shop code → shop maps for one ingestion run.
+
+    Warmed once per run from a projection query, so products and shops whose
+    stored fields already match skip their upsert and reuse the known id.
+    Writes made during the run are remembered too. The run's scraper threads
+    share one map, so lookups, updates and the hit/miss counters hold a lock.
+    """
+
+    def __init__(self, products: Iterable[Product] = (), shops: Iterable[Shop] = ()) -> None:
+        self._products: dict[str, Product] = {product.sku: product for product in products if product.id}
+        self._shops: dict[str, Shop] = {shop.code.value: shop for shop in shops if shop.id}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(
+        cls,
+        product_repo: ProductRepository,
+        shop_repo: ShopRepository,
+        products: Sequence[Product] | None = None,
+    ) -> "IdentityMap":
+        """Warm from the repositories; pass `products` when they were already listed this run."""
+        if products is None:
+            products = product_repo.list_identities()
+        identities = cls(products, shop_repo.list_shops())
+        logger.info("Identity map warmed products=%s shops=%s", len(identities._products), len(identities._shops))
+        return identities
+
+    def product_id(self, product: Product) -> str | None:
+        """Stored id for `product` if writing it again would change nothing, else None."""
+        with self._lock:
+            stored = self._products.get(product.sku)
+            if stored is not None and _same_product(stored, product):
+                self.hits += 1
+                return stored.id
+            self.misses += 1
+            return None
+
+    def remember_product(self, product: Product, product_id: str) -> None:
+        with self._lock:
+            stored = self._products.get(product.sku)
+            # Keep stored optional fields the upsert did not overwrite.
+            image_url = product.image_url if product.image_url is not None else getattr(stored, "image_url", None)
+            image_urls = product.image_urls if product.image_urls is not None else getattr(stored, "image_urls", None)
+            canonical_sku = product.canonical_sku or getattr(stored, "canonical_sku", None)
+            self._products[product.sku] = Product(
+                sku=product.sku,
+                name=product.name,
+                category=product.category,
+                brand=product.brand,
+                image_url=image_url,
+                image_urls=image_urls,
+                canonical_sku=canonical_sku,
+                id=product_id,
+            )
+
+    def shop_id(self, shop: Shop) -> str | None:
+        with self._lock:
+            stored = self._shops.get(shop.code.value)
+        if stored is not None and stored.name == shop.name:
+            return stored.id
+        return None
+
+    def remember_shop(self, shop: Shop, shop_id: str) -> None:
+        with self._lock:
+            self._shops[shop.code.value] = Shop(code=shop.code, name=shop.name, id=shop_id)
@@ -1,14 +1,85 @@
 import logging
-from datetime import datetime, timezone
-from typing import Iterable
-from ..domain.models import Product, Shop, PricePoint
-from ..domain.repositories import ProductRepository, ShopRepository, PriceRepository
-from .pricing import PricingStrategy, apply_pricing_strategies, default_pricing_strategies
-from .scraping.base import BaseScraper
+import threading
+import time
+import uuid
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Iterator, List, Sequence
+from ..config import settings
+from ..domain.models import Product, Shop, PricePoint, ScrapeJob, ScrapeRun
+from ..domain.repositories import (
+    BulkWriteResult,
+    ProductRepository,
+    ShopRepository,
+    PriceRepository,
+    ScrapeJobRepository,
+    ScrapeRunRepository,
+)
+from .identity_map import IdentityMap
+from .matching import MatchingIndex
+from .pipeline import StagedPipeline, StageMetrics
+from .pricing import PricingStrategy, apply_pricing_many, apply_pricing_strategies, default_pricing_strategies
+from .scraping.base import BaseScraper, FetchedPage
+from .scraping.engine import AsyncFetchEngine
+from .scraping.metrics import ScraperMetrics, run_totals
+from .scraping.parse_pool import ParsePool
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class ScrapeOutcome:
+    """Result of ingesting one scraper; `error` is set when it failed or ran out of time."""
+
+    store: str
+    items: int = 0
+    errors: int = 0
+    error: str | None = None
+    stages: List[StageMetrics] = field(default_factory=list)
+    # Fetch, parse and write costs plus stage timings, as persisted in the run ledger.
+    metrics: dict | None = None
+
+
+@dataclass(slots=True)
+class _IngestProgress:
+    # The normalize and persist stages may run on different threads, so each owns its counters.
+    seen: int = 0
+    build_errors: int = 0
+    items: int = 0
+    write_errors: int = 0
+    failure: str | None = None
+    # Ledger run this scraper checkpoints into, and items it committed before a resume.
+    run_id: str | None = None
+    resumed_items: int = 0
+    # Run-wide identity map and cross-store matching index shared by every scraper, when enabled.
+    identities: IdentityMap | None = None
+    matcher: MatchingIndex | None = None
+
+    @property
+    def error_count(self) -> int:
+        return self.build_errors + self.write_errors
+
+
+@dataclass(slots=True)
+class _PageEnd:
+    """Marker emitted after the last item of a parsed target page."""
+
+    position: int
+
+
+@dataclass(slots=True)
+class _RecordBatch:
+    records: list[tuple[str, Product, PricePoint]] = field(default_factory=list)
+    # Target-page cursor that is fully persisted once this batch is written.
+    cursor: int | None = None
+
+
+ScraperCallback = Callable[[BaseScraper], None]
+OutcomeCallback = Callable[[BaseScraper, ScrapeOutcome], None]
+
+
 class IngestionService:
     """Application layer service responsible for ingesting scraped data."""
 
@@ -19,54 +90,642 @@ class IngestionService:
         price_repo: PriceRepository,
         scrapers: Iterable[BaseScraper],
         pricing_strategies: Iterable[PricingStrategy] | None = None,
+        fetch_engine: AsyncFetchEngine | None = None,
+        parse_pool: ParsePool | None = None,
+        batch_size: int | None = None,
+        pipeline_queue_size: int | None = None,
+        workers: int | None = None,
+        scraper_timeout_sec: float | None = None,
+        run_deadline_sec: float | None = None,
+        run_ledger: ScrapeRunRepository | None = None,
+        resume_max_age_min: float | None = None,
+        identity_map: bool | None = None,
+        matching: bool | None = None,
     ):
         self.product_repo = product_repo
         self.shop_repo = shop_repo
         self.price_repo = price_repo
         self.scrapers = list(scrapers)
         self.pricing_strategies = list(pricing_strategies or default_pricing_strategies())
+        self.fetch_engine = fetch_engine
+        self.parse_pool = parse_pool
+        # Items are buffered per scraper and written in bulk; 0 or 1 writes each item immediately.
+        self.batch_size = settings.ingest_batch_size if batch_size is None else batch_size
+        # Depth of the page and batch queues between pipeline stages; 0 runs every stage inline.
+        self.pipeline_queue_size = (
+            settings.ingest_pipeline_queue if pipeline_queue_size is None else pipeline_queue_size
+        )
+        self.workers = max(1, settings.scrape_workers if workers is None else workers)
+        self.scraper_timeout_sec = (
+            settings.scrape_scraper_timeout_sec if scraper_timeout_sec is None else scraper_timeout_sec
+        )
+        self.run_deadline_sec = settings.scrape_run_deadline_sec if run_deadline_sec is None else run_deadline_sec
+        # Without a ledger runs are not checkpointed and always start from page 1.
+        self.run_ledger = run_ledger
+        self.resume_max_age_min = (
+            settings.scrape_resume_max_age_min if resume_max_age_min is None else resume_max_age_min
+        )
+        self.identity_map = settings.ingest_identity_map if identity_map is None else identity_map
+        self.matching = settings.ingest_matching if matching is None else matching
 
-    def run_all(self) -> None:
-        now = datetime.now(timezone.utc)
+    def run_all(
+        self,
+        on_start: ScraperCallback | None = None,
+        on_done: OutcomeCallback | None = None,
+    ) -> List[ScrapeOutcome]:
+        """Ingest every scraper, up to `workers` at a time, within the run deadline.
+
+        Each scraper gets its own timeout and failures stay isolated per store.
+        Timeouts are cooperative: an over-time scraper stops at its next item,
+        keeps what it already ingested and reports the timeout as its error.
+        Callbacks fire from worker threads as scrapers start and finish. Each
+        scraper downloads its pages inside its own worker and timeout, and a
+        run whose stragglers are still writing past the deadline is left open
+        so the next run resumes it. Scrapers given up on (never started, or
+        still running) are reported to `on_done` with their timeout outcome
+        when the run returns, and only once.
+
+        With a run ledger, every persisted page is checkpointed. A run that
+        was interrupted (still marked running) is resumed: finished scrapers
+        are skipped, the rest continue after their last committed page, and
+        prices keep the original run's timestamp.
+
+        Known product and shop ids are loaded once per run into an identity
+        map, so unchanged products skip their upsert. The same product list
+        seeds the matching index that assigns every listing its canonical
+        SKU, so offers for one phone compare together across shops.
+        """
+        started = time.monotonic()
+        run = self._open_run()
+        identities, matcher = self._load_catalog()
+        now = run.started_at if run is not None else datetime.now(timezone.utc)
+        run_deadline = time.monotonic() + self.run_deadline_sec if self.run_deadline_sec > 0 else None
         for scraper in self.scrapers:
-            self._ingest_scraper(scraper, now)
+            self._prepare_scraper(scraper, run)
+        on_done = self._report_once(on_done)
+        args = (now, run_deadline, on_start, on_done, run, identities, matcher)
+        finished = True
+        if self.workers <= 1 or len(self.scrapers) <= 1:
+            outcomes = [self._run_scraper(scraper, *args) for scraper in self.scrapers]
+        else:
+            pool = ThreadPoolExecutor(max_workers=min(self.workers, len(self.scrapers)), thread_name_prefix="scrape")
+            futures = [pool.submit(self._run_scraper, scraper, *args) for scraper in self.scrapers]
+            # Give in-flight scrapers one timeout's grace to notice the deadline, then stop waiting.
+            grace = self.scraper_timeout_sec if self.scraper_timeout_sec > 0 else None
+            wait_for = (
+                None if run_deadline is None or grace is None else max(0.0, run_deadline - time.monotonic()) + grace
+            )
+            done, _ = wait(futures, timeout=wait_for)
+            pool.shutdown(wait=False, cancel_futures=True)
+            outcomes = []
+            for scraper, future in zip(self.scrapers, futures, strict=True):
+                if future in done:
+                    outcomes.append(future.result())
+                else:
+                    finished = False
+                    if future.cancelled():
+                        logger.error("Scraper %s never started before the run deadline", scraper.store)
+                    else:
+                        logger.error("Scraper %s still running past the run deadline; not waiting", scraper.store)
+                    outcome = ScrapeOutcome(store=scraper.store.value, error="Run deadline exceeded")
+                    outcomes.append(outcome)
+                    self._notify_done(on_done, scraper, outcome)
+        if finished:
+            self._close_run(run)
+        elif run is not None:
+            # Stragglers keep checkpointing into the run, so the next run resumes it instead of starting over.
+            logger.warning("Leaving scrape run %s open while scrapers are still writing", run.id)
+        if identities is not None:
+            logger.info("Identity map skipped %s product upserts, wrote %s", identities.hits, identities.misses)
+        self._log_run_metrics(outcomes, started)
+        return outcomes
+
+    def enqueue_run(self, jobs: ScrapeJobRepository) -> str:
+        """Queue one job per scraper for workers to claim and return the run id.
+
+        While the latest queued run still has open jobs, its id is returned
+        instead of queueing the scrapers again. Jobs share the ledger run
+        (resuming an interrupted one, as `run_all` would), so workers
+        checkpoint and stamp prices the same way an in-process run does.
+        """
+        latest = jobs.latest_run_id()
+        if latest is not None and any(job.status in ("queued", "running") for job in jobs.jobs_for_run(latest)):
+            logger.info("Scrape run %s still has open jobs; not queueing another", latest)
+            return latest
+        run = self._open_run()
+        run_id = run.id if run is not None else uuid.uuid4().hex
+        started_at = run.started_at if run is not None else datetime.now(timezone.utc)
+        jobs.enqueue(
+            [ScrapeJob(run_id=run_id, scraper_key=scraper.key, run_started_at=started_at) for scraper in self.scrapers]
+        )
+        logger.info("Queued scrape run %s with %s jobs", run_id, len(self.scrapers))
+        return run_id
+
+    def run_job(self, job: ScrapeJob) -> ScrapeOutcome:
+        """Ingest the single scraper a worker claimed, within the job's run."""
+        scraper = next((scraper for scraper in self.scrapers if scraper.key == job.scraper_key), None)
+        if scraper is None:
+            return ScrapeOutcome(store=job.scraper_key, error=f"Unknown scraper {job.scraper_key}")
+        run = None
+        if self.run_ledger is not None:
+            try:
+                run = self.run_ledger.get_run(job.run_id)
+            except Exception as exc:
+                logger.warning("Scrape run ledger unavailable, running job without checkpoints: %s", exc)
+        self._prepare_scraper(scraper, run)
+        identities, matcher = self._load_catalog()
+        return self._run_scraper(scraper, job.run_started_at, None, None, None, run, identities, matcher)
+
+    def close_run(self, run_id: str) -> None:
+        """Mark a queued run's ledger entry completed once all its jobs finished."""
+        if self.run_ledger is not None:
+            self._ledger_call(self.run_ledger.finish_run, run_id)
+
+    @staticmethod
+    def _prepare_scraper(scraper: BaseScraper, run: ScrapeRun | None) -> None:
+        checkpoint = run.scrapers.get(scraper.key) if run is not None else None
+        scraper.resume_cursor = checkpoint.cursor if checkpoint is not None and checkpoint.status == "running" else 0
+        scraper.metrics = ScraperMetrics()
+
+    @staticmethod
+    def _log_run_metrics(outcomes: List[ScrapeOutcome], started: float) -> None:
+        totals = run_totals(
+            (outcome.metrics for outcome in outcomes if outcome.metrics), duration_sec=time.monotonic() - started
+        )
+        logger.info("Scrape run metrics %s", " ".join(f"{name}={value}" for name, value in totals.items()))
+
+    def _load_catalog(self) -> tuple[IdentityMap | None, MatchingIndex | None]:
+        """Identity map and matching index for this run, from one listing of known products."""
+        if not self.identity_map and not self.matching:
+            return None, None
+        try:
+            products = self.product_repo.list_identities()
+        except Exception as exc:
+            logger.warning("Could not list known products, starting from an empty catalog: %s", exc)
+            products = []
+        identities = None
+        if self.identity_map:
+            try:
+                identities = IdentityMap.load(self.product_repo, self.shop_repo, products)
+            except Exception as exc:
+                logger.warning("Could not warm identity map, upserting every product: %s", exc)
+                identities = IdentityMap()
+        matcher = MatchingIndex.from_products(products) if self.matching else None
+        return identities, matcher
+
+    def _open_run(self) -> ScrapeRun | None:
+        """Resume the latest interrupted run, or record a new one."""
+        if self.run_ledger is None:
+            return None
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(minutes=self.resume_max_age_min)
+        try:
+            abandoned = self.run_ledger.abandon_stale(cutoff)
+            if abandoned:
+                logger.info("Abandoned %s interrupted scrape runs older than %s", abandoned, cutoff)
+            run = self.run_ledger.find_resumable(cutoff)
+            if run is not None:
+                logger.info("Resuming scrape run %s started at %s", run.id, run.started_at)
+                return run
+            return self.run_ledger.start_run(now)
+        except Exception as exc:
+            logger.warning("Scrape run ledger unavailable, running without checkpoints: %s", exc)
+            return None
+
+    def _close_run(self, run: ScrapeRun | None) -> None:
+        if run is None:
+            return
+        try:
+            self.run_ledger.finish_run(run.id)
+        except Exception as exc:
+            logger.warning("Could not close scrape run %s: %s", run.id, exc)
+
+    @staticmethod
+    def _finished_in(run: ScrapeRun | None, scraper: BaseScraper) -> bool:
+        checkpoint = run.scrapers.get(scraper.key) if run is not None else None
+        return checkpoint is not None and checkpoint.status != "running"
+
+    def _run_scraper(
+        self,
+        scraper: BaseScraper,
+        timestamp: datetime,
+        run_deadline: float | None,
+        on_start: ScraperCallback | None,
+        on_done: OutcomeCallback | None,
+        run: ScrapeRun | None = None,
+        identities: IdentityMap | None = None,
+        matcher: MatchingIndex | None = None,
+    ) -> ScrapeOutcome:
+        started = time.monotonic()
+        checkpoint = run.scrapers.get(scraper.key) if run is not None else None
+        if self._finished_in(run, scraper):
+            logger.info("Skipping %s: already %s in resumed run %s", scraper.store, checkpoint.status, run.id)
+            outcome = ScrapeOutcome(store=scraper.store.value, items=checkpoint.items, error=checkpoint.error)
+        elif run_deadline is not None and started >= run_deadline:
+            logger.warning("Skipping %s: run deadline reached before it started", scraper.store)
+            outcome = ScrapeOutcome(store=scraper.store.value, error="Run deadline exceeded")
+        else:
+            deadline = run_deadline
+            if self.scraper_timeout_sec > 0:
+                own = started + self.scraper_timeout_sec
+                deadline = own if deadline is None else min(deadline, own)
+            if on_start is not None:
+                on_start(scraper)
+            progress = _IngestProgress(
+                run_id=run.id if run is not None else None,
+                resumed_items=checkpoint.items if checkpoint is not None else 0,
+                identities=identities,
+                matcher=matcher,
+            )
+            try:
+                # Downloads count against this scraper's own budget, inside its worker thread. The
+                # pipeline streams them from its fetch stage instead, overlapping downloads with writes.
+                pages = None if self.pipeline_queue_size > 0 else self.prefetch_pages([scraper], deadline)[0]
+                outcome = self._ingest_scraper(scraper, timestamp, pages=pages, deadline=deadline, progress=progress)
+            except Exception as exc:
+                outcome = ScrapeOutcome(store=scraper.store.value, error=str(exc) or "Scrape failed")
+            outcome.metrics = scraper.metrics.as_dict(outcome.items, time.monotonic() - started)
+            outcome.metrics["errors"] = outcome.errors
+            outcome.metrics["stages"] = [stage.as_dict() for stage in outcome.stages]
+            if run is not None:
+                self._ledger_call(
+                    self.run_ledger.finish_scraper,
+                    run.id,
+                    scraper.key,
+                    "failed" if outcome.error else "done",
+                    progress.resumed_items + outcome.items,
+                    outcome.error,
+                    outcome.metrics,
+                )
+        self._notify_done(on_done, scraper, outcome)
+        return outcome
 
-    def _ingest_scraper(self, scraper: BaseScraper, timestamp: datetime) -> None:
-        logger.info("Scraping %s", scraper.store)
-        item_count = 0
-        error_count = 0
+    @staticmethod
+    def _notify_done(on_done: OutcomeCallback | None, scraper: BaseScraper, outcome: ScrapeOutcome) -> None:
+        if on_done is None:
+            return
         try:
-            shop = Shop(code=scraper.store, name=scraper.store.display())
+            on_done(scraper, outcome)
+        except Exception as exc:
+            logger.warning("Progress callback failed for %s: %s", scraper.store, exc)
+
+    @staticmethod
+    def _report_once(on_done: OutcomeCallback | None) -> OutcomeCallback | None:
+        """Wrap `on_done` so a straggler finishing after run_all gave up on it is not counted twice."""
+        if on_done is None:
+            return None
+        reported: set[int] = set()
+        lock = threading.Lock()
+
+        def report(scraper: BaseScraper, outcome: ScrapeOutcome) -> None:
+            with lock:
+                if id(scraper) in reported:
+                    return
+                reported.add(id(scraper))
+            on_done(scraper, outcome)
+
+        return report
+
+    def prefetch_pages(
+        self, scrapers: Sequence[BaseScraper], deadline: float | None = None
+    ) -> List[List[FetchedPage] | None]:
+        """Download listing pages for the given scrapers concurrently when an engine is configured.
+
+        With a parse pool, every downloaded page is queued for parsing in worker
+        processes right away, so a shop's pages parse in parallel while its
+        items are ingested. Downloads still running at `deadline` are dropped.
+        A `None` entry means the scraper should fetch (and parse) its own pages
+        sequentially.
+        """
+        if self.fetch_engine is None or not scrapers:
+            return [None] * len(scrapers)
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            pages = self.fetch_engine.run(scrapers, timeout=timeout)
+        except Exception as exc:
+            logger.exception("Concurrent prefetch failed, falling back to sequential fetch: %s", exc)
+            return [None] * len(scrapers)
+        if self.parse_pool is not None:
+            for scraper, scraper_pages in zip(scrapers, pages, strict=True):
+                if scraper_pages:
+                    scraper.prepare_pages(scraper_pages, self.parse_pool)
+        return pages
+
+    def _streamed_pages(self, scraper: BaseScraper) -> Iterator[FetchedPage]:
+        """Pages from the async engine as they download, each queued on the parse pool on arrival."""
+        if self.parse_pool is None:
+            yield from self.fetch_engine.stream(scraper)
+            return
+        scraper.prepare_pages([], self.parse_pool)
+        with closing(self.fetch_engine.stream(scraper)) as pages:
+            for page in pages:
+                scraper.queue_parse(page, self.parse_pool)
+                yield page
+
+    def _ingest_scraper(
+        self,
+        scraper: BaseScraper,
+        timestamp: datetime,
+        pages: List[FetchedPage] | None = None,
+        deadline: float | None = None,
+        progress: _IngestProgress | None = None,
+    ) -> ScrapeOutcome:
+        if scraper.resume_cursor:
+            logger.info("Scraping %s from target page %s", scraper.store, scraper.resume_cursor + 1)
+        else:
+            logger.info("Scraping %s", scraper.store)
+        progress = progress or _IngestProgress()
+        stages: List[StageMetrics] = []
+        scraper.deadline = deadline
+        try:
+            store_id = self._store_id(scraper, progress.identities)
+            if deadline is not None and time.monotonic() > deadline:
+                # The prefetch used up the budget; nothing was downloaded in time.
+                progress.failure = "Scrape timed out"
+                logger.warning("Scraping %s timed out while fetching pages", scraper.store)
+            elif self.pipeline_queue_size > 0:
+                stages = self._ingest_pipelined(scraper, store_id, timestamp, pages, deadline, progress)
+            else:
+                if pages is None and self._custom_fetch(scraper):
+                    items = scraper.fetch()
+                else:
+                    items = self._parsed_items(scraper, pages if pages is not None else scraper.fetch_pages())
+                for batch in self._record_batches(scraper, items, timestamp, deadline, progress):
+                    self._persist(scraper, store_id, batch, progress)
+            logger.info("Scraping %s done items=%s errors=%s", scraper.store, progress.items, progress.error_count)
+        except Exception as exc:
+            logger.exception("Failed scraping %s: %s", scraper.store, exc)
+            progress.failure = str(exc) or "Scrape failed"
+        return ScrapeOutcome(
+            store=scraper.store.value,
+            items=progress.items,
+            errors=progress.error_count,
+            error=progress.failure,
+            stages=stages,
+        )
+
+    def _store_id(self, scraper: BaseScraper, identities: IdentityMap | None) -> str:
+        shop = Shop(code=scraper.store, name=scraper.store.display())
+        store_id = identities.shop_id(shop) if identities is not None else None
+        if store_id is None:
             store_id = self.shop_repo.upsert(shop)
-            for item in scraper.fetch():
+            if identities is not None:
+                identities.remember_shop(shop, store_id)
+        return store_id
+
+    def _ingest_pipelined(
+        self,
+        scraper: BaseScraper,
+        store_id: str,
+        timestamp: datetime,
+        pages: List[FetchedPage] | None,
+        deadline: float | None,
+        progress: "_IngestProgress",
+    ) -> List[StageMetrics]:
+        """Run fetch, parse, normalize and persist as threaded stages over bounded queues.
+
+        Persistence stays on this thread, so writes for one batch overlap the
+        download and parsing of the next pages, and a slow database fills the
+        batch queue and stalls the stages above it instead of buffering the shop.
+        With a fetch engine the fetch stage streams pages from the async engine
+        as they arrive rather than waiting for the whole shop to download.
+        """
+        if pages is None and self.fetch_engine is None and self._custom_fetch(scraper):
+            pipeline = StagedPipeline(f"ingest-{scraper.key}", "fetch", scraper.fetch())
+        else:
+            if pages is not None:
+                source = pages
+            elif self.fetch_engine is not None:
+                source = self._streamed_pages(scraper)
+            else:
+                source = scraper.fetch_pages()
+            pipeline = StagedPipeline(f"ingest-{scraper.key}", "fetch", source)
+            # Paged scrapers decide whether to fetch the next page from the parsed one,
+            # so fetching runs at most this many pages ahead of the parser.
+            pipeline.stage(
+                "parse", lambda pages: self._parsed_items(scraper, pages), maxsize=self.pipeline_queue_size
+            )
+        pipeline.stage(
+            "normalize",
+            lambda items: self._record_batches(scraper, items, timestamp, deadline, progress),
+            maxsize=max(1, self.batch_size),
+        )
+        try:
+            for batch in pipeline.run("persist", maxsize=self.pipeline_queue_size):
+                self._persist(scraper, store_id, batch, progress)
+        finally:
+            logger.info(
+                "Pipeline %s %s", scraper.store, "; ".join(stage.summary() for stage in pipeline.metrics)
+            )
+        return pipeline.metrics
+
+    @staticmethod
+    def _custom_fetch(scraper: BaseScraper) -> bool:
+        # Scrapers that override fetch() interleave downloading and parsing themselves,
+        # so their pages cannot be checkpointed.
+        return type(scraper).fetch is not BaseScraper.fetch
+
+    @staticmethod
+    def _parsed_items(scraper: BaseScraper, pages: Iterable[FetchedPage]) -> Iterator:
+        """Parsed items, each target page followed by a `_PageEnd` marker for checkpointing."""
+        for page, items in scraper.iter_parsed_pages(pages):
+            yield from items
+            position = scraper.page_position(page)
+            if position is not None:
+                yield _PageEnd(position)
+
+    def _record_batches(
+        self,
+        scraper: BaseScraper,
+        items: Iterable,
+        timestamp: datetime,
+        deadline: float | None,
+        progress: "_IngestProgress",
+    ) -> Iterator[_RecordBatch]:
+        """Turn scraped items into priced records, grouped into write batches.
+
+        A batch carries the cursor of the last page completed within it, so
+        the page is checkpointed only after all of its items are written.
+        """
+        size = max(1, self.batch_size)
+        batch = _RecordBatch()
+        for item in items:
+            if isinstance(item, _PageEnd):
+                batch.cursor = item.position
+                if not batch.records:
+                    yield batch
+                    batch = _RecordBatch()
+                continue
+            if deadline is not None and time.monotonic() > deadline:
+                progress.failure = "Scrape timed out"
+                logger.warning(
+                    "Scraping %s timed out after %s items; keeping what was ingested", scraper.store, progress.seen
+                )
+                break
+            progress.seen += 1
+            sku = getattr(item, "sku", "unknown")
+            try:
+                product, price = self._build_records(scraper, item, timestamp, progress.matcher)
+            except Exception as exc:
+                progress.build_errors += 1
+                logger.warning("Skipping item store=%s sku=%s error=%s", scraper.store, sku, exc)
+                continue
+            batch.records.append((sku, product, price))
+            if len(batch.records) >= size:
+                yield self._priced(scraper, batch, progress)
+                batch = _RecordBatch()
+        if batch.records:
+            yield self._priced(scraper, batch, progress)
+
+    def _priced(self, scraper: BaseScraper, batch: _RecordBatch, progress: "_IngestProgress") -> _RecordBatch:
+        """Apply pricing strategies to the whole batch at once, column-wise where supported."""
+        if not self.pricing_strategies:
+            return batch
+        try:
+            prices = apply_pricing_many([price for _, _, price in batch.records], self.pricing_strategies)
+            batch.records = [
+                (sku, product, price) for (sku, product, _), price in zip(batch.records, prices, strict=True)
+            ]
+            return batch
+        except Exception as exc:
+            logger.debug("Batch pricing failed for %s, pricing items one by one: %s", scraper.store, exc)
+        records = []
+        for sku, product, price in batch.records:
+            try:
+                records.append((sku, product, apply_pricing_strategies(price, self.pricing_strategies)))
+            except Exception as exc:
+                progress.build_errors += 1
+                logger.warning("Skipping item store=%s sku=%s error=%s", scraper.store, sku, exc)
+        batch.records = records
+        return batch
+
+    def _persist(
+        self,
+        scraper: BaseScraper,
+        store_id: str,
+        batch: _RecordBatch,
+        progress: "_IngestProgress",
+    ) -> None:
+        identities = progress.identities
+        started = time.perf_counter()
+        saved_before = progress.items
+        if self.batch_size > 1 and batch.records:
+            saved, failed = self._flush_batch(scraper, store_id, batch.records, identities)
+            progress.items += saved
+            progress.write_errors += failed
+        else:
+            for sku, product, price in batch.records:
                 try:
-                    image_urls = item.image_urls or ([item.image_url] if item.image_url else None)
-                    primary_image = item.image_url or (image_urls[0] if image_urls else None)
-                    product = Product(
-                        sku=item.sku,
-                        name=item.name,
-                        category=scraper.category,
-                        brand=item.brand or "Apple",
-                        image_url=primary_image,
-                        image_urls=image_urls,
-                    )
-                    product_id = self.product_repo.upsert(product)
-                    price = PricePoint(
-                        product_sku=product.sku,
-                        store=scraper.store,
-                        price=item.price,
-                        currency=item.currency,
-                        product_url=item.product_url,
-                        in_stock=item.in_stock,
-                        timestamp=timestamp,
-                    )
-                    priced = apply_pricing_strategies(price, self.pricing_strategies)
-                    self.price_repo.add_price(priced, product_id, store_id)
-                    item_count += 1
+                    product_id = identities.product_id(product) if identities is not None else None
+                    if product_id is None:
+                        product_id = self.product_repo.upsert(product)
+                        if identities is not None:
+                            identities.remember_product(product, product_id)
+                    self.price_repo.add_price(price, product_id, store_id)
+                    progress.items += 1
                 except Exception as exc:
-                    error_count += 1
-                    sku = getattr(item, "sku", "unknown")
+                    progress.write_errors += 1
                     logger.warning("Skipping item store=%s sku=%s error=%s", scraper.store, sku, exc)
-            logger.info("Scraping %s done items=%s errors=%s", scraper.store, item_count, error_count)
+        if batch.records:
+            scraper.metrics.record_write(time.perf_counter() - started, progress.items - saved_before)
+        if batch.cursor is not None and progress.run_id is not None:
+            self._ledger_call(
+                self.run_ledger.checkpoint,
+                progress.run_id,
+                scraper.key,
+                batch.cursor,
+                progress.resumed_items + progress.items,
+            )
+
+    def _ledger_call(self, method: Callable, *args) -> None:
+        # Checkpoints are best effort: a ledger outage must not fail the scrape itself.
+        try:
+            method(*args)
         except Exception as exc:
-            logger.exception("Failed scraping %s: %s", scraper.store, exc)
+            logger.warning("Scrape run ledger update failed: %s", exc)
+
+    def _build_records(
+        self,
+        scraper: BaseScraper,
+        item,
+        timestamp: datetime,
+        matcher: MatchingIndex | None = None,
+    ) -> tuple[Product, PricePoint]:
+        # Match on the scraped brand: the stored default would misattribute listings that name their own.
+        canonical_sku = matcher.match(item.sku, item.name, item.brand) if matcher is not None else None
+        image_urls = item.image_urls or ([item.image_url] if item.image_url else None)
+        primary_image = item.image_url or (image_urls[0] if image_urls else None)
+        product = Product(
+            sku=item.sku,
+            name=item.name,
+            category=scraper.category,
+            brand=item.brand or "Apple",
+            image_url=primary_image,
+            image_urls=image_urls,
+            canonical_sku=canonical_sku,
+        )
+        price = PricePoint(
+            product_sku=product.sku,
+            store=scraper.store,
+            price=item.price,
+            currency=item.currency,
+            product_url=item.product_url,
+            in_stock=item.in_stock,
+            timestamp=timestamp,
+            canonical_sku=canonical_sku,
+            category=product.category,
+        )
+        return product, price
+
+    def _flush_batch(
+        self,
+        scraper: BaseScraper,
+        store_id: str,
+        batch: Sequence[tuple[str, Product, PricePoint]],
+        identities: IdentityMap | None = None,
+    ) -> tuple[int, int]:
+        """Write a batch with one bulk product upsert and one bulk price insert.
+
+        Products the identity map already holds unchanged are not upserted.
+        Failed items are logged and counted exactly like the per-item path;
+        a price is only written when its product upsert succeeded.
+        """
+        product_ids: list[str | None] = [None] * len(batch)
+        errors: dict[int, str] = {}
+        if identities is not None:
+            product_ids = [identities.product_id(product) for _, product, _ in batch]
+        changed = [index for index, product_id in enumerate(product_ids) if product_id is None]
+        if changed:
+            try:
+                products = self.product_repo.upsert_many([batch[index][1] for index in changed])
+            except Exception as exc:
+                message = str(exc) or repr(exc)
+                products = BulkWriteResult(
+                    ids=[None] * len(changed), errors=dict.fromkeys(range(len(changed)), message)
+                )
+            for offset, index in enumerate(changed):
+                if offset in products.errors:
+                    errors[index] = products.errors[offset]
+                    continue
+                product_ids[index] = products.ids[offset]
+                if identities is not None and product_ids[index] is not None:
+                    identities.remember_product(batch[index][1], product_ids[index])
+        positions: list[int] = []
+        entries: list[tuple[PricePoint, str, str]] = []
+        for index, (_, _, price) in enumerate(batch):
+            product_id = product_ids[index]
+            if index in errors or product_id is None:
+                errors.setdefault(index, "product upsert failed")
+                continue
+            positions.append(index)
+            entries.append((price, product_id, store_id))
+        if entries:
+            try:
+                price_errors = self.price_repo.add_prices(entries).errors
+            except Exception as exc:
+                price_errors = dict.fromkeys(range(len(entries)), str(exc) or repr(exc))
+            for offset, message in price_errors.items():
+                errors[positions[offset]] = message
+        for index in sorted(errors):
+            logger.warning("Skipping item store=%s sku=%s error=%s", scraper.store, batch[index][0], errors[index])
+        return len(batch) - len(errors), len(errors)
@@ -0,0 +1,294 @@
+import re
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from ..domain.models import Product
+from .scraping.base import normalize_text
+
+# Brands recognised in listing titles, plus product lines that imply their brand.
+BRANDS = {
+    "apple",
+    "samsung",
+    "xiaomi",
+    "google",
+    "huawei",
+    "honor",
+    "oneplus",
+    "oppo",
+    "realme",
+    "motorola",
+    "nokia",
+    "sony",
+    "vivo",
+    "nothing",
+    "zte",
+    "tcl",
+}
+IMPLIED_BRANDS = {
+    "iphone": "apple",
+    "ipad": "apple",
+    "galaxy": "samsung",
+    "pixel": "google",
+    "redmi": "xiaomi",
+    "poco": "xiaomi",
+    "moto": "motorola",
+}
+
+# English and Albanian colour names (accents already stripped) mapped to one spelling.
+COLOURS = {
+    "natural titanium": "natural titanium",
+    "black titanium": "black titanium",
+    "white titanium": "white titanium",
+    "blue titanium": "blue titanium",
+    "desert titanium": "desert titanium",
+    "titanium gray": "titanium gray",
+    "titanium black": "titanium black",
+    "titanium violet": "titanium violet",
+    "titanium yellow": "titanium yellow",
+    "space gray": "space gray",
+    "space grey": "space gray",
+    "e zeze": "black",
+    "i zi": "black",
+    "e bardhe": "white",
+    "i bardhe": "white",
+    "black": "black",
+    "zeze": "black",
+    "zi": "black",
+    "white": "white",
+    "bardhe": "white",
+    "blue": "blue",
+    "blu": "blue",
+    "kalter": "blue",
+    "red": "red",
+    "kuqe": "red",
+    "kuq": "red",
+    "green": "green",
+    "gjelber": "green",
+    "jeshile": "green",
+    "purple": "purple",
+    "vjollce": "purple",
+    "lila": "purple",
+    "pink": "pink",
+    "roze": "pink",
+    "gold": "gold",
+    "silver": "silver",
+    "argjend": "silver",
+    "gray": "gray",
+    "grey": "gray",
+    "hiri": "gray",
+    "yellow": "yellow",
+    "verdhe": "yellow",
+    "midnight": "midnight",
+    "starlight": "starlight",
+    "graphite": "graphite",
+    "ultramarine": "ultramarine",
+    "teal": "teal",
+}
+_COLOUR_PATTERN = re.compile(r"\b(" + "|".join(sorted(map(re.escape, COLOURS), key=len, reverse=True)) + r")\b")
+
+# Words that distinguish one model from its siblings; together with tokens holding
+# digits they must agree exactly for two listings to match.
+VARIANT_WORDS = {
+    "pro",
+    "max",
+    "plus",
+    "ultra",
+    "mini",
+    "lite",
+    "fe",
+    "neo",
+    "fold",
+    "flip",
+    "edge",
+    "note",
+    "se",
+    "air",
+    "xl",
+    "prime",
+}
+NOISE_WORDS = {
+    "smartphone",
+    "phone",
+    "telefon",
+    "telefoni",
+    "celular",
+    "celulari",
+    "mobile",
+    "mobil",
+    "new",
+    "original",
+    "global",
+    "version",
+    "eu",
+    "dual",
+    "sim",
+    "ds",
+    "esim",
+    "nano",
+    "5g",
+    "4g",
+    "lte",
+    "nfc",
+    "wifi",
+    "ram",
+    "rom",
+    "dhe",
+    "and",
+    "with",
+    "me",
+}
+_STORAGE_PATTERN = re.compile(r"\b(\d{1,4})\s*(gb|tb)\b(\s*ram)?")
+# Manufacturer part numbers such as SM-S928B, MTP03ZD/A or 23090RA98G.
+_PART_NUMBER_PATTERN = re.compile(
+    r"\b(sm-[a-z0-9]+|[a-z0-9]{4,}/[a-z]|(?=[a-z0-9]*\d)(?=[a-z0-9]*[a-z])[a-z0-9]{8,})\b"
+)
+# Screen sizes like 6.7" and battery, camera or charger figures are not part of the model.
+_MEASURE_PATTERN = re.compile(r"\b\d+[.,]\d+\s*(\"|inch|in\b|')?")
+_UNIT_PATTERN = re.compile(r"\d+(mah|mp|hz|w|inch)|\d{4,}")
+_GLUED = ((re.compile(r"(pro|ultra)max\b"), r"\1 max"), (re.compile(r"\+"), " plus "))
+
+
+@dataclass(slots=True, frozen=True)
+class ListingAttributes:
+    """Normalized attributes extracted from a listing title."""
+
+    brand: Optional[str]
+    model: tuple[str, ...]
+    storage_gb: Optional[int]
+    colour: Optional[str]
+
+    @property
+    def critical(self) -> frozenset[str]:
+        return frozenset(token for token in self.model if token in VARIANT_WORDS or any(ch.isdigit() for ch in token))
+
+
+def extract_attributes(name: str, brand: Optional[str] = None) -> ListingAttributes:
+    """Brand, model tokens, storage and colour from a title; a brand named in the title wins over `brand`."""
+    text = normalize_text(name)
+    for pattern, replacement in _GLUED:
+        text = pattern.sub(replacement, text)
+    text = _PART_NUMBER_PATTERN.sub(" ", text)
+    text = _MEASURE_PATTERN.sub(" ", text)
+
+    storage = None
+    for amount, unit, ram in _STORAGE_PATTERN.findall(text):
+        if ram:
+            continue
+        size = int(amount) * (1024 if unit == "tb" else 1)
+        # "8GB/256GB" lists RAM first; the largest figure is the storage.
+        storage = max(storage or 0, size)
+    text = _STORAGE_PATTERN.sub(" ", text)
+
+    colour_match = _COLOUR_PATTERN.search(text)
+    colour = COLOURS[colour_match.group(1)] if colour_match else None
+    text = _COLOUR_PATTERN.sub(" ", text)
+
+    title_brand = None
+    model: list[str] = []
+    for token in re.split(r"[^a-z0-9]+", text):
+        if not token or token in NOISE_WORDS or _UNIT_PATTERN.fullmatch(token):
+            continue
+        if token in BRANDS:
+            title_brand = title_brand or token
+            continue
+        title_brand = title_brand or IMPLIED_BRANDS.get(token)
+        model.append(token)
+    fallback = normalize_text(brand).strip() if brand else None
+    return ListingAttributes(brand=title_brand or fallback, model=tuple(model), storage_gb=storage, colour=colour)
+
+
+def canonical_key(attributes: ListingAttributes) -> Optional[str]:
+    """Canonical SKU for brand + model + storage, or None when the title names no model."""
+    if not attributes.model or not attributes.critical:
+        return None
+    parts = [attributes.brand or "unknown", *attributes.model]
+    if attributes.storage_gb:
+        parts.append(f"{attributes.storage_gb}gb")
+    return "-".join(parts)
+
+
+class MatchingIndex:
+    """Maps scraped listings from every shop onto canonical products.
+
+    An exact canonical key (brand, model tokens, storage) resolves in one dict
+    lookup. Otherwise an inverted index over the model's distinguishing
+    tokens (numbers and variant words such as "pro" or "ultra") yields the
+    few canonical products sharing them; one is accepted when brand,
+    distinguishing tokens and storage agree and enough of the remaining
+    tokens overlap, preferring the closest. Colour is extracted but not part
+    of the identity, so colour variants compare together. Unmatched listings
+    become new canonical products. A store SKU keeps its match until its
+    title yields a different canonical key (a corrected model or storage),
+    when it is matched afresh. Safe to share across scraper threads.
+    """
+
+    def __init__(self, min_similarity: float = 0.5) -> None:
+        self.min_similarity = min_similarity
+        self._canonical: dict[str, ListingAttributes] = {}
+        self._postings: dict[str, set[str]] = {}
+        # Store SKU -> (title, brand, canonical SKU) it was matched under.
+        self._by_sku: dict[str, tuple[str, Optional[str], str]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> "MatchingIndex":
+        index = cls()
+        for product in products:
+            if product.canonical_sku:
+                index._by_sku[product.sku] = (product.name, product.brand, product.canonical_sku)
+                if product.canonical_sku not in index._canonical:
+                    index._add(product.canonical_sku, extract_attributes(product.name, product.brand))
+        return index
+
+    def __len__(self) -> int:
+        return len(self._canonical)
+
+    def match(self, sku: str, name: str, brand: Optional[str] = None) -> str:
+        """Canonical SKU for a listing; listings without a recognisable model keep their own SKU."""
+        known = self._by_sku.get(sku)
+        if known is not None and known[:2] == (name, brand):
+            return known[2]
+        attributes = extract_attributes(name, brand)
+        key = canonical_key(attributes)
+        if known is not None:
+            # A title that no longer names a model says nothing new; keep the match.
+            if key is None or key == canonical_key(extract_attributes(known[0], known[1])):
+                self._by_sku[sku] = (name, brand, known[2])
+                return known[2]
+        with self._lock:
+            if key is None:
+                canonical = sku
+            elif key in self._canonical:
+                canonical = key
+            else:
+                canonical = self._closest(attributes) or key
+                if canonical == key:
+                    self._add(key, attributes)
+            self._by_sku[sku] = (name, brand, canonical)
+        return canonical
+
+    def _closest(self, attributes: ListingAttributes) -> Optional[str]:
+        critical = attributes.critical
+        postings = sorted((self._postings.get(token, set()) for token in critical), key=len)
+        if not postings or not postings[0]:
+            return None
+        candidates = set.intersection(*postings)
+        tokens = set(attributes.model)
+        best, best_score = None, self.min_similarity
+        for key in candidates:
+            other = self._canonical[key]
+            if other.critical != critical or (attributes.brand and other.brand and attributes.brand != other.brand):
+                continue
+            if attributes.storage_gb != other.storage_gb:
+                continue
+            other_tokens = set(other.model)
+            score = len(tokens & other_tokens) / len(tokens | other_tokens)
+            if score > best_score or (score == best_score and best is not None and key < best):
+                best, best_score = key, score
+        return best
+
+    def _add(self, key: str, attributes: ListingAttributes) -> None:
+        self._canonical[key] = attributes
+        for token in attributes.critical:
+            self._postings.setdefault(token, set()).add(key)
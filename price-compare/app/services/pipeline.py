@@ -0,0 +1,191 @@
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterable, Iterator, List
+
+
+@dataclass(slots=True)
+class StageMetrics:
+    """Counters for one pipeline stage.
+
+    `busy_sec` is time spent doing the stage's own work, `starved_sec` waiting
+    for input and `blocked_sec` waiting for room downstream (backpressure).
+    Queue depth is sampled on the stage's input queue each time it takes an item.
+    """
+
+    name: str
+    items: int = 0
+    busy_sec: float = 0.0
+    starved_sec: float = 0.0
+    blocked_sec: float = 0.0
+    queue_max_depth: int = 0
+    queue_depth_total: int = 0
+    queue_samples: int = 0
+
+    @property
+    def latency_ms(self) -> float:
+        """Average busy time per emitted item."""
+        return self.busy_sec * 1000 / self.items if self.items else 0.0
+
+    @property
+    def queue_mean_depth(self) -> float:
+        return self.queue_depth_total / self.queue_samples if self.queue_samples else 0.0
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data.pop("queue_depth_total")
+        data.pop("queue_samples")
+        data["latency_ms"] = self.latency_ms
+        data["queue_mean_depth"] = self.queue_mean_depth
+        return data
+
+    def summary(self) -> str:
+        return (
+            f"{self.name}: items={self.items} busy={self.busy_sec:.2f}s starved={self.starved_sec:.2f}s "
+            f"blocked={self.blocked_sec:.2f}s latency={self.latency_ms:.1f}ms "
+            f"queue_max={self.queue_max_depth} queue_avg={self.queue_mean_depth:.1f}"
+        )
+
+
+class _Closed(Exception):
+    """Raised in a producer once its consumer has stopped reading."""
+
+
+class _Failure:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+_END = object()
+
+
+class _Channel:
+    """Bounded queue between two stages that the consumer can close early."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+        self.closed = threading.Event()
+
+    def put(self, item, producer: StageMetrics) -> None:
+        if self.closed.is_set():
+            raise _Closed
+        start = time.perf_counter()
+        self.queue.put(item)
+        producer.blocked_sec += time.perf_counter() - start
+
+    def drain(self, consumer: StageMetrics) -> Iterator:
+        while True:
+            depth = self.queue.qsize()
+            start = time.perf_counter()
+            item = self.queue.get()
+            consumer.starved_sec += time.perf_counter() - start
+            consumer.queue_samples += 1
+            consumer.queue_depth_total += depth
+            consumer.queue_max_depth = max(consumer.queue_max_depth, depth)
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+
+    def close(self) -> None:
+        # Free the queue so a producer blocked on put wakes up and sees the flag.
+        self.closed.set()
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return
+
+
+class StagedPipeline:
+    """Runs a source and generator stages on threads joined by bounded queues.
+
+    Each stage is a function from an iterable of inputs to an iterable of
+    outputs, so stateful steps (pagination, batching) stay ordinary
+    generators. The final stage runs on the calling thread while it iterates
+    `run()`, and a full queue blocks the stage feeding it, so a slow consumer
+    throttles everything upstream. When a stage stops early, the stages
+    feeding it stop at their next hand-off; an exception in any stage is
+    re-raised to the caller.
+    """
+
+    def __init__(self, name: str, source_name: str, source: Iterable, join_timeout: float = 5.0) -> None:
+        self.name = name
+        self.join_timeout = join_timeout
+        self._source = source
+        self._stages: list[tuple[StageMetrics, Callable[[Iterable], Iterable] | None, int]] = [
+            (StageMetrics(source_name), None, 0)
+        ]
+
+    def stage(self, name: str, transform: Callable[[Iterable], Iterable], maxsize: int = 1) -> "StagedPipeline":
+        """Append a stage whose input queue holds at most `maxsize` items."""
+        self._stages.append((StageMetrics(name), transform, maxsize))
+        return self
+
+    @property
+    def metrics(self) -> List[StageMetrics]:
+        return [metrics for metrics, _, _ in self._stages]
+
+    def run(self, sink_name: str, maxsize: int = 1) -> Iterator:
+        """Start the stages and yield the last stage's output on the calling thread."""
+        sink = StageMetrics(sink_name)
+        self._stages.append((sink, None, maxsize))
+        channels = [_Channel(size) for _, _, size in self._stages[1:]]
+        threads = [
+            threading.Thread(
+                target=self._run_stage,
+                args=(metrics, transform, channels[index - 1] if index else None, channels[index]),
+                name=f"{self.name}-{metrics.name}",
+                daemon=True,
+            )
+            for index, (metrics, transform, _) in enumerate(self._stages[:-1])
+        ]
+        for thread in threads:
+            thread.start()
+        started = time.perf_counter()
+        finished = False
+        try:
+            for item in channels[-1].drain(sink):
+                yield item
+                sink.items += 1
+            finished = True
+        finally:
+            channels[-1].close()
+            for thread in threads:
+                # Upstream stages notice the close at their next hand-off; one stuck in I/O is left behind.
+                thread.join(None if finished else self.join_timeout)
+            sink.busy_sec = time.perf_counter() - started - sink.starved_sec
+
+    def _run_stage(
+        self,
+        metrics: StageMetrics,
+        transform: Callable[[Iterable], Iterable] | None,
+        inbound: _Channel | None,
+        outbound: _Channel,
+    ) -> None:
+        started = time.perf_counter()
+        outputs = None
+        try:
+            outputs = iter(self._source if inbound is None else transform(inbound.drain(metrics)))
+            for item in outputs:
+                outbound.put(item, metrics)
+                metrics.items += 1
+            outbound.put(_END, metrics)
+        except _Closed:
+            pass
+        except Exception as exc:
+            try:
+                outbound.put(_Failure(exc), metrics)
+            except _Closed:
+                pass
+        finally:
+            close = getattr(outputs, "close", None)
+            if close is not None:
+                close()
+            if inbound is not None:
+                inbound.close()
+            metrics.busy_sec = time.perf_counter() - started - metrics.starved_sec - metrics.blocked_sec
@@ -1,9 +1,52 @@
 import abc
 from dataclasses import replace
-from typing import Iterable, List
+from typing import Iterable, List, Sequence
 from ..domain.models import PricePoint
 
 
+class PriceBatch:
+    """Column-wise staging for a run of price observations.
+
+    `prices` and `currencies` are the authoritative columns while strategies
+    run and are written back into `points` in place once all of them have
+    run, so a batch strategy allocates lists, not one `PricePoint` per row.
+    """
+
+    __slots__ = ("points", "prices", "currencies")
+
+    def __init__(self, points: Sequence[PricePoint]) -> None:
+        self.points = list(points)
+        self.prices = [point.price for point in self.points]
+        self.currencies = [point.currency for point in self.points]
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def row(self, index: int) -> PricePoint:
+        """The point at `index` as of the current column values.
+
+        The staged points are only written at `to_points`, so a batch that
+        fails part-way leaves the caller's points untouched.
+        """
+        point = self.points[index]
+        price, currency = self.prices[index], self.currencies[index]
+        if point.price != price or point.currency != currency:
+            point = replace(point, price=price, currency=currency)
+            self.points[index] = point
+        return point
+
+    def set_row(self, index: int, point: PricePoint) -> None:
+        self.points[index] = point
+        self.prices[index] = point.price
+        self.currencies[index] = point.currency
+
+    def to_points(self) -> List[PricePoint]:
+        for point, price, currency in zip(self.points, self.prices, self.currencies, strict=True):
+            point.price = price
+            point.currency = currency
+        return self.points
+
+
 class PricingStrategy(abc.ABC):
     """Contract for price transformations before persistence."""
 
@@ -11,11 +54,19 @@ class PricingStrategy(abc.ABC):
     def apply(self, price: PricePoint) -> PricePoint:
         ...
 
+    def apply_many(self, batch: PriceBatch) -> None:
+        """Transform a whole batch; the default runs `apply` row by row."""
+        for index in range(len(batch)):
+            batch.set_row(index, self.apply(batch.row(index)))
+
 
 class NoOpPricingStrategy(PricingStrategy):
     def apply(self, price: PricePoint) -> PricePoint:
         return price
 
+    def apply_many(self, batch: PriceBatch) -> None:
+        return None
+
 
 class NormalizeCurrencyStrategy(PricingStrategy):
     """Ensure currency code is uppercase and default to EUR."""
@@ -27,6 +78,10 @@ class NormalizeCurrencyStrategy(PricingStrategy):
         currency = (price.currency or self.default_currency).upper()
         return replace(price, currency=currency)
 
+    def apply_many(self, batch: PriceBatch) -> None:
+        default = self.default_currency
+        batch.currencies = [(currency or default).upper() for currency in batch.currencies]
+
 
 class RoundPriceStrategy(PricingStrategy):
     """Round price to 2 decimals for consistency."""
@@ -34,6 +89,9 @@ class RoundPriceStrategy(PricingStrategy):
     def apply(self, price: PricePoint) -> PricePoint:
         return replace(price, price=round(price.price, 2))
 
+    def apply_many(self, batch: PriceBatch) -> None:
+        batch.prices = [round(price, 2) for price in batch.prices]
+
 
 def apply_pricing_strategies(price: PricePoint, strategies: Iterable[PricingStrategy]) -> PricePoint:
     updated = price
@@ -42,5 +100,17 @@ def apply_pricing_strategies(price: PricePoint, strategies: Iterable[PricingStra
     return updated
 
 
+def apply_pricing_many(prices: Sequence[PricePoint], strategies: Iterable[PricingStrategy]) -> List[PricePoint]:
+    """Apply strategies to a batch, column-wise where they support it.
+
+    The given points are updated in place (strategies that only implement
+    `apply` may replace them), so pass points the caller owns.
+    """
+    batch = PriceBatch(prices)
+    for strategy in strategies:
+        strategy.apply_many(batch)
+    return batch.to_points()
+
+
 def default_pricing_strategies() -> List[PricingStrategy]:
     return [NormalizeCurrencyStrategy(), RoundPriceStrategy()]
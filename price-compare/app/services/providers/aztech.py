@@ -2,6 +2,7 @@ import json
 from bs4 import BeautifulSoup
 from ..scraping.base import (
     PagedScraper,
+    class_xpath,
     ScrapedItem,
     slugify_name,
     looks_like_accessory,
@@ -19,6 +20,11 @@ class AztechScraper(PagedScraper):
         "&sort=created_at&order=desc&limit=80&page={page}"
     )
     max_pages = 5
+    # Cards, or the client-side search template that carries them on search pages.
+    parse_only = (
+        class_xpath("product-container", "product-layout", "product-thumb", "product-grid", "product-item", "product")
+        + " | //script[@id='search-template']"
+    )
 
     def base_url(self) -> str:
         return self.BASE_URL.format(page=1)
@@ -44,11 +50,7 @@ class AztechScraper(PagedScraper):
         normalized = [self.normalize_url(url, "https://aztechonline.com") for url in urls]
         return dedupe_urls([url for url in normalized if url])
 
-    def _extract_gallery_images(self, product_url: str) -> list[str]:
-        try:
-            html = self._get(product_url)
-        except Exception:
-            return []
+    def parse_gallery(self, html: str) -> list[str]:
         soup = BeautifulSoup(html, self.parser)
         selectors = [
             ".image-additional img",
@@ -133,8 +135,7 @@ class AztechScraper(PagedScraper):
                 raw = card.get(attr_name)
                 if raw:
                     image_urls.extend(self._extract_images_from_payload(raw))
-            if not image_urls and product_url:
-                image_urls = self._extract_gallery_images(product_url)
+            gallery_url = product_url if not image_urls and product_url else None
             image_urls = dedupe_urls([url for url in image_urls if url])
             image_url = image_urls[0] if image_urls else None
             sku = slugify_name(name)
@@ -156,4 +157,5 @@ class AztechScraper(PagedScraper):
                 brand="Apple",
                 image_url=image_url,
                 image_urls=image_urls or None,
+                gallery_url=gallery_url,
             )
@@ -2,6 +2,7 @@ import json
 from bs4 import BeautifulSoup
 from ..scraping.base import (
     PagedScraper,
+    class_xpath,
     ScrapedItem,
     slugify_name,
     looks_like_accessory,
@@ -16,6 +17,10 @@ class GjirafaMallScraper(PagedScraper):
     category = ProductCategory.SMARTPHONE
     BASE_URL = "https://gjirafamall.com/celular-teknologji?pagenumber={page}&orderby=&hls=false&is=false&hd=false"
     max_pages = 5
+    page_param = "pagenumber"
+    # The category lists every phone brand, so a page without iPhones is not the end.
+    stop_on_empty_page = False
+    parse_only = class_xpath("product-item", "item-box", "product")
 
     def base_url(self) -> str:
         return self.BASE_URL.format(page=1)
@@ -23,11 +28,7 @@ class GjirafaMallScraper(PagedScraper):
     def base_url_for_page(self, page: int) -> str:
         return self.BASE_URL.format(page=page)
 
-    def _extract_gallery_images(self, product_url: str) -> list[str]:
-        try:
-            html = self._get(product_url)
-        except Exception:
-            return []
+    def parse_gallery(self, html: str) -> list[str]:
         soup = BeautifulSoup(html, self.parser)
         selectors = [
             ".picture-thumbs img",
@@ -84,8 +85,8 @@ class GjirafaMallScraper(PagedScraper):
                     normalized = self.normalize_url(img_url, "https://gjirafamall.com")
                     if normalized:
                         image_urls.append(normalized)
-            if not image_urls:
-                image_urls = self._extract_gallery_images(product_url)
+            # Cards without images get their gallery from the product page after parsing.
+            gallery_url = product_url if not image_urls else None
             image_urls = dedupe_urls(image_urls)
             image_url = image_urls[0] if image_urls else None
             sku = slugify_name(name)
@@ -99,4 +100,5 @@ class GjirafaMallScraper(PagedScraper):
                 brand="Apple",
                 image_url=image_url,
                 image_urls=image_urls or None,
+                gallery_url=gallery_url,
             )
@@ -4,21 +4,36 @@ import re
 from bs4 import BeautifulSoup
 from ..scraping.base import (
     PagedScraper,
+    class_xpath,
     ScrapedItem,
     slugify_name,
     looks_like_accessory,
     extract_image_urls_from_tag,
     dedupe_urls,
 )
-from ...config import settings
 from ...domain.enums import ShopName, ProductCategory
 
+# Bootstrap variables Neptun has used for the listing model, in order of preference.
+MODEL_VARIABLES = ("shopCategoryModel", "catalogProductsModel", "categoryModel", "productListModel")
+# `<name> = "<JS string literal>"`, matched over the raw page in one sweep.
+MODEL_PATTERN = re.compile(
+    r"(?<![\w$])(" + "|".join(MODEL_VARIABLES) + r')\s*=\s*"([^"\\]*(?:\\.[^"\\]*)*)"'
+)
+START_TAG_PATTERN = re.compile(r"<[a-zA-Z][^\s/>]*(?:[^>\"']|\"[^\"]*\"|'[^']*')*>")
+ATTRIBUTE_PATTERN = re.compile(r"""([^\s"'=<>/]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+
 
 class NeptunKSScraper(PagedScraper):
     store = ShopName.NEPTUN
     category = ProductCategory.SMARTPHONE
     BASE_URL = "https://www.neptun-ks.com/smartphone.nspx?brands=987&page={page}&priceRange=709_2799"
     max_pages = 5
+    # Bootstrap payloads (#angularApp, model scripts), product cards, and page images
+    # used as the last-resort image fallback.
+    parse_only = (
+        "//script | //*[@id='angularApp'] | //img | //source | "
+        + class_xpath("product-item", "product", "item")
+    )
 
     def __init__(self) -> None:
         super().__init__()
@@ -32,55 +47,85 @@ class NeptunKSScraper(PagedScraper):
     def base_url_for_page(self, page: int) -> str:
         return self.BASE_URL.format(page=page)
 
-    def _get(self, url: str) -> str:
-        """Override to include Referer; Neptun blocks some requests without it."""
-        self._throttle()
-        headers = {
+    def request_headers(self, url: str) -> dict[str, str]:
+        """Include Referer; Neptun blocks some requests without it."""
+        return {
             "User-Agent": "Mozilla/5.0",
             "Referer": "https://www.neptun-ks.com/",
         }
-        resp = self._session.get(
-            url,
-            headers=headers,
-            timeout=settings.scrape_timeout_sec,
-            proxies={"http": None, "https": None},
-        )
-        resp.raise_for_status()
-        return resp.text
 
-    def _extract_model(self, soup, var_name: str):
-        marker = f"{var_name} = \""
-        for script in soup.find_all("script"):
-            text = script.string or script.get_text()
-            if not text or marker not in text:
-                continue
-            start = text.find(marker)
-            if start == -1:
-                continue
-            i = start + len(marker)
-            buf = []
-            escaped = False
-            while i < len(text):
-                ch = text[i]
-                if escaped:
-                    buf.append(ch)
-                    escaped = False
-                else:
-                    if ch == "\\":
-                        escaped = True
-                        buf.append(ch)
-                    elif ch == "\"":
-                        break
-                    else:
-                        buf.append(ch)
-                i += 1
-            raw = "".join(buf)
+    def parse_raw(self, url: str, html: str):
+        """Read the bootstrap payloads straight from the raw page without building a soup.
+
+        Falls back to the soup-based `parse_products` (product cards) only when
+        the page carries neither `#angularApp` category details nor a model variable.
+        """
+        payload = self._category_details_from_html(html)
+        if payload is not None:
+            items = self._items_from_category_details(payload, url)
+            if items:
+                return items
+        model = self._find_model(html)
+        if not model:
+            return None
+        dom_images: list[list[str]] = []
+
+        def page_images() -> list[str]:
+            # Only pages with imageless products pay for a soup, and only once.
+            if not dom_images:
+                dom_images.append(self._extract_images_from_dom(self.build_soup(html)))
+            return list(dom_images[0])
+
+        return list(self._items_from_model(model, url, page_images))
+
+    def _find_model(self, text: str):
+        """Return the first decodable model variable, preferring MODEL_VARIABLES order."""
+        found: dict[str, list[str]] = {}
+        for match in MODEL_PATTERN.finditer(text):
+            found.setdefault(match.group(1), []).append(match.group(2))
+        for var_name in MODEL_VARIABLES:
+            for raw in found.get(var_name, ()):
+                model = self._decode_model(raw)
+                if model:
+                    return model
+        return None
+
+    def _decode_model(self, raw: str):
+        try:
+            # JSON string escapes are a subset of JS ones, so the C decoder handles the common case.
+            text = json.loads(f'"{raw}"', strict=False)
+        except json.JSONDecodeError:
             try:
-                unescaped = bytes(raw, "utf-8").decode("unicode_escape")
-                unescaped = html.unescape(unescaped)
-                return json.loads(unescaped)
-            except (UnicodeDecodeError, json.JSONDecodeError):
-                continue
+                text = bytes(raw, "utf-8").decode("unicode_escape")
+            except UnicodeDecodeError:
+                return None
+        if "&" in text:
+            text = html.unescape(text)
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return None
+
+    def _category_details_from_html(self, page: str):
+        """Locate `#angularApp` in the raw page and decode its data-categorydetails payload."""
+        pos = page.find("angularApp")
+        while pos != -1:
+            tag_start = page.rfind("<", 0, pos)
+            match = START_TAG_PATTERN.match(page, tag_start) if tag_start != -1 else None
+            if match and match.end() > pos:
+                attrs: dict[str, str] = {}
+                for attr in ATTRIBUTE_PATTERN.finditer(match.group(0), 1):
+                    value = next((v for v in attr.groups()[1:] if v is not None), "")
+                    attrs.setdefault(attr.group(1).lower(), value)
+                if html.unescape(attrs.get("id", "")) == "angularApp":
+                    raw = attrs.get("data-categorydetails")
+                    if not raw:
+                        return None
+                    try:
+                        return json.loads(html.unescape(html.unescape(raw)))
+                    except Exception:
+                        return None
+            pos = page.find("angularApp", pos + 1)
         return None
 
     def _normalize_iphone_suffix(self, value: str) -> str:
@@ -316,11 +361,7 @@ class NeptunKSScraper(PagedScraper):
         filtered = [url for url in combined if not any(token in url.lower() for token in blocked)]
         return dedupe_urls(filtered or combined)
 
-    def _extract_gallery_images(self, product_url: str) -> list[str]:
-        try:
-            html = self._get(product_url)
-        except Exception:
-            return []
+    def parse_gallery(self, html: str) -> list[str]:
         soup = BeautifulSoup(html, self.parser)
         selectors = [
             "#productDescriptionTag .product-details-first-col__images img",
@@ -409,49 +450,10 @@ class NeptunKSScraper(PagedScraper):
             yield from items
             return
 
-        model = None
-        for var_name in ("shopCategoryModel", "catalogProductsModel", "categoryModel", "productListModel"):
-            model = self._extract_model(soup, var_name)
-            if model:
-                break
+        scripts = "\n".join(script.string or script.get_text() for script in soup.find_all("script"))
+        model = self._find_model(scripts)
         if model:
-            for product in model.get("Products", []):
-                raw_name = (product.get("Title") or "").strip()
-                if not raw_name:
-                    continue
-                if "iphone" not in raw_name.lower() or looks_like_accessory(raw_name):
-                    continue
-                name = self._normalize_iphone_name(raw_name)
-                price = product.get("ActualPrice") or product.get("RegularPrice")
-                if price is None:
-                    continue
-                currency = product.get("Currency") or "EUR"
-                category_slug = None
-                category = product.get("Category") or model.get("Category")
-                if isinstance(category, dict):
-                    category_slug = category.get("Url") or category.get("url")
-                product_slug = product.get("Url") or product.get("url") or product.get("Slug")
-                product_url = self._build_product_url(product_slug, category_slug, url)
-
-                image_urls = self._extract_images_from_model(product)
-                if not image_urls and product_url:
-                    # Prefer fetching the product page to grab the canonical gallery.
-                    image_urls = self._extract_gallery_images(product_url)
-                if not image_urls:
-                    image_urls = self._extract_images_from_dom(soup)
-                image_url = image_urls[0] if image_urls else None
-                sku = slugify_name(name)
-                yield ScrapedItem(
-                    sku=sku,
-                    name=name,
-                    price=float(price),
-                    currency=currency,
-                    product_url=product_url,
-                    in_stock=True,
-                    brand="Apple",
-                    image_url=image_url,
-                    image_urls=image_urls or None,
-                )
+            yield from self._items_from_model(model, url, lambda: self._extract_images_from_dom(soup))
             return
 
         cards = soup.select(".product-item, .product, .item")
@@ -517,8 +519,7 @@ class NeptunKSScraper(PagedScraper):
                 raw = img_el.get(attr_name) if img_el else None
                 if raw:
                     image_urls.extend(self._extract_images_from_payload(raw))
-            if not image_urls and product_url:
-                image_urls = self._extract_gallery_images(product_url)
+            gallery_url = product_url if not image_urls and product_url else None
             if not image_urls:
                 image_urls = self._extract_images_from_dom(soup)
             image_urls = dedupe_urls(image_urls)
@@ -534,6 +535,48 @@ class NeptunKSScraper(PagedScraper):
                 brand="Apple",
                 image_url=image_url,
                 image_urls=image_urls or None,
+                gallery_url=gallery_url,
+            )
+
+    def _items_from_model(self, model: dict, url: str, page_images):
+        """Yield items from a decoded listing model; `page_images` supplies the DOM image fallback."""
+        for product in model.get("Products", []):
+            raw_name = (product.get("Title") or "").strip()
+            if not raw_name:
+                continue
+            if "iphone" not in raw_name.lower() or looks_like_accessory(raw_name):
+                continue
+            name = self._normalize_iphone_name(raw_name)
+            price = product.get("ActualPrice") or product.get("RegularPrice")
+            if price is None:
+                continue
+            currency = product.get("Currency") or "EUR"
+            category_slug = None
+            category = product.get("Category") or model.get("Category")
+            if isinstance(category, dict):
+                category_slug = category.get("Url") or category.get("url")
+            product_slug = product.get("Url") or product.get("url") or product.get("Slug")
+            product_url = self._build_product_url(product_slug, category_slug, url)
+
+            image_urls = self._extract_images_from_model(product)
+            # Prefer the product page's canonical gallery; it is fetched after parsing
+            # and replaces the listing-DOM fallback when it yields images.
+            gallery_url = product_url if not image_urls and product_url else None
+            if not image_urls:
+                image_urls = page_images()
+            image_url = image_urls[0] if image_urls else None
+            sku = slugify_name(name)
+            yield ScrapedItem(
+                sku=sku,
+                name=name,
+                price=float(price),
+                currency=currency,
+                product_url=product_url,
+                in_stock=True,
+                brand="Apple",
+                image_url=image_url,
+                image_urls=image_urls or None,
+                gallery_url=gallery_url,
             )
 
     def _parse_category_details(self, soup, url):
@@ -547,6 +590,11 @@ class NeptunKSScraper(PagedScraper):
             payload = json.loads(html.unescape(raw))
         except Exception:
             return []
+        return self._items_from_category_details(payload, url)
+
+    def _items_from_category_details(self, payload, url) -> list[ScrapedItem]:
+        if not isinstance(payload, dict):
+            return []
         products = payload.get("Products") or []
         items: list[ScrapedItem] = []
         for product in products:
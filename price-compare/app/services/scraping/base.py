@@ -1,16 +1,33 @@
 import abc
+import asyncio
+import contextlib
+import hashlib
+import itertools
 import logging
 import re
+import sys
+import threading
 import time
 import unicodedata
-from dataclasses import dataclass
-from typing import Iterable, List, Protocol
+from concurrent.futures import BrokenExecutor, Future
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, AsyncIterator, Iterable, Iterator, List, Protocol
 import requests
 from bs4 import BeautifulSoup
-from requests.adapters import HTTPAdapter
+from lxml import etree
+from lxml import html as lxml_html
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 from urllib3.util.retry import Retry
 from ...config import settings
 from ...domain.enums import ShopName, ProductCategory
+from .gallery import GalleryResolver
+from .metrics import ScraperMetrics
+from .rate_limit import HostRateLimiter, TokenBucket, shared_rate_limiter
+from .store import JsonFileStore, open_store
+
+if TYPE_CHECKING:
+    from .engine import AsyncFetchSession
+    from .parse_pool import ParsePool
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +43,18 @@ class ScrapedItem:
     brand: str | None = None
     image_url: str | None = None
     image_urls: list[str] | None = None
+    # Product page to pull the gallery from after parsing; cleared once resolved.
+    gallery_url: str | None = None
+
+
+@dataclass(slots=True)
+class FetchedPage:
+    """Raw listing page downloaded for a scraper, parsed later by `parse_page`."""
+
+    url: str
+    html: str
+    # True when the shop answered 304 and `html` is the body cached from an earlier run.
+    not_modified: bool = False
 
 
 class PriceParser(Protocol):
@@ -54,6 +83,13 @@ class BaseScraper(abc.ABC):
     store: ShopName
     category: ProductCategory = ProductCategory.SMARTPHONE
     parser: str = "lxml"
+    # Optional XPath selecting the subtrees parse_products reads (cards, bootstrap
+    # scripts). When set, only those fragments are turned into a BeautifulSoup tree.
+    parse_only: str | None = None
+    # Per-shop request rate for this scraper's host; None uses SCRAPE_RATE_PER_SEC /
+    # SCRAPE_RATE_BURST. SCRAPE_HOST_RATES overrides both.
+    rate_per_sec: float | None = None
+    rate_burst: int | None = None
 
     def __init__(
         self,
@@ -73,26 +109,250 @@ class BaseScraper(abc.ABC):
             allowed_methods=("GET",),
             raise_on_status=False,
         )
-        adapter = HTTPAdapter(max_retries=retries)
+        # Gallery threads share this adapter, so its pool must hold one connection per worker.
+        adapter = HTTPAdapter(max_retries=retries, pool_maxsize=max(DEFAULT_POOLSIZE, settings.scrape_gallery_workers))
         self._session.mount("http://", adapter)
         self._session.mount("https://", adapter)
-        self._last_request_ts = 0.0
+        # Sessions for worker threads, see use_thread_session().
+        self._thread_sessions = threading.local()
+        self.rate_limiter: HostRateLimiter = shared_rate_limiter()
+        self.http_cache: JsonFileStore | None = (
+            open_store(
+                "http",
+                max_entries=settings.scrape_http_cache_max_entries,
+                max_age_sec=settings.scrape_http_cache_max_age_days * 86400,
+            )
+            if settings.scrape_http_cache
+            else None
+        )
+        self.page_store: JsonFileStore | None = open_store("pages") if settings.scrape_page_cache else None
+        # In-process fallback so 304 replays still work when the disk store is disabled.
+        self._parsed_pages: dict[str, dict] = {}
+        # url -> (page fingerprint, worker parse) queued by prepare_pages.
+        self._parse_futures: dict[str, tuple[str, "Future[tuple[List[ScrapedItem], float]]"]] = {}
+        self.gallery_resolver = GalleryResolver.from_settings()
+        # Target pages already committed by an interrupted run; set by IngestionService before fetching.
+        self.resume_cursor = 0
+        # url -> 1-based position in target_urls(), the unit of the resume cursor.
+        self._target_positions: dict[str, int] = {}
+        # Fetch, parse and write costs for the current run; IngestionService swaps in a fresh one per run.
+        self.metrics = ScraperMetrics()
+        # time.monotonic() past which worker parses are no longer waited for; set by IngestionService.
+        self.deadline: float | None = None
+
+    @property
+    def key(self) -> str:
+        """Stable identifier for per-scraper state (several scrapers can share a store)."""
+        return type(self).__name__
 
     def fetch(self) -> Iterable[ScrapedItem]:
-        for url in self.target_urls():
+        # parse_pages pulls pages lazily, so paginated scrapers can stop before the next request.
+        yield from self.parse_pages(self.fetch_pages())
+
+    def fetch_pages(self) -> Iterable[FetchedPage]:
+        """Download target pages one at a time over the blocking session."""
+        for url in self.pending_target_urls():
             try:
                 self.before_request(url)
-                html = self._get(url)
+                page = self._fetch_page(url)
             except Exception as exc:
                 logger.warning("Skipping %s url=%s due to %s", self.store, url, exc)
                 continue
-            soup = BeautifulSoup(html, self.parser)
-            items = []
-            for item in self.parse_products(soup, url):
-                if self.should_skip(item):
-                    continue
-                items.append(item)
-            yield from self.after_parse(items)
+            self.metrics.record_page()
+            yield page
+
+    async def fetch_pages_async(self, session: "AsyncFetchSession") -> List[FetchedPage]:
+        """Download all target pages concurrently through the async engine session."""
+        return [page async for page in self.iter_pages_async(session)]
+
+    async def iter_pages_async(self, session: "AsyncFetchSession") -> AsyncIterator[FetchedPage]:
+        """Download target pages concurrently, yielding them in target order as they arrive.
+
+        Every request starts at once (the session caps them per host), so a
+        consumer can work on the first pages while the rest download.
+        """
+        async for page in self._fetch_in_order(session, list(self.pending_target_urls())):
+            yield page
+
+    async def _fetch_in_order(self, session: "AsyncFetchSession", urls: List[str]) -> AsyncIterator[FetchedPage]:
+        tasks = [asyncio.ensure_future(self._fetch_page_async(session, url)) for url in urls]
+        try:
+            for task in tasks:
+                page = await task
+                if page is not None:
+                    yield page
+        finally:
+            # A consumer that stops early cancels the downloads it no longer needs.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch_page_async(self, session: "AsyncFetchSession", url: str) -> FetchedPage | None:
+        try:
+            self.before_request(url)
+            headers, cached = self._conditional_headers(url)
+            await self.rate_bucket(url).acquire_async()
+            started = time.perf_counter()
+            resp = await session.fetch(url, headers=headers)
+            self.metrics.record_request(time.perf_counter() - started, len(resp.content), resp.status_code == 304)
+            page = self._page_from_response(url, resp.status_code, resp.headers, resp.text, cached)
+            self.metrics.record_page()
+            return page
+        except Exception as exc:
+            logger.warning("Skipping %s url=%s due to %s", self.store, url, exc)
+            return None
+
+    def pending_target_urls(self) -> Iterator[str]:
+        """Target URLs past `resume_cursor`, remembering each URL's position for checkpoints."""
+        self._target_positions = {}
+        for position, url in enumerate(self.target_urls(), start=1):
+            self._target_positions[url] = position
+            if position > self.resume_cursor:
+                yield url
+
+    def page_position(self, page: FetchedPage) -> int | None:
+        return self._target_positions.get(page.url)
+
+    def build_soup(self, html: str) -> BeautifulSoup:
+        if self.parse_only:
+            fragment = select_fragment(html, self.parse_only)
+            if fragment is not None:
+                return BeautifulSoup(fragment, self.parser)
+        return BeautifulSoup(html, self.parser)
+
+    def parse_raw(self, url: str, html: str) -> Iterable[ScrapedItem] | None:
+        """Optional fast path over the raw HTML; return None to parse the soup instead."""
+        return None
+
+    def parse_page(self, url: str, html: str) -> List[ScrapedItem]:
+        products = self.parse_raw(url, html)
+        if products is None:
+            products = self.parse_products(self.build_soup(html), url)
+        items = []
+        for item in products:
+            if self.should_skip(item):
+                continue
+            items.append(item)
+        return list(self.after_parse(items))
+
+    def parse_fetched_page(self, page: FetchedPage) -> List[ScrapedItem]:
+        items = self._parse_or_replay(page)
+        return self.gallery_resolver.resolve(self, items)
+
+    def _parse_or_replay(self, page: FetchedPage) -> List[ScrapedItem]:
+        """Parse a downloaded page unless it is byte-identical to the last parsed copy.
+
+        Pages are fingerprinted by body hash plus the parser's own source, so a
+        304 or an unchanged body replays the stored items, while a code change
+        forces a fresh parse. Pages handed to `prepare_pages` are parsed in a
+        worker process and only collected here.
+        """
+        digest, store_key, replayed = self._replayed_items(page)
+        if replayed is not None:
+            self.metrics.record_parse(0.0, replayed=True)
+            return replayed
+        pending = self._parse_futures.pop(page.url, None)
+        if pending is not None and pending[0] == digest:
+            items, cpu_sec = self._collect_parse(pending[1], page)
+        else:
+            started = time.thread_time()
+            items = self.parse_page(page.url, page.html)
+            cpu_sec = time.thread_time() - started
+        self.metrics.record_parse(cpu_sec)
+        record = {"hash": digest, "items": [asdict(item) for item in items]}
+        if self.page_store is not None:
+            self.page_store.set(store_key, record)
+        else:
+            self._parsed_pages[store_key] = record
+        return items
+
+    def _replayed_items(self, page: FetchedPage) -> tuple[str, str, List[ScrapedItem] | None]:
+        digest = self._page_fingerprint(page.html)
+        store_key = f"{self.key}|{page.url}"
+        cached = self.page_store.get(store_key) if self.page_store is not None else self._parsed_pages.get(store_key)
+        if cached and cached.get("hash") == digest:
+            return digest, store_key, [ScrapedItem(**data) for data in cached.get("items", [])]
+        return digest, store_key, None
+
+    def prepare_pages(self, pages: Iterable[FetchedPage], pool: "ParsePool") -> None:
+        """Start parsing already-downloaded pages on `pool` ahead of `parse_pages`.
+
+        Pages that will be replayed are skipped; the rest are parsed by a fresh
+        instance of this scraper class in a worker process, so `parse_page` must
+        only depend on class-level configuration.
+        """
+        previous, self._parse_futures = self._parse_futures, {}
+        for page in pages:
+            # Parses already started for the same body are kept; queue_parse skips them.
+            if page.url in previous:
+                self._parse_futures[page.url] = previous.pop(page.url)
+            self.queue_parse(page, pool)
+        for _, future in previous.values():
+            future.cancel()
+
+    def queue_parse(self, page: FetchedPage, pool: "ParsePool") -> None:
+        """Start parsing one more downloaded page on `pool`, as `prepare_pages` does for a whole list."""
+        digest, _, replayed = self._replayed_items(page)
+        pending = self._parse_futures.get(page.url)
+        if replayed is None and (pending is None or pending[0] != digest):
+            if pending is not None:
+                pending[1].cancel()
+            self._parse_futures[page.url] = (digest, pool.submit(type(self), page.url, page.html))
+
+    def _listing_items(self, page: FetchedPage) -> List[ScrapedItem]:
+        """Items of a page parsed while still downloading, kept so `parse_pages` does not parse it again."""
+        digest, _, replayed = self._replayed_items(page)
+        if replayed is not None:
+            return replayed
+        started = time.thread_time()
+        items = self.parse_page(page.url, page.html)
+        parsed: "Future[tuple[List[ScrapedItem], float]]" = Future()
+        parsed.set_result((items, time.thread_time() - started))
+        self._parse_futures[page.url] = (digest, parsed)
+        return items
+
+    def _collect_parse(
+        self, future: "Future[tuple[List[ScrapedItem], float]]", page: FetchedPage
+    ) -> tuple[List[ScrapedItem], float]:
+        """Items from a worker parse plus the CPU time the worker spent on it.
+
+        Waits no longer than the scraper's deadline; a parse still running then
+        is cancelled and the scrape fails as timed out.
+        """
+        timeout = None if self.deadline is None else max(0.0, self.deadline - time.monotonic())
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            logger.warning("Worker parse for %s url=%s did not finish before the deadline", self.store, page.url)
+            raise TimeoutError("Scrape timed out") from None
+        except BrokenExecutor as exc:
+            logger.warning("Parse pool unavailable for %s url=%s, parsing in-process: %s", self.store, page.url, exc)
+            started = time.thread_time()
+            items = self.parse_page(page.url, page.html)
+            return items, time.thread_time() - started
+
+    def _page_fingerprint(self, html: str) -> str:
+        digest = hashlib.sha256(_parser_source_digest(type(self)).encode("ascii"))
+        digest.update(html.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def parse_pages(self, pages: Iterable[FetchedPage]) -> Iterable[ScrapedItem]:
+        for _, items in self.iter_parsed_pages(pages):
+            yield from items
+
+    def iter_parsed_pages(self, pages: Iterable[FetchedPage]) -> Iterator[tuple[FetchedPage, List[ScrapedItem]]]:
+        """Parse pages in order, yielding each page with its items once it is fully parsed."""
+        for page in pages:
+            yield page, self.parse_fetched_page(page)
+
+    def parse_gallery(self, html: str) -> list[str]:
+        """Hook to extract gallery image URLs from a product page flagged via `gallery_url`."""
+        return []
+
+    def request_headers(self, url: str) -> dict[str, str]:
+        """Hook to customise request headers per URL."""
+        return {"User-Agent": "Mozilla/5.0"}
 
     def before_request(self, url: str) -> None:
         """Hook to inject headers/auth before a request."""
@@ -106,27 +366,69 @@ class BaseScraper(abc.ABC):
         """Hook to post-process parsed items."""
         return items
 
-    def _throttle(self) -> None:
-        delay = settings.scrape_delay_sec
-        if delay <= 0:
-            return
-        now = time.monotonic()
-        sleep_for = delay - (now - self._last_request_ts)
-        if sleep_for > 0:
-            time.sleep(sleep_for)
-        self._last_request_ts = time.monotonic()
-
-    def _get(self, url: str) -> str:
-        self._throttle()
-        headers = {"User-Agent": "Mozilla/5.0"}
-        resp = self._session.get(
+    def rate_bucket(self, url: str) -> TokenBucket:
+        """Token bucket for `url`'s host, shared with every scraper hitting that host."""
+        return self.rate_limiter.bucket(url, self.rate_per_sec, self.rate_burst)
+
+    def _conditional_headers(self, url: str) -> tuple[dict[str, str], dict | None]:
+        """Request headers plus the cached validators for `url`, if any."""
+        headers = dict(self.request_headers(url))
+        cached = self.http_cache.get(url) if self.http_cache is not None else None
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        return headers, cached
+
+    def _page_from_response(self, url: str, status: int, headers, text: str, cached: dict | None) -> FetchedPage:
+        if status == 304:
+            if not cached:
+                raise ValueError(f"Unexpected 304 without a cached body for {url}")
+            return FetchedPage(url=url, html=cached["body"], not_modified=True)
+        if self.http_cache is not None:
+            etag = headers.get("ETag")
+            last_modified = headers.get("Last-Modified")
+            if etag or last_modified:
+                self.http_cache.set(url, {"etag": etag, "last_modified": last_modified, "body": text})
+            elif cached:
+                self.http_cache.delete(url)
+        return FetchedPage(url=url, html=text)
+
+    def use_thread_session(self) -> None:
+        """Give the calling thread its own requests.Session for this scraper.
+
+        requests.Session is not thread-safe, so worker pools call this once per
+        thread. The copy shares the scraper's adapters (and their connection
+        pools), headers and proxy settings.
+        """
+        session = requests.Session()
+        session.trust_env = self._session.trust_env
+        session.proxies = dict(self._session.proxies)
+        session.headers = self._session.headers.copy()
+        for prefix, adapter in self._session.adapters.items():
+            session.mount(prefix, adapter)
+        self._thread_sessions.session = session
+
+    def _http(self) -> requests.Session:
+        return getattr(self._thread_sessions, "session", None) or self._session
+
+    def _fetch_page(self, url: str) -> FetchedPage:
+        self.rate_bucket(url).acquire()
+        headers, cached = self._conditional_headers(url)
+        started = time.perf_counter()
+        resp = self._http().get(
             url,
             headers=headers,
             timeout=settings.scrape_timeout_sec,
             proxies={"http": None, "https": None},
         )
+        self.metrics.record_request(time.perf_counter() - started, len(resp.content), resp.status_code == 304)
         resp.raise_for_status()
-        return resp.text
+        return self._page_from_response(url, resp.status_code, resp.headers, resp.text, cached)
+
+    def _get(self, url: str) -> str:
+        return self._fetch_page(url).html
 
     def target_urls(self) -> Iterable[str]:
         yield self.base_url()
@@ -146,14 +448,141 @@ class BaseScraper(abc.ABC):
         ...
 
 
+class PaginationController:
+    """Decides how far a PagedScraper run should page.
+
+    The run stops at the first page that adds no new SKUs (empty or a repeat of
+    earlier pages) or once the shop's pager links no page beyond the current
+    one. `budget` is the adaptive upper bound: one page past the last
+    productive page of the previous run, capped at `max_pages`, so a catalogue
+    that grows is picked up on the next run.
+    """
+
+    def __init__(self, max_pages: int, learned_pages: int | None = None, stop_on_empty: bool = True) -> None:
+        self.max_pages = max_pages
+        self.stop_on_empty = stop_on_empty
+        if stop_on_empty and learned_pages:
+            self.budget = max(1, min(max_pages, learned_pages + 1))
+        else:
+            self.budget = max_pages
+        self.stopped = False
+        self.last_productive_page = 0
+        self._seen: set[str] = set()
+
+    def should_fetch(self, page: int) -> bool:
+        return not self.stopped and page <= self.budget
+
+    def record_page(self, page: int, skus: Iterable[str], reported_pages: int | None = None) -> None:
+        new_skus = {sku for sku in skus if sku not in self._seen}
+        self._seen.update(new_skus)
+        if new_skus or not self.stop_on_empty:
+            self.last_productive_page = max(self.last_productive_page, page)
+        else:
+            self.stopped = True
+        if reported_pages is not None and reported_pages <= page:
+            self.stopped = True
+
+    def learned_pages(self) -> int | None:
+        """Pages worth fetching next time, or None when this run gave no clear signal."""
+        if not self.stop_on_empty or not self.last_productive_page:
+            return None
+        if self.stopped or self.last_productive_page >= self.budget:
+            return self.last_productive_page
+        return None
+
+
 class PagedScraper(BaseScraper):
     """Scraper that walks multiple pages via page numbers."""
 
     max_pages: int = 1
+    # Query parameter carrying the page number in pager links, used to detect the last page.
+    page_param: str | None = None
+    # Disable for listings that are not pre-filtered to the items we keep; a page
+    # without matches there does not mean the listing has ended.
+    stop_on_empty_page: bool = True
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.pagination_store: JsonFileStore | None = open_store("pagination")
+        self._pagination: PaginationController | None = None
+        self._page_numbers: dict[str, int] = {}
+
+    def _remembered_pages(self) -> int | None:
+        """Productive page count learned by the previous run, if any."""
+        if self.pagination_store is None:
+            return None
+        return (self.pagination_store.get(self.key) or {}).get("pages")
+
+    def start_pagination(self) -> PaginationController:
+        self._pagination = PaginationController(self.max_pages, self._remembered_pages(), self.stop_on_empty_page)
+        self._page_numbers = {}
+        return self._pagination
 
     def target_urls(self) -> Iterable[str]:
-        for page in range(1, self.max_pages + 1):
-            yield self.base_url_for_page(page)
+        pagination = self.start_pagination()
+        page = 1
+        while pagination.should_fetch(page):
+            url = self.base_url_for_page(page)
+            self._page_numbers[url] = page
+            yield url
+            page += 1
+
+    async def iter_pages_async(self, session: "AsyncFetchSession") -> AsyncIterator[FetchedPage]:
+        """Download pages in windows and request no further window once the listing has ended.
+
+        The first window is the learned page budget, so a shop whose size is
+        known still downloads in one round; later windows (and the first one
+        without a budget) are the host's concurrency. Pages are checked for
+        new SKUs as they land, the same way `iter_parsed_pages` stops; the
+        check parses on a worker thread so the other downloads keep going.
+        """
+        learned = self._remembered_pages() if self.stop_on_empty_page else None
+        window = learned + 1 if learned else session.engine.host_concurrency
+        # Tracks the stop condition only; target_urls enforces the page budget.
+        probe = PaginationController(self.max_pages, stop_on_empty=self.stop_on_empty_page)
+        urls = self.pending_target_urls()
+        while not probe.stopped:
+            chunk = list(itertools.islice(urls, window))
+            if not chunk:
+                return
+            async with contextlib.aclosing(self._fetch_in_order(session, chunk)) as pages:
+                async for page in pages:
+                    yield page
+                    skus, reported = await asyncio.to_thread(self._probe_page, page)
+                    probe.record_page(self._page_numbers.get(page.url, 0), skus, reported)
+                    if probe.stopped:
+                        break
+            window = session.engine.host_concurrency
+
+    def _probe_page(self, page: FetchedPage) -> tuple[List[str], int | None]:
+        """SKUs and pager count of a page still downloading, for the async stop check."""
+        skus = [item.sku for item in self._listing_items(page)] if self.stop_on_empty_page else []
+        return skus, self.reported_page_count(page.html)
+
+    def iter_parsed_pages(self, pages: Iterable[FetchedPage]) -> Iterator[tuple[FetchedPage, List[ScrapedItem]]]:
+        for index, page in enumerate(pages, start=1):
+            items = self.parse_fetched_page(page)
+            yield page, items
+            pagination = self._pagination or self.start_pagination()
+            number = self._page_numbers.get(page.url, index)
+            pagination.record_page(number, (item.sku for item in items), self.reported_page_count(page.html))
+            if pagination.stopped:
+                break
+        self.finish_pagination()
+
+    def finish_pagination(self) -> None:
+        pagination = self._pagination
+        if pagination is None or self.pagination_store is None:
+            return
+        learned = pagination.learned_pages()
+        if learned:
+            self.pagination_store.set(self.key, {"pages": learned})
+
+    def reported_page_count(self, html: str) -> int | None:
+        """Highest page number linked from this page's pager, if the shop exposes one."""
+        if not self.page_param:
+            return None
+        return max_page_from_links(html, self.page_param)
 
     @abc.abstractmethod
     def base_url_for_page(self, page: int) -> str:
@@ -167,6 +596,28 @@ class SinglePageScraper(BaseScraper):
         yield self.base_url()
 
 
+_SOURCE_DIGESTS: dict[type, str] = {}
+
+
+def _parser_source_digest(cls: type) -> str:
+    """Hash of the modules defining a scraper's parsing code, used to invalidate replayed pages."""
+    digest = _SOURCE_DIGESTS.get(cls)
+    if digest is None:
+        hasher = hashlib.sha1()
+        modules = {klass.__module__ for klass in cls.__mro__ if klass is not object}
+        for name in sorted(modules):
+            path = getattr(sys.modules.get(name), "__file__", None)
+            if not path:
+                continue
+            try:
+                with open(path, "rb") as handle:
+                    hasher.update(handle.read())
+            except OSError:
+                hasher.update(name.encode("utf-8"))
+        digest = _SOURCE_DIGESTS[cls] = hasher.hexdigest()
+    return digest
+
+
 def parse_price(text: str) -> float:
     """Normalize messy price strings to a float.
 
@@ -218,6 +669,42 @@ def normalize_url(value: str | None, base: str) -> str | None:
     return f"{base.rstrip('/')}/{url.lstrip('/')}"
 
 
+def class_xpath(*classes: str) -> str:
+    """XPath matching elements carrying any of the given CSS classes."""
+    tests = " or ".join(f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')" for name in classes)
+    return f"//*[{tests}]"
+
+
+def select_fragment(html: str, xpath: str) -> str | None:
+    """Serialize only the outermost elements matching `xpath`.
+
+    lxml builds its C tree far faster than BeautifulSoup builds Python objects,
+    so selecting the interesting subtrees first keeps the soup small. Returns
+    None when lxml cannot read the document, so callers fall back to a full parse.
+    """
+    if not html or not html.strip():
+        return ""
+    try:
+        root = lxml_html.document_fromstring(html)
+    except (ValueError, etree.ParserError):
+        return None
+    nodes = root.xpath(xpath)
+    matched = set(nodes)
+    parts = []
+    for node in nodes:
+        if not isinstance(node, etree.ElementBase) or any(parent in matched for parent in node.iterancestors()):
+            continue
+        parts.append(etree.tostring(node, method="html", encoding="unicode", with_tail=False))
+    return "".join(parts)
+
+
+def max_page_from_links(html: str, param: str) -> int | None:
+    """Return the largest `param=N` page number linked from anchors in the page."""
+    pattern = re.compile(r"<a\s[^>]*?href=[\"'][^\"']*[?&](?:amp;)?" + re.escape(param) + r"=(\d+)", re.IGNORECASE)
+    pages = [int(match.group(1)) for match in pattern.finditer(html)]
+    return max(pages) if pages else None
+
+
 def dedupe_urls(urls: Iterable[str]) -> list[str]:
     seen: set[str] = set()
     unique: list[str] = []
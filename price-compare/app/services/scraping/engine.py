@@ -0,0 +1,145 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Iterable, Iterator, List
+from urllib.parse import urlparse
+
+import httpx
+
+from ...config import settings
+from .base import BaseScraper, FetchedPage
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class AsyncFetchSession:
+    """Per-run view of the engine: one shared client plus per-host semaphores."""
+
+    def __init__(self, engine: "AsyncFetchEngine", client: httpx.AsyncClient) -> None:
+        self.engine = engine
+        self.client = client
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+
+    def _limit_for(self, url: str) -> asyncio.Semaphore:
+        host = (urlparse(url).hostname or "").lower()
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = asyncio.Semaphore(self.engine.host_concurrency)
+            self._host_limits[host] = limit
+        return limit
+
+    async def get(self, url: str, headers: dict[str, str] | None = None) -> str:
+        return (await self.fetch(url, headers=headers)).text
+
+    async def fetch(self, url: str, headers: dict[str, str] | None = None) -> httpx.Response:
+        """GET with retries; raises on error statuses but passes 304 through for conditional requests."""
+        attempt = 0
+        while True:
+            async with self._limit_for(url):
+                try:
+                    resp = await self.client.get(url, headers=headers)
+                except httpx.TransportError:
+                    if attempt >= self.engine.retries:
+                        raise
+                else:
+                    if resp.status_code not in RETRY_STATUSES or attempt >= self.engine.retries:
+                        if resp.status_code != 304:
+                            resp.raise_for_status()
+                        return resp
+            attempt += 1
+            # Same exponential schedule urllib3's Retry applies on the blocking session.
+            await asyncio.sleep(self.engine.backoff_sec * (2 ** (attempt - 1)))
+
+
+class AsyncFetchEngine:
+    """Downloads listing pages for many scrapers at once over httpx.AsyncClient.
+
+    Pages from different shops are fetched in parallel, while each host is
+    capped at `host_concurrency` in-flight requests so no single shop gets
+    hammered.
+    """
+
+    def __init__(
+        self,
+        host_concurrency: int | None = None,
+        timeout_sec: float | None = None,
+        retries: int | None = None,
+        backoff_sec: float | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.host_concurrency = max(1, host_concurrency or settings.scrape_host_concurrency)
+        self.timeout_sec = timeout_sec if timeout_sec is not None else settings.scrape_timeout_sec
+        self.retries = retries if retries is not None else settings.scrape_retries
+        self.backoff_sec = backoff_sec if backoff_sec is not None else settings.scrape_backoff_sec
+        self.transport = transport
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=self.timeout_sec,
+            follow_redirects=True,
+            trust_env=False,
+            transport=self.transport,
+        )
+
+    async def fetch_all(
+        self, scrapers: List[BaseScraper], timeout: float | None = None
+    ) -> List[List[FetchedPage] | None]:
+        async with self._client() as client:
+            session = AsyncFetchSession(self, client)
+            return list(await asyncio.gather(*(self._fetch_scraper(session, s, timeout) for s in scrapers)))
+
+    async def _fetch_scraper(
+        self, session: AsyncFetchSession, scraper: BaseScraper, timeout: float | None = None
+    ) -> List[FetchedPage] | None:
+        try:
+            return await asyncio.wait_for(scraper.fetch_pages_async(session), timeout)
+        except asyncio.TimeoutError:
+            # Out of time: an empty result, so the caller does not start a blocking fetch instead.
+            logger.warning("Async fetch for %s did not finish within %.1fs", scraper.store, timeout)
+            return []
+        except Exception as exc:
+            # None tells the caller to fall back to the scraper's blocking fetch.
+            logger.warning("Async fetch failed for %s: %s", scraper.store, exc)
+            return None
+
+    def run(self, scrapers: Iterable[BaseScraper], timeout: float | None = None) -> List[List[FetchedPage] | None]:
+        """Blocking entry point; returns pages per scraper in input order.
+
+        A scraper still downloading after `timeout` seconds gets no pages.
+        """
+        return asyncio.run(self.fetch_all(list(scrapers), timeout))
+
+    def stream(self, scraper: BaseScraper) -> Iterator[FetchedPage]:
+        """Blocking iterator over one scraper's pages as they download, for a pipeline's fetch thread.
+
+        The event loop runs while the caller waits for the next page, so a
+        consumer that stops pulling also pauses the downloads. If the async
+        fetch fails before any page arrives, the scraper's blocking fetch
+        takes over.
+        """
+        loop = asyncio.new_event_loop()
+        pages = self._stream(scraper)
+        streamed = False
+        try:
+            while True:
+                try:
+                    page = loop.run_until_complete(pages.__anext__())
+                except StopAsyncIteration:
+                    return
+                except Exception as exc:
+                    if streamed:
+                        raise
+                    logger.warning("Async fetch failed for %s, fetching sequentially: %s", scraper.store, exc)
+                    yield from scraper.fetch_pages()
+                    return
+                streamed = True
+                yield page
+        finally:
+            loop.run_until_complete(pages.aclose())
+            loop.close()
+
+    async def _stream(self, scraper: BaseScraper) -> AsyncIterator[FetchedPage]:
+        async with self._client() as client:
+            async for page in scraper.iter_pages_async(AsyncFetchSession(self, client)):
+                yield page
@@ -21,11 +21,9 @@ class ScraperFactory:
             ShopName.NEPTUN: [NeptunKSScraper],
         }
 
-    def build_all(self, shops: Iterable[ShopName] | None = None) -> List[BaseScraper]:
+    def classes(self, shops: Iterable[ShopName] | None = None) -> List[type[BaseScraper]]:
         targets = list(shops) if shops else list(self._registry.keys())
-        scrapers: List[BaseScraper] = []
-        for shop in targets:
-            classes = self._registry.get(shop, [])
-            for cls in classes:
-                scrapers.append(cls())
-        return scrapers
+        return [cls for shop in targets for cls in self._registry.get(shop, [])]
+
+    def build_all(self, shops: Iterable[ShopName] | None = None) -> List[BaseScraper]:
+        return [cls() for cls in self.classes(shops)]
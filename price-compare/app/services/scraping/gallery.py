@@ -0,0 +1,90 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List
+
+from ...config import settings
+from .store import JsonFileStore, open_store
+
+if TYPE_CHECKING:
+    from .base import BaseScraper, ScrapedItem
+
+logger = logging.getLogger(__name__)
+
+
+class GalleryResolver:
+    """Fetches product-page galleries for a whole listing page at once.
+
+    Providers flag items whose listing card had no usable images by setting
+    `ScrapedItem.gallery_url`. The resolver collects those URLs per page,
+    serves what it can from a persistent product_url -> image_urls cache with
+    a TTL, and downloads the rest through a bounded thread pool instead of one
+    request per card inside `parse_products`.
+    """
+
+    def __init__(
+        self,
+        store: JsonFileStore | None = None,
+        workers: int | None = None,
+        ttl_sec: float | None = None,
+    ) -> None:
+        self.store = store
+        self.workers = max(1, workers or settings.scrape_gallery_workers)
+        self.ttl_sec = ttl_sec if ttl_sec is not None else settings.scrape_gallery_ttl_hours * 3600
+
+    @classmethod
+    def from_settings(cls) -> "GalleryResolver":
+        return cls(store=open_store("galleries"))
+
+    def resolve(self, scraper: "BaseScraper", items: List["ScrapedItem"]) -> List["ScrapedItem"]:
+        pending: list[str] = []
+        for item in items:
+            if item.gallery_url and item.gallery_url not in pending:
+                pending.append(item.gallery_url)
+        if not pending:
+            return items
+        now = time.time()
+        galleries: dict[str, list[str]] = {}
+        missing: list[str] = []
+        for url in pending:
+            cached = self.store.get(url) if self.store is not None else None
+            if cached and now - cached.get("fetched_at", 0) < self.ttl_sec:
+                galleries[url] = cached.get("image_urls") or []
+            else:
+                missing.append(url)
+        scraper.metrics.record_gallery(len(missing), len(pending) - len(missing))
+        if missing:
+            workers = min(self.workers, len(missing))
+            # Each pool thread downloads through its own session; the scraper's is not thread-safe.
+            with ThreadPoolExecutor(max_workers=workers, initializer=scraper.use_thread_session) as pool:
+                fetched = pool.map(lambda url: self._fetch_gallery(scraper, url), missing)
+                for url, images in zip(missing, fetched, strict=True):
+                    if images is None:
+                        continue
+                    galleries[url] = images
+                    if self.store is not None:
+                        self.store.set(url, {"fetched_at": now, "image_urls": images})
+        for item in items:
+            url = item.gallery_url
+            if not url:
+                continue
+            images = galleries.get(url)
+            if images:
+                # The product page gallery wins over any fallback images from the listing.
+                item.image_urls = list(images)
+                item.image_url = images[0]
+            item.gallery_url = None
+        return items
+
+    def _fetch_gallery(self, scraper: "BaseScraper", url: str) -> list[str] | None:
+        """Return the gallery for `url`, or None on a network error so it is not cached."""
+        try:
+            html = scraper._get(url)
+        except Exception as exc:
+            logger.debug("Gallery fetch failed store=%s url=%s error=%s", scraper.store, url, exc)
+            return None
+        try:
+            return scraper.parse_gallery(html)
+        except Exception as exc:
+            logger.debug("Gallery parse failed store=%s url=%s error=%s", scraper.store, url, exc)
+            return []
@@ -0,0 +1,112 @@
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Iterable
+
+# Counters summed into the run totals; latencies and rates are per scraper only.
+_RUN_TOTALS = (
+    "pages",
+    "pages_replayed",
+    "not_modified",
+    "requests",
+    "bytes",
+    "gallery_requests",
+    "gallery_cache_hits",
+    "parse_cpu_sec",
+    "write_sec",
+    "writes",
+    "items",
+)
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile of `values`, or None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+@dataclass(slots=True)
+class ScraperMetrics:
+    """Costs one scraper accumulates during an ingestion run.
+
+    Fetching, parsing, gallery resolution and writes run on different
+    threads (and the event loop), so every update goes through the lock.
+    """
+
+    pages: int = 0
+    pages_replayed: int = 0
+    not_modified: int = 0
+    requests: int = 0
+    bytes: int = 0
+    http_latencies: list[float] = field(default_factory=list)
+    parse_cpu_sec: float = 0.0
+    gallery_requests: int = 0
+    gallery_cache_hits: int = 0
+    write_sec: float = 0.0
+    writes: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_request(self, latency_sec: float, size: int, not_modified: bool = False) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes += size
+            self.not_modified += int(not_modified)
+            self.http_latencies.append(latency_sec)
+
+    def record_page(self) -> None:
+        with self._lock:
+            self.pages += 1
+
+    def record_parse(self, cpu_sec: float, replayed: bool = False) -> None:
+        with self._lock:
+            self.pages_replayed += int(replayed)
+            self.parse_cpu_sec += cpu_sec
+
+    def record_gallery(self, requests: int, cache_hits: int) -> None:
+        with self._lock:
+            self.gallery_requests += requests
+            self.gallery_cache_hits += cache_hits
+
+    def record_write(self, elapsed_sec: float, items: int) -> None:
+        with self._lock:
+            self.write_sec += elapsed_sec
+            self.writes += items
+
+    def as_dict(self, items: int = 0, duration_sec: float = 0.0) -> dict:
+        with self._lock:
+            latencies = list(self.http_latencies)
+            snapshot = {
+                "pages": self.pages,
+                "pages_replayed": self.pages_replayed,
+                "not_modified": self.not_modified,
+                "requests": self.requests,
+                "bytes": self.bytes,
+                "gallery_requests": self.gallery_requests,
+                "gallery_cache_hits": self.gallery_cache_hits,
+                "parse_cpu_sec": round(self.parse_cpu_sec, 4),
+                "write_sec": round(self.write_sec, 4),
+                "writes": self.writes,
+            }
+        for pct in (50, 90, 99):
+            value = percentile(latencies, pct)
+            snapshot[f"http_p{pct}_ms"] = round(value * 1000, 1) if value is not None else None
+        snapshot["items"] = items
+        snapshot["duration_sec"] = round(duration_sec, 3)
+        snapshot["items_per_sec"] = round(items / duration_sec, 2) if duration_sec > 0 else None
+        return snapshot
+
+
+def run_totals(scrapers: Iterable[dict], duration_sec: float | None = None) -> dict:
+    """Sum per-scraper metric snapshots into run totals."""
+    totals: dict = dict.fromkeys(_RUN_TOTALS, 0)
+    for snapshot in scrapers:
+        for name in _RUN_TOTALS:
+            totals[name] += snapshot.get(name) or 0
+    totals["parse_cpu_sec"] = round(totals["parse_cpu_sec"], 4)
+    totals["write_sec"] = round(totals["write_sec"], 4)
+    if duration_sec is not None:
+        totals["duration_sec"] = round(duration_sec, 3)
+        totals["items_per_sec"] = round(totals["items"] / duration_sec, 2) if duration_sec > 0 else None
+    return totals
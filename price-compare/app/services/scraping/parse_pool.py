@@ -0,0 +1,71 @@
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor
+from typing import List
+
+from ...config import settings
+from .base import BaseScraper, ScrapedItem
+
+logger = logging.getLogger(__name__)
+
+# One scraper instance per worker process and class, reused across pages.
+_worker_scrapers: dict[type[BaseScraper], BaseScraper] = {}
+
+
+def parse_page_in_worker(scraper_cls: type[BaseScraper], url: str, html: str) -> tuple[List[ScrapedItem], float]:
+    """Parsed items plus the worker's CPU time for them, which the caller's clock cannot see."""
+    scraper = _worker_scrapers.get(scraper_cls)
+    if scraper is None:
+        scraper = scraper_cls()
+        _worker_scrapers[scraper_cls] = scraper
+    started = time.thread_time()
+    items = scraper.parse_page(url, html)
+    return items, time.thread_time() - started
+
+
+class ParsePool:
+    """Runs `BaseScraper.parse_page` for fetched pages in worker processes.
+
+    Soup building and provider extraction are CPU-bound, so threads stop
+    scaling at one core. Workers receive the scraper class plus raw HTML and
+    return picklable `ScrapedItem`s; fetching, gallery resolution and
+    persistence stay in the calling process. Workers are spawned rather than
+    forked because the app process runs scheduler and asyncio threads.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = max(1, workers)
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "ParsePool | None":
+        if settings.scrape_parse_workers <= 0:
+            return None
+        return cls(settings.scrape_parse_workers)
+
+    def submit(self, scraper_cls: type[BaseScraper], url: str, html: str) -> "Future[tuple[List[ScrapedItem], float]]":
+        try:
+            return self._get_executor().submit(parse_page_in_worker, scraper_cls, url, html)
+        except BrokenExecutor as exc:
+            # A worker died (e.g. OOM-killed); start a fresh pool once.
+            logger.warning("Parse pool broken, restarting: %s", exc)
+            self.shutdown()
+            return self._get_executor().submit(parse_page_in_worker, scraper_cls, url, html)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
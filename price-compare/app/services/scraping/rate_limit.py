@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from ...config import settings
+
+
+class TokenBucket:
+    """Thread-safe token bucket usable from both threads and coroutines.
+
+    Callers reserve a token under a lock and are told how long to wait for it,
+    so the lock is never held while sleeping and an event loop is never blocked.
+    A non-positive rate disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return the seconds to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance is a queue of reservations waiting for refills.
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def parse_host_rates(raw: str) -> dict[str, tuple[float, int]]:
+    """Parse `host=rate[:burst]` pairs separated by commas, e.g. `gjirafamall.com=2:4,neptun-ks.com=1`."""
+    rates: dict[str, tuple[float, int]] = {}
+    for entry in (raw or "").split(","):
+        host, sep, value = entry.strip().partition("=")
+        if not sep or not host.strip():
+            continue
+        rate, _, burst = value.partition(":")
+        try:
+            rates[normalize_host(host)] = (float(rate), int(burst) if burst.strip() else 1)
+        except ValueError:
+            continue
+    return rates
+
+
+def normalize_host(value: str) -> str:
+    host = urlparse(value).hostname if "://" in value else value
+    host = (host or "").strip().lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class HostRateLimiter:
+    """Registry of token buckets keyed by hostname, shared by every scraper in the process.
+
+    Scrapers that hit the same host (e.g. the GjirafaMall listing and single-product
+    scrapers) draw from one bucket. A host's rate comes from `SCRAPE_HOST_RATES`,
+    then from the first scraper that declares one, then from the global default.
+    """
+
+    def __init__(
+        self,
+        default_rate: float = 0.0,
+        default_burst: int = 1,
+        host_rates: dict[str, tuple[float, int]] | None = None,
+    ) -> None:
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.host_rates = host_rates or {}
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "HostRateLimiter":
+        rate = settings.scrape_rate_per_sec
+        if rate <= 0 and settings.scrape_delay_sec > 0:
+            # Keep the legacy fixed delay meaningful: one request per delay window.
+            rate = 1 / settings.scrape_delay_sec
+        return cls(
+            default_rate=rate,
+            default_burst=settings.scrape_rate_burst,
+            host_rates=parse_host_rates(settings.scrape_host_rates),
+        )
+
+    def bucket(self, url: str, rate: float | None = None, burst: int | None = None) -> TokenBucket:
+        host = normalize_host(url)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                if host in self.host_rates:
+                    rate, burst = self.host_rates[host]
+                bucket = TokenBucket(
+                    self.default_rate if rate is None else rate,
+                    self.default_burst if burst is None else burst,
+                )
+                self._buckets[host] = bucket
+            return bucket
+
+
+@lru_cache
+def shared_rate_limiter() -> HostRateLimiter:
+    return HostRateLimiter.from_settings()
@@ -0,0 +1,121 @@
+import logging
+from pathlib import Path
+
+import httpx
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .rate_limit import HostRateLimiter
+from .store import JsonFileStore
+
+logger = logging.getLogger(__name__)
+
+# Response headers worth keeping in a fixture; everything else is transport noise.
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class FixtureArchive:
+    """Recorded HTTP responses keyed by URL, stored as gzip JSON via JsonFileStore."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.store = JsonFileStore(self.root, "responses")
+
+    def get(self, url: str) -> dict | None:
+        return self.store.get(url)
+
+    def save(self, url: str, status: int, body: str, headers: dict[str, str] | None = None) -> None:
+        kept = {name: value for name, value in (headers or {}).items() if name in RECORDED_HEADERS}
+        self.store.set(url, {"status": status, "headers": kept, "body": body})
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.store.directory.glob("*.json.gz")) if self.store.directory.exists() else 0
+
+
+class RecordingAdapter(BaseAdapter):
+    """requests adapter that delegates to the real one and saves every response it returns."""
+
+    def __init__(self, archive: FixtureArchive, inner: BaseAdapter) -> None:
+        super().__init__()
+        self.archive = archive
+        self.inner = inner
+
+    def send(self, request, **kwargs):
+        response = self.inner.send(request, **kwargs)
+        if response.status_code != 304:
+            headers = {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers}
+            self.archive.save(request.url, response.status_code, response.text, headers)
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """requests adapter that answers from a FixtureArchive and never touches the network."""
+
+    def __init__(self, archive: FixtureArchive) -> None:
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        record = self.archive.get(request.url)
+        if record is None:
+            raise requests.ConnectionError(f"No recorded response for {request.url}", request=request)
+        response = requests.Response()
+        response.status_code = record["status"]
+        response.headers = CaseInsensitiveDict(record.get("headers") or {})
+        response._content = record["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        return None
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """httpx transport for AsyncFetchEngine that answers from a FixtureArchive."""
+
+    def __init__(self, archive: FixtureArchive) -> None:
+        self.archive = archive
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        record = self.archive.get(str(request.url))
+        if record is None:
+            raise httpx.ConnectError(f"No recorded response for {request.url}", request=request)
+        return httpx.Response(
+            record["status"],
+            headers=record.get("headers") or {},
+            content=record["body"].encode("utf-8"),
+            request=request,
+        )
+
+
+def _detach_caches(scraper) -> None:
+    # Every request must reach the adapter and every page must be parsed.
+    scraper.http_cache = None
+    scraper.page_store = None
+    scraper._parsed_pages = {}
+    scraper.gallery_resolver.store = None
+    if hasattr(scraper, "pagination_store"):
+        scraper.pagination_store = None
+
+
+def install_recorder(scraper, archive: FixtureArchive) -> None:
+    """Save every listing and gallery response the scraper's session receives."""
+    _detach_caches(scraper)
+    session = scraper._session
+    for prefix in ("https://", "http://"):
+        session.mount(prefix, RecordingAdapter(archive, session.adapters[prefix]))
+
+
+def install_replay(scraper, archive: FixtureArchive) -> None:
+    """Serve the scraper's requests from `archive`; unrecorded URLs fail like a network error."""
+    _detach_caches(scraper)
+    scraper.rate_limiter = HostRateLimiter()
+    adapter = ReplayAdapter(archive)
+    for prefix in ("https://", "http://"):
+        scraper._session.mount(prefix, adapter)
@@ -0,0 +1,137 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from ...config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JsonFileStore:
+    """Small on-disk key/value store for scraper state that survives restarts.
+
+    Each key is stored as its own gzip-compressed JSON file under
+    `<root>/<namespace>/`, named by the SHA-1 of the key, so URLs can be used
+    as keys directly. Writes go through a temp file + rename to stay atomic.
+    Read/write failures are logged and treated as cache misses.
+
+    With `max_entries` or `max_age_sec` the store is bounded: reads refresh an
+    entry's mtime, and every so many writes `prune` drops entries older than
+    `max_age_sec` and then the least recently used beyond `max_entries`.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        namespace: str,
+        max_entries: int | None = None,
+        max_age_sec: float | None = None,
+    ) -> None:
+        self.directory = Path(root) / namespace
+        self.max_entries = max_entries if max_entries and max_entries > 0 else None
+        self.max_age_sec = max_age_sec if max_age_sec and max_age_sec > 0 else None
+        self._prune_every = max(16, (self.max_entries or 0) // 10)
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def bounded(self) -> bool:
+        return self.max_entries is not None or self.max_age_sec is not None
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json.gz"
+
+    def get(self, key: str) -> Any | None:
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                record = json.load(handle)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.warning("Ignoring unreadable cache entry %s: %s", path, exc)
+            return None
+        if not isinstance(record, dict) or record.get("key") != key:
+            return None
+        if self.bounded:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return record.get("value")
+
+    def set(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as handle:
+                json.dump({"key": key, "value": value}, handle, separators=(",", ":"))
+            os.replace(tmp_name, path)
+        except Exception as exc:
+            logger.warning("Failed writing cache entry %s: %s", path, exc)
+            return
+        if self.bounded:
+            with self._lock:
+                self._writes += 1
+                due = self._writes % self._prune_every == 0
+            if due:
+                self.prune()
+
+    def delete(self, key: str) -> None:
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            return
+
+    def prune(self) -> int:
+        """Drop expired entries, then the least recently used beyond `max_entries`; returns how many went."""
+        entries = []
+        try:
+            for path in self.directory.glob("*.json.gz"):
+                try:
+                    entries.append((path.stat().st_mtime, path))
+                except FileNotFoundError:
+                    continue
+        except OSError as exc:
+            logger.warning("Could not list cache entries in %s: %s", self.directory, exc)
+            return 0
+        entries.sort(reverse=True)
+        keep = len(entries)
+        if self.max_age_sec is not None:
+            cutoff = time.time() - self.max_age_sec
+            keep = sum(1 for mtime, _ in entries if mtime >= cutoff)
+        if self.max_entries is not None:
+            keep = min(keep, self.max_entries)
+        removed = 0
+        for _, path in entries[keep:]:
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                continue
+            except OSError as exc:
+                logger.warning("Failed removing cache entry %s: %s", path, exc)
+        return removed
+
+
+def open_store(
+    namespace: str,
+    root: str | Path | None = None,
+    max_entries: int | None = None,
+    max_age_sec: float | None = None,
+) -> JsonFileStore | None:
+    """Return a store under the configured cache dir, or None when caching is disabled."""
+    if root is None:
+        root = settings.scrape_cache_dir
+    if not root:
+        return None
+    return JsonFileStore(root, namespace, max_entries=max_entries, max_age_sec=max_age_sec)
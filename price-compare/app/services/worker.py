@@ -0,0 +1,100 @@
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta, timezone
+
+from ..config import settings
+from ..domain.models import ScrapeJob
+from ..domain.repositories import ScrapeJobRepository
+from .ingestion_service import IngestionService, ScrapeOutcome
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeWorker:
+    """Claims per-scraper jobs from the queue and ingests them.
+
+    Any number of workers, in one process or on several nodes, can share a
+    queue: a claim is atomic, and the lease is renewed from a heartbeat thread
+    while the scraper runs. If a worker dies its lease runs out and another
+    worker claims the job, resuming from the run ledger's page cursor. The
+    worker that finishes a run's last job, or fails it once its final lease
+    ran out, closes the run.
+    """
+
+    def __init__(
+        self,
+        ingestion: IngestionService,
+        jobs: ScrapeJobRepository,
+        worker_id: str | None = None,
+        lease_sec: float | None = None,
+        max_attempts: int | None = None,
+        poll_sec: float | None = None,
+    ) -> None:
+        self.ingestion = ingestion
+        self.jobs = jobs
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_sec = settings.scrape_job_lease_sec if lease_sec is None else lease_sec
+        self.max_attempts = max(1, settings.scrape_job_max_attempts if max_attempts is None else max_attempts)
+        self.poll_sec = settings.scrape_worker_poll_sec if poll_sec is None else poll_sec
+
+    def run_once(self) -> ScrapeOutcome | None:
+        """Claim and ingest one job; None when the queue had nothing to claim."""
+        now = datetime.now(timezone.utc)
+        for run_id in self.jobs.fail_expired(now, self.max_attempts):
+            # The dead worker never completed its job, so nobody else would close the run.
+            logger.warning("Run %s lost a job to an expired lease after %s attempts", run_id, self.max_attempts)
+            self._close_if_finished(run_id)
+        job = self.jobs.claim(self.worker_id, now, self.lease_sec, self.max_attempts)
+        if job is None:
+            return None
+        logger.info(
+            "Worker %s claimed %s for run %s (attempt %s)", self.worker_id, job.scraper_key, job.run_id, job.attempts
+        )
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, stop), name="scrape-heartbeat", daemon=True)
+        heartbeat.start()
+        try:
+            outcome = self.ingestion.run_job(job)
+        except Exception as exc:
+            logger.exception("Job %s failed: %s", job.id, exc)
+            outcome = ScrapeOutcome(store=job.scraper_key, error=str(exc) or "Scrape failed")
+        finally:
+            stop.set()
+            heartbeat.join()
+        status = "failed" if outcome.error else "done"
+        if not self.jobs.complete(job.id, self.worker_id, status, outcome.items, outcome.error):
+            logger.warning("Worker %s lost the lease on %s; another worker owns it now", self.worker_id, job.id)
+        else:
+            self._close_if_finished(job.run_id)
+        return outcome
+
+    def _close_if_finished(self, run_id: str) -> None:
+        if all(job.status in ("done", "failed") for job in self.jobs.jobs_for_run(run_id)):
+            self.ingestion.close_run(run_id)
+            logger.info("Scrape run %s finished", run_id)
+
+    def run_forever(self, stop: threading.Event | None = None) -> None:
+        """Work through the queue, polling while it is empty, until `stop` is set."""
+        stop = stop or threading.Event()
+        logger.info("Scrape worker %s started", self.worker_id)
+        while not stop.is_set():
+            try:
+                claimed = self.run_once()
+            except Exception as exc:
+                logger.exception("Scrape worker %s could not reach the queue: %s", self.worker_id, exc)
+                claimed = None
+            if claimed is None:
+                stop.wait(self.poll_sec)
+
+    def _heartbeat(self, job: ScrapeJob, stop: threading.Event) -> None:
+        interval = max(self.lease_sec / 3, 0.01)
+        while not stop.wait(interval):
+            expires = datetime.now(timezone.utc) + timedelta(seconds=self.lease_sec)
+            try:
+                if not self.jobs.heartbeat(job.id, self.worker_id, expires):
+                    logger.warning("Worker %s no longer holds %s; stopping heartbeat", self.worker_id, job.id)
+                    return
+            except Exception as exc:
+                logger.warning("Heartbeat for %s failed: %s", job.id, exc)
@@ -699,7 +699,12 @@ function updateScrapeUI(status) {
       clearTimeout(scrapeHideTimer);
       scrapeHideTimer = null;
     }
-    const store = status && status.current_store ? displayStore(status.current_store) : "Starting";
+    const activeStores = status && Array.isArray(status.current_stores) && status.current_stores.length
+      ? status.current_stores
+      : status && status.current_store
+        ? [status.current_store]
+        : [];
+    const store = activeStores.length ? activeStores.map(displayStore).join(", ") : "Starting";
     scrapeProgressText.textContent = total
       ? `Scraping ${store} (${completed}/${total})`
       : "Scraping...";
@@ -0,0 +1,43 @@
+"""
+Stamp product categories onto existing price and latest-price documents.
+
+Prices written since categories were denormalized already carry one. The API
+runs this at startup whenever a latest price has no category; run it by hand
+to restamp older history without a restart. It is idempotent and only
+touches documents whose category is missing or stale.
+
+Usage:
+    python scripts/backfill_price_categories.py [--batch-size 1000]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.dependencies import get_price_store
+from app.infrastructure.mongo.connection import get_database
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Copy product categories onto price documents.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="SKUs per update_many.")
+    args = parser.parse_args()
+
+    db = get_database()
+    repo = get_price_store()
+    updated = repo.backfill_categories(batch_size=max(1, args.batch_size))
+    print(
+        {
+            "prices_updated": updated,
+            "prices_without_category": repo.collection.count_documents({"category": {"$exists": False}}),
+            "latest_without_category": db["latest_prices"].count_documents({"category": {"$exists": False}}),
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
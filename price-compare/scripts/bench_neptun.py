@@ -0,0 +1,156 @@
+"""
+Benchmark Neptun listing-page parsing: legacy soup + per-character model scan vs
+the single-pass raw-HTML extractor.
+
+Neptun category pages are several hundred KB, almost all of it markup around a
+JSON bootstrap payload. Pass saved category pages, download live ones with
+--live, or generate look-alikes with --synthetic.
+
+Usage:
+    python scripts/bench_neptun.py page1.html page2.html
+    python scripts/bench_neptun.py --live 3 --repeat 5
+    python scripts/bench_neptun.py --synthetic 48
+"""
+
+import argparse
+import html as html_lib
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from bs4 import BeautifulSoup
+
+from app.services.providers.neptun import MODEL_VARIABLES, NeptunKSScraper
+
+
+def legacy_extract_model(soup, var_name: str):
+    """The previous extractor: rebuild the JS literal char by char for one variable."""
+    marker = f'{var_name} = "'
+    for script in soup.find_all("script"):
+        text = script.string or script.get_text()
+        if not text or marker not in text:
+            continue
+        i = text.find(marker) + len(marker)
+        buf = []
+        escaped = False
+        while i < len(text):
+            ch = text[i]
+            if escaped:
+                buf.append(ch)
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+                buf.append(ch)
+            elif ch == '"':
+                break
+            else:
+                buf.append(ch)
+            i += 1
+        try:
+            unescaped = bytes("".join(buf), "utf-8").decode("unicode_escape")
+            return json.loads(html_lib.unescape(unescaped))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            continue
+    return None
+
+
+def legacy_parse(scraper: NeptunKSScraper, url: str, page: str) -> list:
+    soup = BeautifulSoup(page, scraper.parser)
+    items = scraper._parse_category_details(soup, url)
+    if items:
+        return items
+    for var_name in MODEL_VARIABLES:
+        model = legacy_extract_model(soup, var_name)
+        if model:
+            return list(scraper._items_from_model(model, url, lambda: scraper._extract_images_from_dom(soup)))
+    return list(scraper.parse_products(soup, url))
+
+
+def synthetic_pages(products: int) -> list[tuple[str, str]]:
+    payload = {
+        "Category": {"Url": "smartphone"},
+        "Products": [
+            {
+                "Title": f"iPhone {n} Pro 256GB",
+                "ActualPrice": 900 + n,
+                "Url": f"apple-iphone-{n}-pro-256gb",
+                "Thumbnail": f"/images/products/{n}/thumb.jpg",
+                "Images": [f"/images/products/{n}/{k}.jpg" for k in range(4)],
+                "Description": "Ekran 6.1\" <b>OLED</b> & çip A17 – " * 6,
+                "Specifications": [{"Name": f"Spec {k}", "Value": f"Value {k}"} for k in range(12)],
+            }
+            for n in range(products)
+        ],
+    }
+    as_json = json.dumps(payload)
+    js_literal = json.dumps(as_json, ensure_ascii=True)[1:-1].replace("&", "\\u0026")
+    filler = "".join(
+        f'<li class="menu-item"><a href="/category/{n}">Kategoria {n}</a><span class="badge">new</span></li>'
+        for n in range(products * 40)
+    )
+    head = "".join(f"<script>var tracker{n} = {{id: {n}}};</script>" for n in range(20))
+    shell = "<html><head>{head}</head><body><ul class='nav'>{nav}</ul>{app}<footer>{nav}</footer>{script}</body></html>"
+    model_page = shell.format(
+        head=head, nav=filler, app="", script=f'<script>var shopCategoryModel = "{js_literal}";</script>'
+    )
+    angular_page = shell.format(
+        head=head,
+        nav=filler,
+        app=f'<div id="angularApp" data-categorydetails="{html_lib.escape(as_json)}"></div>',
+        script="",
+    )
+    return [(f"synthetic-model-{products}", model_page), (f"synthetic-angular-{products}", angular_page)]
+
+
+def timed(fn, repeat: int) -> tuple[float, list]:
+    result = fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare legacy vs raw-HTML Neptun listing parsing.")
+    parser.add_argument("files", nargs="*", help="Saved Neptun category pages (HTML).")
+    parser.add_argument("--live", type=int, default=0, help="Download the first N category pages.")
+    parser.add_argument("--synthetic", type=int, default=0, help="Generate pages with N products.")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    scraper = NeptunKSScraper()
+    pages: list[tuple[str, str]] = [
+        (name, Path(name).read_text(encoding="utf-8", errors="replace")) for name in args.files
+    ]
+    for page in range(1, args.live + 1):
+        pages.append((f"live-page-{page}", scraper._get(scraper.base_url_for_page(page))))
+    if args.synthetic:
+        pages.extend(synthetic_pages(args.synthetic))
+    if not pages:
+        parser.error("pass HTML files, --live N or --synthetic N")
+
+    url = scraper.base_url()
+    print(f"{'page':<26}{'KB':>7}{'items':>7}{'legacy ms':>11}{'soup ms':>9}{'raw ms':>8}{'speedup':>9}")
+    exit_code = 0
+    for name, page in pages:
+        legacy_ms, legacy_items = timed(lambda page=page: legacy_parse(scraper, url, page), args.repeat)
+        soup_ms, _ = timed(lambda page=page: list(scraper.parse_products(scraper.build_soup(page), url)), args.repeat)
+        raw_ms, raw_items = timed(lambda page=page: scraper.parse_page(url, page), args.repeat)
+        same = legacy_items == raw_items
+        if not same:
+            exit_code = 1
+        print(
+            f"{name[-26:]:<26}{len(page.encode()) / 1024:>7.0f}{len(raw_items):>7}"
+            f"{legacy_ms:>11.1f}{soup_ms:>9.1f}{raw_ms:>8.1f}{legacy_ms / max(raw_ms, 1e-6):>8.1f}x"
+            + ("" if same else "  MISMATCH")
+        )
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Benchmark full-document vs selective (parse_only) parsing for provider listing pages.
+
+Reports CPU time and peak traced memory per page for each mode and checks both
+modes produce the same items.
+
+Usage:
+    python scripts/bench_parse.py --provider gjirafamall page1.html page2.html
+    python scripts/bench_parse.py --provider aztech --synthetic 60 --repeat 20
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.services.providers.aztech import AztechScraper
+from app.services.providers.gjirafamall import GjirafaMallScraper
+from app.services.providers.neptun import NeptunKSScraper
+from app.services.providers.shopaz import ShopAzScraper
+
+PROVIDERS = {
+    "gjirafamall": GjirafaMallScraper,
+    "aztech": AztechScraper,
+    "neptun": NeptunKSScraper,
+    "shopaz": ShopAzScraper,
+}
+
+SYNTHETIC_CARDS = {
+    "gjirafamall": (
+        '<div class="item-box"><div class="product-item" data-productid="{n}">'
+        '<div class="picture"><a href="/apple-iphone-{n}"><img src="/images/thumbs/{n}.jpeg" /></a></div>'
+        '<div class="details"><h2 class="product-title"><a href="/apple-iphone-{n}">Apple iPhone {n} 128GB</a></h2>'
+        '<div class="prices"><span class="price actual-price">{n}9,50 €</span></div></div></div></div>'
+    ),
+    "aztech": (
+        '<div class="product-container"><div class="shared-product-card"><div class="image-container">'
+        '<a href="https://aztechonline.com/apple-iphone-{n}"><img src="/cache/large/{n}.jpg" /></a></div>'
+        '<div class="title-container"><a href="https://aztechonline.com/apple-iphone-{n}">'
+        "<span>Apple iPhone {n}</span></a>"
+        '<div class="product-price"><span>{n}99.00 EUR</span></div></div></div></div>'
+    ),
+}
+
+# Navigation, filters and footer markup that real listing pages carry around the cards.
+FILLER = (
+    '<li class="menu-item"><a href="/category/{n}">Category {n}</a>'
+    '<ul class="sub"><li><a href="/category/{n}/a">Sub A</a></li><li><a href="/category/{n}/b">Sub B</a></li></ul>'
+    '<span class="badge">new</span></li>'
+)
+
+
+def synthetic_page(provider: str, cards: int) -> str:
+    template = SYNTHETIC_CARDS.get(provider)
+    if template is None:
+        raise SystemExit(f"No synthetic template for {provider}; pass saved HTML files instead.")
+    nav = "".join(FILLER.format(n=n) for n in range(cards * 6))
+    body = "".join(template.format(n=10 + n) for n in range(cards))
+    return (
+        "<html><head><title>Listing</title></head>"
+        f"<body><ul class='nav'>{nav}</ul>{body}<footer>{nav}</footer></body></html>"
+    )
+
+
+def measure(scraper, html: str, repeat: int) -> tuple[float, float, list]:
+    items = scraper.parse_page("https://bench.local/listing", html)
+    cpu_start = time.process_time()
+    for _ in range(repeat):
+        scraper.parse_page("https://bench.local/listing", html)
+    cpu_ms = (time.process_time() - cpu_start) * 1000 / repeat
+    tracemalloc.start()
+    scraper.parse_page("https://bench.local/listing", html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu_ms, peak / 1024, items
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare full vs selective listing-page parsing.")
+    parser.add_argument("files", nargs="*", help="Saved listing pages (HTML).")
+    parser.add_argument("--provider", choices=sorted(PROVIDERS), required=True)
+    parser.add_argument("--synthetic", type=int, default=0, help="Generate a page with N cards instead of files.")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    pages: list[tuple[str, str]] = []
+    for name in args.files:
+        pages.append((name, Path(name).read_text(encoding="utf-8", errors="replace")))
+    if args.synthetic:
+        pages.append((f"synthetic-{args.synthetic}", synthetic_page(args.provider, args.synthetic)))
+    if not pages:
+        parser.error("pass HTML files or --synthetic N")
+
+    scraper = PROVIDERS[args.provider]()
+    selective = scraper.parse_only
+    if not selective:
+        print(f"{args.provider} does not declare parse_only; both modes are a full parse.")
+
+    print(f"{'page':<28}{'KB':>8}{'items':>7}{'full ms':>10}{'sel ms':>9}{'full KB':>10}{'sel KB':>9}")
+    exit_code = 0
+    for name, html in pages:
+        scraper.parse_only = None
+        full_ms, full_kb, full_items = measure(scraper, html, args.repeat)
+        scraper.parse_only = selective
+        sel_ms, sel_kb, sel_items = measure(scraper, html, args.repeat)
+        same = full_items == sel_items
+        if not same:
+            exit_code = 1
+        print(
+            f"{name[-28:]:<28}{len(html.encode()) / 1024:>8.0f}{len(full_items):>7}"
+            f"{full_ms:>10.1f}{sel_ms:>9.1f}{full_kb:>10.0f}{sel_kb:>9.0f}"
+            + ("" if same else "  MISMATCH")
+        )
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
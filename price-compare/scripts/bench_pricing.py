@@ -0,0 +1,105 @@
+"""
+Microbenchmark per-item vs batched pricing strategies over synthetic price points.
+
+Compares `apply_pricing_strategies` (one call per point, allocating a new
+PricePoint per strategy) with `apply_pricing_many` (column-wise, in place)
+for the default strategies, and checks both produce the same points.
+
+Usage:
+    python scripts/bench_pricing.py
+    python scripts/bench_pricing.py --points 100000 --batch 500 --repeat 7
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.domain.enums import ShopName
+from app.domain.models import PricePoint
+from app.services.pricing import apply_pricing_many, apply_pricing_strategies, default_pricing_strategies
+
+
+def synthetic_points(count: int, seed: int = 7) -> list[PricePoint]:
+    rng = random.Random(seed)
+    stores = list(ShopName)
+    currencies = ["eur", "EUR", "Eur", None]
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        PricePoint(
+            product_sku=f"sku-{index}",
+            store=stores[index % len(stores)],
+            price=rng.uniform(50, 2500),
+            currency=currencies[index % len(currencies)],
+            product_url=f"https://shop.test/p/{index}",
+            in_stock=bool(index % 3),
+            timestamp=timestamp,
+        )
+        for index in range(count)
+    ]
+
+
+def per_item(points, strategies):
+    return [apply_pricing_strategies(point, strategies) for point in points]
+
+
+def batched(points, strategies, size):
+    priced = []
+    for start in range(0, len(points), size):
+        priced.extend(apply_pricing_many(points[start : start + size], strategies))
+    return priced
+
+
+def measure(fn, points_factory, repeat):
+    """Best wall time and peak traced memory; inputs are rebuilt per run since batches mutate them."""
+    best = float("inf")
+    for _ in range(repeat):
+        points = points_factory()
+        start = time.perf_counter()
+        fn(points)
+        best = min(best, time.perf_counter() - start)
+    points = points_factory()
+    tracemalloc.start()
+    fn(points)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark per-item vs batched pricing strategies.")
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument(
+        "--batch", type=int, default=500, help="Points per apply_pricing_many call (ingest batch size)."
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    strategies = default_pricing_strategies()
+    factory = lambda: synthetic_points(args.points)  # noqa: E731
+    if per_item(factory(), strategies) != batched(factory(), strategies, args.batch):
+        print("per-item and batched pricing disagree", file=sys.stderr)
+        return 1
+
+    modes = {
+        "per-item": lambda points: per_item(points, strategies),
+        f"batched/{args.batch}": lambda points: batched(points, strategies, args.batch),
+        "batched/all": lambda points: batched(points, strategies, args.points),
+    }
+    print(f"{args.points} points, {len(strategies)} strategies, best of {args.repeat}")
+    print(f"{'mode':<16}{'ms':>10}{'ns/point':>10}{'peak MB':>10}")
+    for name, fn in modes.items():
+        seconds, peak = measure(fn, factory, args.repeat)
+        print(f"{name:<16}{seconds * 1000:>10.1f}{seconds * 1e9 / args.points:>10.0f}{peak / 1e6:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
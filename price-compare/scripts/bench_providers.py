@@ -0,0 +1,113 @@
+"""
+Offline parse-throughput benchmark for every provider scraper.
+
+Replays fixtures recorded by scripts/record_fixtures.py through `fetch()`
+and reports, per scraper: pages/sec, items/sec, time spent building the
+soup (parse) vs running the provider's extraction (extract) vs everything
+else (replayed I/O, galleries, pagination), and peak RSS. Each scraper
+runs in a fresh process so its RSS is not inflated by the others.
+
+Usage:
+    python scripts/bench_providers.py --fixtures fixtures/providers
+    python scripts/bench_providers.py --fixtures fixtures/providers --scraper AztechScraper --repeat 20 --json
+"""
+
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.services.scraping.factory import ScraperFactory
+from app.services.scraping.replay import FixtureArchive, install_replay
+
+
+def bench_scraper(name: str, fixtures: str, repeat: int) -> dict:
+    cls = next(cls for cls in ScraperFactory().classes() if cls.__name__ == name)
+    scraper = cls()
+    install_replay(scraper, FixtureArchive(fixtures))
+    totals = {"pages": 0, "items": 0, "wall": 0.0, "parse": 0.0, "page": 0.0}
+    build_soup = scraper.build_soup
+    parse_page = scraper.parse_page
+
+    def timed_build_soup(html):
+        start = time.perf_counter()
+        try:
+            return build_soup(html)
+        finally:
+            totals["parse"] += time.perf_counter() - start
+
+    def timed_parse_page(url, html):
+        start = time.perf_counter()
+        try:
+            return parse_page(url, html)
+        finally:
+            totals["page"] += time.perf_counter() - start
+            totals["pages"] += 1
+
+    scraper.build_soup = timed_build_soup
+    scraper.parse_page = timed_parse_page
+    for _ in range(repeat):
+        # Unchanged bodies are otherwise replayed from memory and never reach the parser.
+        scraper._parsed_pages.clear()
+        start = time.perf_counter()
+        totals["items"] += sum(1 for _ in scraper.fetch())
+        totals["wall"] += time.perf_counter() - start
+    wall = totals["wall"] or 1e-9
+    return {
+        "scraper": name,
+        "pages": totals["pages"] // repeat,
+        "items": totals["items"] // repeat,
+        "pages_per_sec": totals["pages"] / wall,
+        "items_per_sec": totals["items"] / wall,
+        "parse_ms": totals["parse"] * 1000 / repeat,
+        "extract_ms": (totals["page"] - totals["parse"]) * 1000 / repeat,
+        "other_ms": (wall - totals["page"]) * 1000 / repeat,
+        # Linux reports ru_maxrss in KiB.
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark provider parsing against recorded fixtures.")
+    parser.add_argument("--fixtures", default="fixtures/providers", help="Directory written by record_fixtures.py.")
+    parser.add_argument("--scraper", action="append", help="Scraper class name to benchmark (repeatable).")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per scraper.")
+    args = parser.parse_args()
+
+    if not len(FixtureArchive(args.fixtures)):
+        parser.error(f"no fixtures in {args.fixtures}; run scripts/record_fixtures.py first")
+    names = [cls.__name__ for cls in ScraperFactory().classes()]
+    if args.scraper:
+        names = [name for name in names if name in args.scraper]
+
+    if not args.json:
+        print(
+            f"{'scraper':<28}{'pages':>6}{'items':>7}{'pages/s':>9}{'items/s':>9}"
+            f"{'parse ms':>10}{'extract ms':>12}{'other ms':>10}{'RSS MB':>8}"
+        )
+    context = multiprocessing.get_context("spawn")
+    for name in names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            result = pool.submit(bench_scraper, name, args.fixtures, args.repeat).result()
+        if args.json:
+            print(json.dumps(result))
+            continue
+        print(
+            f"{name:<28}{result['pages']:>6}{result['items']:>7}{result['pages_per_sec']:>9.1f}"
+            f"{result['items_per_sec']:>9.1f}{result['parse_ms']:>10.1f}{result['extract_ms']:>12.1f}"
+            f"{result['other_ms']:>10.1f}{result['peak_rss_mb']:>8.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
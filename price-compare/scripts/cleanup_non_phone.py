@@ -95,6 +95,7 @@ def main():
 
     prod_result = products.delete_many({"sku": {"$in": delete_skus}})
     price_result = prices.delete_many({"product_sku": {"$in": delete_skus}})
+    db["latest_prices"].delete_many({"product_sku": {"$in": delete_skus}})
     print(f"Deleted products: {prod_result.deleted_count}")
     print(f"Deleted price records: {price_result.deleted_count}")
 
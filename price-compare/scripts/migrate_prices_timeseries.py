@@ -0,0 +1,76 @@
+"""
+Copy the plain `prices` collection into the `price_series` time-series collection.
+
+Points keep their ids, so `latest_prices` stays valid. Progress is checkpointed
+in `migrations`; rerunning continues after the last checkpointed batch and skips
+measurements a crashed batch already copied. The source collection is left in place.
+Once the copy is done, set PRICE_TIMESERIES=true.
+
+Usage:
+    python scripts/migrate_prices_timeseries.py [--batch-size 1000] [--restart]
+"""
+
+import argparse
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.infrastructure.mongo.connection import get_database
+from app.infrastructure.mongo.repositories import MongoTimeSeriesPriceRepository
+
+CHECKPOINT_ID = "prices_timeseries"
+
+
+def _sizes(db, name: str) -> dict:
+    try:
+        stats = db.command("collStats", name)
+    except Exception:
+        return {}
+    return {"storage_bytes": stats.get("storageSize"), "index_bytes": stats.get("totalIndexSize")}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migrate price history into a time-series collection.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Measurements per insert_many.")
+    parser.add_argument("--restart", action="store_true", help="Drop price_series and copy from the start.")
+    args = parser.parse_args()
+
+    db = get_database()
+    migrations = db["migrations"]
+    if args.restart:
+        db.drop_collection(MongoTimeSeriesPriceRepository.COLLECTION)
+        migrations.delete_one({"_id": CHECKPOINT_ID})
+    source = db["prices"]
+    target = MongoTimeSeriesPriceRepository(db)
+    checkpoint = migrations.find_one({"_id": CHECKPOINT_ID})
+    after = checkpoint.get("last_id") if checkpoint else None
+    copied = checkpoint.get("copied", 0) if checkpoint else 0
+    if after is not None:
+        print(f"Resuming after {after} ({copied} measurements already copied)")
+
+    for batch, last_id in target.migrate_from(source, batch_size=max(1, args.batch_size), after=after):
+        copied += batch
+        migrations.update_one(
+            {"_id": CHECKPOINT_ID},
+            {"$set": {"last_id": last_id, "copied": copied, "updated_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+        print(f"Copied {copied} measurements (through {last_id})")
+
+    print(
+        {
+            "prices": source.count_documents({}),
+            "price_series": target.count(),
+            "prices_size": _sizes(db, source.name),
+            "price_series_size": _sizes(db, target.collection.name),
+        }
+    )
+    print("Set PRICE_TIMESERIES=true to read and write the time-series collection.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Recompute the materialized `latest_prices` collection from the price history.
+
+Ingestion keeps it current on every write, and an empty collection is filled
+automatically when the API starts. Run this after editing or deleting price
+history by hand.
+
+Usage:
+    python scripts/rebuild_latest_prices.py
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.dependencies import get_price_store
+from app.infrastructure.mongo.connection import get_database
+
+
+def main() -> None:
+    db = get_database()
+    repo = get_price_store()
+    # Entries whose history is gone would survive a merge, so start from an empty collection.
+    db["latest_prices"].delete_many({})
+    count = repo.rebuild_latest()
+    print({"prices": repo.count(), "latest_prices": count})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Record live listing and gallery responses for each scraper as offline fixtures.
+
+Responses are saved as gzip JSON under <out>/responses/ and replayed by
+scripts/bench_providers.py (or tests) through app.services.scraping.replay.
+
+Usage:
+    python scripts/record_fixtures.py --out fixtures/providers
+    python scripts/record_fixtures.py --out fixtures/providers --scraper NeptunKSScraper
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.services.scraping.factory import ScraperFactory
+from app.services.scraping.replay import FixtureArchive, install_recorder
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record provider responses for offline replay.")
+    parser.add_argument("--out", default="fixtures/providers", help="Fixture directory.")
+    parser.add_argument("--scraper", action="append", help="Scraper class name to record (repeatable).")
+    args = parser.parse_args()
+
+    archive = FixtureArchive(args.out)
+    for cls in ScraperFactory().classes():
+        if args.scraper and cls.__name__ not in args.scraper:
+            continue
+        scraper = cls()
+        install_recorder(scraper, archive)
+        before = len(archive)
+        items = list(scraper.fetch())
+        print(f"{cls.__name__}: {len(items)} items, {len(archive) - before} new responses")
+    print(f"{len(archive)} responses in {archive.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Run a scrape worker that claims per-scraper jobs from the Mongo job queue.
+
+Start as many as you like, on one machine or several pointing at the same
+MONGO_URI. With SCRAPE_QUEUE=true the web app (scheduler and admin "scrape"
+button) only queues jobs; these workers do the fetching and ingestion.
+
+Usage:
+    python scripts/scrape_worker.py
+    python scripts/scrape_worker.py --once
+    python scripts/scrape_worker.py --enqueue --once --worker-id node-a
+"""
+
+import argparse
+import logging
+import signal
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.dependencies import get_ingestion_service, get_parse_pool, get_scrape_job_repo
+from app.services.worker import ScrapeWorker
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Claim and run scrape jobs from the Mongo queue.")
+    parser.add_argument("--worker-id", help="Identifier recorded on claimed jobs (default: host:pid).")
+    parser.add_argument("--enqueue", action="store_true", help="Queue a run for every scraper before working.")
+    parser.add_argument("--once", action="store_true", help="Exit once the queue has nothing left to claim.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    ingestion, jobs = get_ingestion_service(), get_scrape_job_repo()
+    worker = ScrapeWorker(ingestion, jobs, worker_id=args.worker_id)
+    if args.enqueue:
+        print(f"Queued run {ingestion.enqueue_run(jobs)}")
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        # Finish the job in hand, then exit; an unfinished lease is reclaimed by another worker.
+        signal.signal(signum, lambda *_: stop.set())
+    try:
+        if args.once:
+            while not stop.is_set() and worker.run_once() is not None:
+                pass
+        else:
+            worker.run_forever(stop)
+    finally:
+        parse_pool = get_parse_pool()
+        if parse_pool is not None:
+            parse_pool.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+
+@pytest.fixture()
+def mongo_db():
+    """Throwaway database on a local mongod (MONGO_TEST_URI); tests using it skip when none is reachable."""
+    client = MongoClient(os.getenv("MONGO_TEST_URI", "mongodb://localhost:27017"), serverSelectionTimeoutMS=300)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        client.close()
+        pytest.skip("no local mongod")
+    name = f"price_compare_test_{os.getpid()}"
+    client.drop_database(name)
+    try:
+        yield client[name]
+    finally:
+        client.drop_database(name)
+        client.close()
@@ -9,10 +9,12 @@ from app.dependencies import (
     get_price_repo,
     get_product_repo,
     get_shop_repo,
+    require_admin,
 )
 from app.domain.enums import ProductCategory, ShopName
-from app.domain.models import PricePoint, Product, Shop
+from app.domain.models import PricePoint, Product, Shop, User
 from app.domain.repositories import PriceRepository, ProductRepository, ShopRepository
+from app.domain.search import matches_query
 from app.main import app
 from app.services.comparison_service import ComparisonService
 
@@ -36,8 +38,7 @@ class InMemoryProductRepo(ProductRepository):
     ) -> List[Product]:
         items = list(self.data.values())
         if query is not None:
-            needle = query.lower()
-            items = [p for p in items if needle in p.name.lower()]
+            items = [p for p in items if matches_query(p.name, query)]
         offset = max(offset, 0)
         items = items[offset:]
         if limit is not None:
@@ -227,3 +228,19 @@ def test_prices_cheapest_endpoint_uses_latest_prices(client: TestClient):
     body = resp.json()
     assert body[0]["price"] == 1099.0
     assert body[0]["store"] in {"GjirafaMall", "Neptun KS"}
+
+
+def test_admin_products_page_with_after_tokens(client: TestClient):
+    product_repo = app.dependency_overrides[get_product_repo]()
+    for n in range(4):
+        product_repo.upsert(Product(sku=f"iphone-{n}", name=f"Apple iPhone {n}"))
+    app.dependency_overrides[require_admin] = lambda: User(email="admin@test", password_hash="", role="admin")
+
+    first = client.get("/admin/products", params={"q": "iphone", "limit": 3, "with_total": "false"}).json()
+    assert (len(first["items"]), first["total"]) == (3, None)
+    second = client.get("/admin/products", params={"q": "iphone", "limit": 3, "after": first["next_after"]}).json()
+    assert (len(second["items"]), second["total"], second["next_after"]) == (2, 5, None)
+    seen = [item["sku"] for item in first["items"] + second["items"]]
+    assert sorted(seen) == sorted(product_repo.data)
+
+    assert client.get("/admin/products", params={"after": "not-a-cursor"}).status_code == 400
@@ -3,6 +3,8 @@ from typing import List, Optional
 from app.domain.enums import ProductCategory, ShopName
 from app.domain.models import Product, PricePoint
 from app.domain.repositories import ProductRepository, PriceRepository
+from app.domain.search import matches_query
+from app.infrastructure.caching import CachingPriceRepository
 from app.services.comparison_service import ComparisonService
 
 
@@ -25,7 +27,7 @@ class InMemoryProductRepo(ProductRepository):
     ) -> List[Product]:
         items = list(self.data.values())
         if query:
-            items = [p for p in items if query.lower() in p.name.lower()]
+            items = [p for p in items if matches_query(p.name, query)]
         offset = max(offset, 0)
         items = items[offset:]
         if limit is not None:
@@ -53,6 +55,16 @@ class InMemoryPriceRepo(PriceRepository):
             key=lambda p: p.price,
         )
 
+    def latest_for_canonical(self, canonical_sku: str) -> List[PricePoint]:
+        cheapest: dict[str, PricePoint] = {}
+        for price in self.data:
+            if price.canonical_sku != canonical_sku:
+                continue
+            current = cheapest.get(price.store.value)
+            if current is None or price.price < current.price:
+                cheapest[price.store.value] = price
+        return sorted(cheapest.values(), key=lambda p: p.price)
+
     def history_for_product(self, product_sku: str, limit: int = 30) -> List[PricePoint]:
         items = [p for p in self.data if p.product_sku == product_sku]
         return sorted(items, key=lambda p: p.timestamp, reverse=True)[:limit]
@@ -153,3 +165,66 @@ def test_compare_returns_cheapest_store():
     assert cheapest is not None
     assert cheapest.store == ShopName.AZTECH
     assert cheapest.price == 1100
+
+
+def test_compare_reads_offers_for_the_canonical_product():
+    prod_repo = InMemoryProductRepo()
+    price_repo = InMemoryPriceRepo()
+    canonical = "apple-iphone-15-128gb"
+    prod_repo.upsert(Product(sku="iphone-15-128gb-black", name="Apple iPhone 15 128GB Black", canonical_sku=canonical))
+    prod_repo.upsert(Product(sku="iphone-15-unmatched", name="iPhone 15"))
+    for sku, store, price in [
+        ("iphone-15-128gb-black", ShopName.NEPTUN, 1200),
+        ("celular-iphone-15-128gb", ShopName.GJIRAFAMALL, 1150),
+        ("iphone-15-unmatched", ShopName.AZTECH, 999),
+    ]:
+        price_repo.add_price(
+            PricePoint(
+                product_sku=sku,
+                store=store,
+                price=price,
+                currency="EUR",
+                product_url=f"http://shop.example/{sku}",
+                in_stock=True,
+                canonical_sku=canonical if sku != "iphone-15-unmatched" else None,
+            ),
+            "p1",
+            "s1",
+        )
+
+    service = ComparisonService(prod_repo, price_repo)
+    _, offers, cheapest = service.compare("iphone-15-128gb-black")
+    assert [offer.product_sku for offer in offers] == ["celular-iphone-15-128gb", "iphone-15-128gb-black"]
+    assert cheapest.store == ShopName.GJIRAFAMALL
+
+    # Products without a canonical SKU fall back to their own listing.
+    _, offers, _ = service.compare("iphone-15-unmatched")
+    assert [offer.store for offer in offers] == [ShopName.AZTECH]
+
+
+def test_price_cache_drops_entries_when_another_process_writes():
+    store = InMemoryPriceRepo()
+    cached = CachingPriceRepository(store, check_sec=0)
+
+    def point(price, day):
+        return PricePoint(
+            product_sku="iphone-15",
+            store=ShopName.NEPTUN,
+            price=price,
+            currency="EUR",
+            product_url="http://neptun.example/iphone-15",
+            in_stock=True,
+            timestamp=datetime(2024, 1, day),
+        )
+
+    store.add_price(point(1200, 1), "p1", "s1")
+    assert [p.price for p in cached.latest_for_product("iphone-15")] == [1200]
+
+    # A queue worker writes to the store directly, bypassing this cache instance.
+    store.data = [point(1100, 2)]
+    assert [p.price for p in cached.latest_for_product("iphone-15")] == [1100]
+
+    throttled = CachingPriceRepository(store, check_sec=3600)
+    assert [p.price for p in throttled.latest_for_product("iphone-15")] == [1100]
+    store.data = [point(1000, 3)]
+    assert [p.price for p in throttled.latest_for_product("iphone-15")] == [1100]
@@ -0,0 +1,514 @@
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+import httpx
+import pytest
+
+from app.domain.enums import ProductCategory, ShopName
+from app.domain.models import Product, ScraperCheckpoint, ScrapeRun, Shop
+from app.domain.repositories import BulkWriteResult, ScrapeRunRepository, ShopRepository
+from app.services.identity_map import IdentityMap
+from app.services.ingestion_service import IngestionService
+from app.services.scraping.base import BaseScraper, FetchedPage, ScrapedItem
+from app.services.scraping.engine import AsyncFetchEngine
+from tests.test_comparison_service import InMemoryPriceRepo, InMemoryProductRepo
+from tests.test_scraping_engine import FakePagedScraper
+
+
+class InMemoryShopRepo(ShopRepository):
+    def __init__(self):
+        self.data: dict[str, Shop] = {}
+
+    def upsert(self, shop: Shop) -> str:
+        self.data[shop.code.value] = shop
+        return shop.code.value
+
+    def list_shops(self) -> List[Shop]:
+        return list(self.data.values())
+
+    def get_by_code(self, code: str) -> Optional[Shop]:
+        return self.data.get(code)
+
+    def count(self) -> int:
+        return len(self.data)
+
+    def delete(self, code: str) -> bool:
+        return self.data.pop(code, None) is not None
+
+
+class CountingProductRepo(InMemoryProductRepo):
+    def __init__(self):
+        super().__init__()
+        self.bulk_calls = 0
+
+    def upsert(self, product):
+        if product.sku == "bad-product":
+            raise ValueError("rejected")
+        return super().upsert(product)
+
+    def upsert_many(self, products) -> BulkWriteResult:
+        self.bulk_calls += 1
+        return super().upsert_many(products)
+
+
+class CountingPriceRepo(InMemoryPriceRepo):
+    def __init__(self):
+        super().__init__()
+        self.bulk_calls = 0
+
+    def add_price(self, price, product_id, store_id):
+        if price.product_sku == "bad-price":
+            raise ValueError("duplicate key")
+        return super().add_price(price, product_id, store_id)
+
+    def add_prices(self, entries) -> BulkWriteResult:
+        self.bulk_calls += 1
+        return super().add_prices(entries)
+
+
+class StaticScraper(BaseScraper):
+    store = ShopName.AZTECH
+
+    def __init__(self, skus, store=ShopName.AZTECH, delay=0.0, names=None):
+        super().__init__()
+        self.skus = skus
+        self.store = store
+        self.delay = delay
+        self.names = names or {}
+
+    def base_url(self) -> str:
+        return "https://shop.test"
+
+    def parse_products(self, soup, url):
+        return []
+
+    def fetch(self):
+        for sku in self.skus:
+            time.sleep(self.delay)
+            yield ScrapedItem(
+                sku=sku,
+                name=self.names.get(sku, sku),
+                price=10.0,
+                currency="EUR",
+                product_url=f"https://shop.test/{sku}",
+                in_stock=True,
+            )
+
+
+def _service(products, prices, scraper, batch_size, **options):
+    return IngestionService(
+        product_repo=products,
+        shop_repo=InMemoryShopRepo(),
+        price_repo=prices,
+        scrapers=[scraper],
+        pricing_strategies=[],
+        batch_size=batch_size,
+        **options,
+    )
+
+
+def test_batched_ingest_flushes_in_bulk_and_reports_item_errors(caplog):
+    skus = ["a", "bad-product", "b", "bad-price", "c"]
+    products, prices = CountingProductRepo(), CountingPriceRepo()
+    service = _service(products, prices, StaticScraper(skus), batch_size=2)
+
+    with caplog.at_level(logging.WARNING):
+        (outcome,) = service.run_all()
+
+    assert products.bulk_calls == 3
+    assert prices.bulk_calls == 3
+    assert sorted(price.product_sku for price in prices.data) == ["a", "b", "c"]
+    assert {price.category for price in prices.data} == {ProductCategory.SMARTPHONE}
+    assert (outcome.items, outcome.errors) == (3, 2)
+    assert [(stage.name, stage.items) for stage in outcome.stages] == [("fetch", 5), ("normalize", 3), ("persist", 3)]
+    assert (outcome.metrics["items"], outcome.metrics["errors"], outcome.metrics["writes"]) == (3, 2, 3)
+    assert [stage["name"] for stage in outcome.metrics["stages"]] == ["fetch", "normalize", "persist"]
+    skipped = [record.getMessage() for record in caplog.records if record.getMessage().startswith("Skipping item")]
+    assert skipped == [
+        "Skipping item store=ShopName.AZTECH sku=bad-product error=rejected",
+        "Skipping item store=ShopName.AZTECH sku=bad-price error=duplicate key",
+    ]
+
+
+def test_unbatched_ingest_writes_each_item():
+    products, prices = CountingProductRepo(), CountingPriceRepo()
+    service = _service(products, prices, StaticScraper(["a", "bad-product", "b"]), batch_size=1, pipeline_queue_size=0)
+
+    (outcome,) = service.run_all()
+
+    assert outcome.stages == []
+    assert products.bulk_calls == prices.bulk_calls == 0
+    assert [price.product_sku for price in prices.data] == ["a", "b"]
+    assert "bad-product" not in products.data
+
+
+class TimedPriceRepo(InMemoryPriceRepo):
+    def __init__(self):
+        super().__init__()
+        self.written_at: list[float] = []
+
+    def add_prices(self, entries) -> BulkWriteResult:
+        self.written_at.append(time.monotonic())
+        return super().add_prices(entries)
+
+
+def test_pipeline_writes_while_later_pages_still_download():
+    downloaded: dict[str, float] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        page = request.url.params.get("page")
+        await asyncio.sleep(0.1 * int(page))
+        downloaded[page] = time.monotonic()
+        return httpx.Response(200, text=f'<div class="card">phone {page}</div>')
+
+    scraper = FakePagedScraper()
+    scraper.max_pages = 4
+    prices = TimedPriceRepo()
+    engine = AsyncFetchEngine(host_concurrency=4, retries=0, transport=httpx.MockTransport(handler))
+    service = _service(InMemoryProductRepo(), prices, scraper, batch_size=2, fetch_engine=engine)
+
+    (outcome,) = service.run_all()
+
+    assert outcome.items == 4 and outcome.error is None
+    # The first page is persisted before the last one has finished downloading.
+    assert prices.written_at[0] < downloaded["4"]
+
+
+class FailingScraper(StaticScraper):
+    def fetch(self):
+        raise RuntimeError("site down")
+
+
+def test_run_all_runs_stores_in_parallel_with_timeouts_and_progress():
+    products, prices = InMemoryProductRepo(), InMemoryPriceRepo()
+    scrapers = [
+        StaticScraper(["slow-1", "slow-2", "slow-3", "slow-4"], store=ShopName.NEPTUN, delay=0.2),
+        FailingScraper([], store=ShopName.SHOPAZ),
+        StaticScraper(["a", "b"], store=ShopName.AZTECH),
+    ]
+    service = IngestionService(
+        product_repo=products,
+        shop_repo=InMemoryShopRepo(),
+        price_repo=prices,
+        scrapers=scrapers,
+        pricing_strategies=[],
+        batch_size=1,
+        workers=3,
+        scraper_timeout_sec=0.3,
+        run_deadline_sec=5,
+    )
+    started, finished = [], []
+    lock = threading.Lock()
+
+    def on_start(scraper):
+        with lock:
+            started.append(scraper.store.value)
+
+    def on_done(scraper, outcome):
+        with lock:
+            finished.append(outcome.store)
+
+    outcomes = {outcome.store: outcome for outcome in service.run_all(on_start=on_start, on_done=on_done)}
+
+    assert sorted(started) == sorted(finished) == ["aztech", "neptun", "shopaz"]
+    assert outcomes["aztech"].items == 2 and outcomes["aztech"].error is None
+    assert outcomes["shopaz"].error == "site down"
+    assert outcomes["neptun"].error == "Scrape timed out"
+    assert 0 < outcomes["neptun"].items < 4
+    assert {price.product_sku for price in prices.data} >= {"a", "b", "slow-1"}
+
+
+def test_run_all_skips_scrapers_once_the_run_deadline_has_passed():
+    products, prices = InMemoryProductRepo(), InMemoryPriceRepo()
+    service = IngestionService(
+        product_repo=products,
+        shop_repo=InMemoryShopRepo(),
+        price_repo=prices,
+        scrapers=[
+            StaticScraper(["x", "y"], store=ShopName.NEPTUN, delay=0.15),
+            StaticScraper(["a"], store=ShopName.AZTECH),
+        ],
+        pricing_strategies=[],
+        batch_size=1,
+        workers=1,
+        scraper_timeout_sec=0,
+        run_deadline_sec=0.25,
+    )
+
+    outcomes = service.run_all()
+
+    assert outcomes[0].error == "Scrape timed out" and outcomes[0].items == 1
+    assert outcomes[1].error == "Run deadline exceeded" and outcomes[1].items == 0
+
+
+class HangingScraper(StaticScraper):
+    def fetch(self):
+        time.sleep(0.5)
+        yield from super().fetch()
+
+
+def test_run_stays_open_while_a_scraper_outlives_the_deadline():
+    ledger = InMemoryScrapeRunRepo()
+    service = IngestionService(
+        product_repo=InMemoryProductRepo(),
+        shop_repo=InMemoryShopRepo(),
+        price_repo=InMemoryPriceRepo(),
+        scrapers=[HangingScraper(["late"], store=ShopName.NEPTUN), StaticScraper(["a"])],
+        pricing_strategies=[],
+        batch_size=1,
+        workers=2,
+        scraper_timeout_sec=0.05,
+        run_deadline_sec=0.05,
+        run_ledger=ledger,
+    )
+
+    outcomes = service.run_all()
+
+    assert outcomes[0].error == "Run deadline exceeded"
+    (run,) = ledger.runs.values()
+    assert run.status == "running"
+
+
+def test_run_all_reports_every_scraper_once_when_it_stops_waiting():
+    scrapers = [
+        HangingScraper(["late"], store=ShopName.NEPTUN),
+        HangingScraper(["later"], store=ShopName.AZTECH),
+        StaticScraper(["never"], store=ShopName.GJIRAFAMALL),
+    ]
+    service = IngestionService(
+        product_repo=InMemoryProductRepo(),
+        shop_repo=InMemoryShopRepo(),
+        price_repo=InMemoryPriceRepo(),
+        scrapers=scrapers,
+        pricing_strategies=[],
+        workers=2,
+        scraper_timeout_sec=0.05,
+        run_deadline_sec=0.05,
+    )
+    reported: list[tuple[ShopName, str | None]] = []
+
+    service.run_all(on_done=lambda scraper, outcome: reported.append((scraper.store, outcome.error)))
+
+    # The third scraper never got a worker; the other two are still running.
+    assert sorted(reported) == sorted((scraper.store, "Run deadline exceeded") for scraper in scrapers)
+    time.sleep(0.6)
+    assert len(reported) == 3
+
+
+class InMemoryScrapeRunRepo(ScrapeRunRepository):
+    def __init__(self):
+        self.runs: dict[str, ScrapeRun] = {}
+        self.checkpoints: list[tuple[str, int, int]] = []
+
+    def start_run(self, started_at):
+        run = ScrapeRun(id=f"run-{len(self.runs) + 1}", started_at=started_at)
+        self.runs[run.id] = run
+        return run
+
+    def find_resumable(self, since):
+        running = [run for run in self.runs.values() if run.status == "running" and run.started_at >= since]
+        return max(running, key=lambda run: run.started_at, default=None)
+
+    def abandon_stale(self, before):
+        stale = [run for run in self.runs.values() if run.status == "running" and run.started_at < before]
+        for run in stale:
+            run.status = "abandoned"
+        return len(stale)
+
+    def checkpoint(self, run_id, scraper_key, cursor, items):
+        self.checkpoints.append((scraper_key, cursor, items))
+        state = self.runs[run_id].scrapers.setdefault(scraper_key, ScraperCheckpoint())
+        state.cursor, state.items = max(state.cursor, cursor), items
+
+    def finish_scraper(self, run_id, scraper_key, status, items, error=None, metrics=None):
+        state = self.runs[run_id].scrapers.setdefault(scraper_key, ScraperCheckpoint())
+        state.status, state.items, state.error, state.metrics = status, items, error, metrics
+
+    def finish_run(self, run_id, status="completed"):
+        self.runs[run_id].status = status
+
+    def recent_runs(self, limit=10):
+        return sorted(self.runs.values(), key=lambda run: run.started_at, reverse=True)[:limit]
+
+    def get_run(self, run_id):
+        return self.runs.get(run_id)
+
+
+class PagedStubScraper(BaseScraper):
+    store = ShopName.NEPTUN
+
+    def __init__(self, pages, store=ShopName.NEPTUN):
+        super().__init__()
+        self.pages = pages
+        self.store = store
+        self.fetched: list[str] = []
+
+    def base_url(self) -> str:
+        return f"https://{self.store.value}.test"
+
+    def parse_products(self, soup, url):
+        return []
+
+    def target_urls(self):
+        for number in range(1, len(self.pages) + 1):
+            yield f"{self.base_url()}/?page={number}"
+
+    def _fetch_page(self, url):
+        self.fetched.append(url)
+        return FetchedPage(url=url, html="")
+
+    def parse_fetched_page(self, page):
+        number = int(page.url.rsplit("=", 1)[1])
+        return [
+            ScrapedItem(sku=sku, name=sku, price=5.0, currency="EUR", product_url=f"{page.url}#{sku}", in_stock=True)
+            for sku in self.pages[number - 1]
+        ]
+
+
+def test_run_checkpoints_each_persisted_page():
+    ledger = InMemoryScrapeRunRepo()
+    scraper = PagedStubScraper([["a", "b", "c"], ["d", "e", "f"], ["g"]])
+    service = _service(InMemoryProductRepo(), InMemoryPriceRepo(), scraper, batch_size=2, run_ledger=ledger)
+
+    service.run_all()
+
+    # A page is only checkpointed by the batch that writes its last item.
+    assert ledger.checkpoints == [("PagedStubScraper", 1, 4), ("PagedStubScraper", 2, 6), ("PagedStubScraper", 3, 7)]
+    (run,) = ledger.runs.values()
+    assert run.status == "completed"
+    state = run.scrapers["PagedStubScraper"]
+    assert replace(state, metrics=None) == ScraperCheckpoint(cursor=3, items=7, status="done")
+    assert (state.metrics["pages"], state.metrics["items"], state.metrics["writes"]) == (3, 7, 7)
+
+
+def test_interrupted_run_resumes_after_the_last_committed_page():
+    ledger = InMemoryScrapeRunRepo()
+    started = datetime.now(timezone.utc) - timedelta(minutes=30)
+    interrupted = ledger.start_run(started)
+    interrupted.scrapers["PagedStubScraper"] = ScraperCheckpoint(cursor=2, items=6)
+    ledger.start_run(started - timedelta(days=2))
+    paged = PagedStubScraper([["a", "b", "c"], ["d", "e", "f"], ["g", "h"]])
+    finished = StaticScraper(["x"])
+    interrupted.scrapers[finished.key] = ScraperCheckpoint(items=1, status="done")
+    prices = InMemoryPriceRepo()
+    service = IngestionService(
+        product_repo=InMemoryProductRepo(),
+        shop_repo=InMemoryShopRepo(),
+        price_repo=prices,
+        scrapers=[paged, finished],
+        pricing_strategies=[],
+        batch_size=10,
+        run_ledger=ledger,
+    )
+
+    outcomes = service.run_all()
+
+    assert paged.fetched == ["https://neptun.test/?page=3"]
+    assert sorted(price.product_sku for price in prices.data) == ["g", "h"]
+    assert {price.timestamp for price in prices.data} == {started}
+    assert [(outcome.store, outcome.items) for outcome in outcomes] == [("neptun", 2), ("aztech", 1)]
+    assert interrupted.status == "completed"
+    assert replace(interrupted.scrapers["PagedStubScraper"], metrics=None) == ScraperCheckpoint(
+        cursor=3, items=8, status="done"
+    )
+    assert [run.status for run in ledger.runs.values()] == ["completed", "abandoned"]
+    assert len(ledger.runs) == 2
+
+
+class IdentityProductRepo(InMemoryProductRepo):
+    def __init__(self):
+        super().__init__()
+        self.upserted: list[str] = []
+
+    def upsert(self, product):
+        self.upserted.append(product.sku)
+        return super().upsert(replace(product, id=product.sku))
+
+    def list_identities(self):
+        return list(self.data.values())
+
+
+@pytest.mark.parametrize("batch_size", [1, 10])
+def test_identity_map_skips_upserts_for_unchanged_products(batch_size):
+    products, prices = IdentityProductRepo(), InMemoryPriceRepo()
+    shops = InMemoryShopRepo()
+    scraper = StaticScraper(["a", "b", "c"])
+    service = IngestionService(
+        product_repo=products,
+        shop_repo=shops,
+        price_repo=prices,
+        scrapers=[scraper],
+        pricing_strategies=[],
+        batch_size=batch_size,
+    )
+
+    service.run_all()
+    assert products.upserted == ["a", "b", "c"]
+
+    products.upserted.clear()
+    products.data["b"] = replace(products.data["b"], name="renamed")
+    service.run_all()
+
+    # Only the product whose stored fields differ from the scraped ones is written again.
+    assert products.upserted == ["b"]
+    assert products.data["b"].name == "b"
+    assert len(prices.data) == 6
+
+
+def test_identity_map_ignores_missing_images():
+    stored = Product(sku="a", name="A", brand="Apple", image_url="https://img/a.jpg", id="id-a")
+    identities = IdentityMap(products=[stored])
+
+    assert identities.product_id(Product(sku="a", name="A", brand="Apple")) == "id-a"
+    assert identities.product_id(Product(sku="a", name="A", brand="Apple", image_url="https://img/b.jpg")) is None
+
+    identities.remember_product(Product(sku="a", name="A", brand="Apple", image_urls=["https://img/c.jpg"]), "id-a")
+    assert identities.product_id(Product(sku="a", name="A", brand="Apple", image_url="https://img/a.jpg")) == "id-a"
+
+
+def test_identity_map_counts_lookups_from_concurrent_scrapers():
+    identities = IdentityMap(products=[Product(sku="a", name="A", id="id-a")])
+
+    def lookup():
+        for _ in range(2000):
+            identities.product_id(Product(sku="a", name="A"))
+            identities.product_id(Product(sku="a", name="B"))
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert (identities.hits, identities.misses) == (16000, 16000)
+
+
+def test_ingest_assigns_canonical_skus_across_stores():
+    products, prices = IdentityProductRepo(), InMemoryPriceRepo()
+    names = {"neptun-iphone": "Apple iPhone 15 128GB Black", "gjirafa-iphone": "Celular iPhone 15, 128GB, i zi"}
+    scrapers = [
+        StaticScraper(["neptun-iphone"], ShopName.NEPTUN, names=names),
+        StaticScraper(["gjirafa-iphone"], ShopName.GJIRAFAMALL, names=names),
+    ]
+    service = IngestionService(
+        product_repo=products,
+        shop_repo=InMemoryShopRepo(),
+        price_repo=prices,
+        scrapers=scrapers,
+        pricing_strategies=[],
+        workers=1,
+    )
+
+    service.run_all()
+
+    canonical = {product.canonical_sku for product in products.data.values()}
+    assert canonical == {"apple-iphone-15-128gb"}
+    assert {price.canonical_sku for price in prices.data} == canonical
+    assert [price.store for price in prices.latest_for_canonical("apple-iphone-15-128gb")] == [
+        ShopName.NEPTUN,
+        ShopName.GJIRAFAMALL,
+    ]
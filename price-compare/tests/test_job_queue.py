@@ -0,0 +1,210 @@
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.domain.enums import ShopName
+from app.domain.models import ScrapeJob
+from app.domain.repositories import ScrapeJobRepository
+from app.infrastructure.mongo.repositories import MongoScrapeJobRepository
+from app.services.ingestion_service import IngestionService
+from app.services.worker import ScrapeWorker
+from tests.test_comparison_service import InMemoryPriceRepo, InMemoryProductRepo
+from tests.test_ingestion_service import InMemoryScrapeRunRepo, InMemoryShopRepo, StaticScraper
+
+
+class InMemoryScrapeJobRepo(ScrapeJobRepository):
+    def __init__(self):
+        self.jobs: list[ScrapeJob] = []
+        self.claims: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def enqueue(self, jobs):
+        with self._lock:
+            for job in jobs:
+                job.id = f"job-{len(self.jobs) + 1}"
+                self.jobs.append(job)
+            return [job.id for job in jobs]
+
+    def claim(self, worker_id, now, lease_sec, max_attempts):
+        with self._lock:
+            for job in self.jobs:
+                expired = job.status == "running" and job.lease_expires_at < now
+                if (job.status == "queued" or expired) and job.attempts < max_attempts:
+                    job.status, job.worker_id = "running", worker_id
+                    job.lease_expires_at = now + timedelta(seconds=lease_sec)
+                    job.attempts += 1
+                    self.claims.append((worker_id, job.scraper_key))
+                    return replace(job)
+            return None
+
+    def fail_expired(self, now, max_attempts):
+        with self._lock:
+            run_ids = set()
+            for job in self.jobs:
+                expired = job.status == "running" and job.lease_expires_at < now
+                if expired and job.attempts >= max_attempts:
+                    job.status, job.error, job.worker_id = "failed", "Lease expired", None
+                    run_ids.add(job.run_id)
+            return sorted(run_ids)
+
+    def _held(self, job_id, worker_id):
+        job = next(job for job in self.jobs if job.id == job_id)
+        return job if job.worker_id == worker_id and job.status == "running" else None
+
+    def heartbeat(self, job_id, worker_id, lease_expires_at):
+        with self._lock:
+            job = self._held(job_id, worker_id)
+            if job is not None:
+                job.lease_expires_at = lease_expires_at
+            return job is not None
+
+    def complete(self, job_id, worker_id, status, items, error=None):
+        with self._lock:
+            job = self._held(job_id, worker_id)
+            if job is not None:
+                job.status, job.items, job.error = status, items, error
+                job.finished_at = datetime.now(timezone.utc)
+            return job is not None
+
+    def jobs_for_run(self, run_id):
+        return [replace(job) for job in self.jobs if job.run_id == run_id]
+
+    def latest_run_id(self):
+        return self.jobs[-1].run_id if self.jobs else None
+
+
+class AztechStub(StaticScraper):
+    pass
+
+
+class NeptunStub(StaticScraper):
+    pass
+
+
+class GjirafaStub(StaticScraper):
+    pass
+
+
+def _queued_service(prices, ledger):
+    # Jobs are addressed by scraper key (the class name), so each stub needs its own class.
+    scrapers = [
+        AztechStub(["a1", "a2"], ShopName.AZTECH, delay=0.02),
+        NeptunStub(["n1"], ShopName.NEPTUN, delay=0.02),
+        GjirafaStub(["g1", "g2"], ShopName.GJIRAFAMALL, delay=0.02),
+    ]
+    return IngestionService(
+        product_repo=InMemoryProductRepo(),
+        shop_repo=InMemoryShopRepo(),
+        price_repo=prices,
+        scrapers=scrapers,
+        pricing_strategies=[],
+        run_ledger=ledger,
+    )
+
+
+def test_workers_split_a_queued_run():
+    prices, ledger, jobs = InMemoryPriceRepo(), InMemoryScrapeRunRepo(), InMemoryScrapeJobRepo()
+    service = _queued_service(prices, ledger)
+
+    run_id = service.enqueue_run(jobs)
+    assert service.enqueue_run(jobs) == run_id
+    assert [job.scraper_key for job in jobs.jobs] == ["AztechStub", "NeptunStub", "GjirafaStub"]
+
+    workers = [ScrapeWorker(service, jobs, worker_id=f"w{n}", lease_sec=30) for n in (1, 2)]
+
+    def drain(worker):
+        while worker.run_once() is not None:
+            pass
+
+    threads = [threading.Thread(target=drain, args=(worker,)) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(key for _, key in jobs.claims) == ["AztechStub", "GjirafaStub", "NeptunStub"]
+    assert [(job.status, job.items) for job in jobs.jobs] == [("done", 2), ("done", 1), ("done", 2)]
+    assert sorted(price.product_sku for price in prices.data) == ["a1", "a2", "g1", "g2", "n1"]
+    run = ledger.runs[run_id]
+    assert run.status == "completed"
+    assert {price.timestamp for price in prices.data} == {run.started_at}
+    # A finished run lets the next schedule queue a fresh one.
+    assert service.enqueue_run(jobs) != run_id
+
+
+def test_expired_lease_is_reclaimed_and_exhausted_jobs_fail():
+    jobs = InMemoryScrapeJobRepo()
+    now = datetime.now(timezone.utc)
+    jobs.enqueue([ScrapeJob(run_id="run-1", scraper_key="Neptun", run_started_at=now)])
+
+    crashed = jobs.claim("w1", now, 60, max_attempts=2)
+    assert jobs.claim("w2", now, 60, max_attempts=2) is None
+
+    later = now + timedelta(seconds=61)
+    reclaimed = jobs.claim("w2", later, 60, max_attempts=2)
+    assert (reclaimed.id, reclaimed.attempts) == (crashed.id, 2)
+    assert not jobs.heartbeat(crashed.id, "w1", later)
+    assert not jobs.complete(crashed.id, "w1", "done", 3)
+
+    assert jobs.claim("w3", later + timedelta(seconds=61), 60, max_attempts=2) is None
+    assert jobs.fail_expired(later + timedelta(seconds=61), max_attempts=2) == ["run-1"]
+    assert [(job.status, job.error) for job in jobs.jobs_for_run("run-1")] == [("failed", "Lease expired")]
+
+
+def test_run_closes_when_its_last_job_fails_by_lease_expiry():
+    prices, ledger, jobs = InMemoryPriceRepo(), InMemoryScrapeRunRepo(), InMemoryScrapeJobRepo()
+    service = _queued_service(prices, ledger)
+    run_id = service.enqueue_run(jobs)
+
+    # A worker claims the first job on its only attempt and dies.
+    dead = jobs.claim("dead", datetime.now(timezone.utc), 0.3, max_attempts=1)
+    worker = ScrapeWorker(service, jobs, worker_id="w1", lease_sec=30, max_attempts=1)
+    while worker.run_once() is not None:
+        pass
+    assert [job.status for job in jobs.jobs] == ["running", "done", "done"]
+    assert ledger.runs[run_id].status == "running"
+
+    time.sleep(0.35)
+    assert worker.run_once() is None
+    assert [(job.id, job.status) for job in jobs.jobs if job.status == "failed"] == [(dead.id, "failed")]
+    assert ledger.runs[run_id].status == "completed"
+
+
+@pytest.fixture()
+def mongo_jobs(mongo_db):
+    return MongoScrapeJobRepository(mongo_db)
+
+
+def test_mongo_job_queue_hands_each_job_to_one_worker(mongo_jobs):
+    now = datetime.now(timezone.utc)
+    mongo_jobs.enqueue(
+        [ScrapeJob(run_id="run-1", scraper_key=key, run_started_at=now) for key in ("Aztech", "Neptun", "Gjirafa")]
+    )
+    claimed: list[ScrapeJob] = []
+    lock = threading.Lock()
+
+    def claim_all(worker_id):
+        while (job := mongo_jobs.claim(worker_id, now, 60, max_attempts=3)) is not None:
+            with lock:
+                claimed.append(job)
+
+    threads = [threading.Thread(target=claim_all, args=(f"w{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(job.scraper_key for job in claimed) == ["Aztech", "Gjirafa", "Neptun"]
+    job = claimed[0]
+    assert mongo_jobs.heartbeat(job.id, job.worker_id, now + timedelta(seconds=120))
+    assert mongo_jobs.claim("late", now + timedelta(seconds=90), 60, max_attempts=3).id != job.id
+    assert mongo_jobs.complete(job.id, job.worker_id, "done", 5)
+    assert not mongo_jobs.complete(job.id, job.worker_id, "done", 5)
+    statuses = {job.scraper_key: job.status for job in mongo_jobs.jobs_for_run("run-1")}
+    assert statuses[claimed[0].scraper_key] == "done"
+    assert mongo_jobs.latest_run_id() == "run-1"
+    assert mongo_jobs.fail_expired(now + timedelta(seconds=3600), max_attempts=1) == ["run-1"]
+    assert {job.status for job in mongo_jobs.jobs_for_run("run-1")} == {"done", "failed"}
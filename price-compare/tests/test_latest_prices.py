@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+
+from app.domain.enums import ProductCategory, ShopName
+from app.domain.models import PricePoint
+from app.infrastructure.mongo.repositories import MongoPriceRepository
+
+PRODUCT_ID, STORE_ID = str(ObjectId()), str(ObjectId())
+
+
+def _point(sku, store, price, timestamp, canonical_sku=None, category=None):
+    return PricePoint(
+        product_sku=sku,
+        store=store,
+        price=price,
+        currency="EUR",
+        product_url=f"https://shop.test/{sku}",
+        in_stock=True,
+        timestamp=timestamp,
+        canonical_sku=canonical_sku,
+        category=category,
+    )
+
+
+def _entries(*points):
+    return [(point, PRODUCT_ID, STORE_ID) for point in points]
+
+
+def test_latest_prices_follow_history_writes(mongo_db):
+    repo = MongoPriceRepository(mongo_db, dedup=True)
+    first = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    second = first + timedelta(hours=6)
+    repo.add_prices(
+        _entries(
+            _point("a1", ShopName.AZTECH, 900.0, first, canonical_sku="iphone-15"),
+            _point("n1", ShopName.NEPTUN, 950.0, first, canonical_sku="iphone-15"),
+        )
+    )
+    ids = repo.add_prices(
+        _entries(
+            _point("a1", ShopName.AZTECH, 880.0, second, canonical_sku="iphone-15"),
+            _point("n1", ShopName.NEPTUN, 950.0, second, canonical_sku="iphone-15"),
+        )
+    ).ids
+    # An out-of-order write of an older observation must not replace the newer one.
+    repo.add_price(_point("a1", ShopName.AZTECH, 999.0, first - timedelta(days=1)), PRODUCT_ID, STORE_ID)
+
+    latest = repo.latest_for_product("a1")
+    assert [(p.price, p.timestamp.replace(tzinfo=timezone.utc), p.id) for p in latest] == [(880.0, second, ids[0])]
+    # The unchanged Neptun price kept its point and only moved its sighting.
+    offers = repo.latest_prices_for_products(["a1", "n1"])
+    assert [(p.price, p.timestamp.replace(tzinfo=timezone.utc)) for p in offers["n1"]] == [(950.0, second)]
+    assert [p.store for p in repo.latest_for_canonical("iphone-15")] == [ShopName.AZTECH, ShopName.NEPTUN]
+    assert repo.latest_stores_for_products(["a1", "n1"]) == {"a1": ["aztech"], "n1": ["neptun"]}
+    assert mongo_db["latest_prices"].count_documents({}) == 2
+
+    before = {doc["price_id"]: doc["price"] for doc in mongo_db["latest_prices"].find()}
+    mongo_db["latest_prices"].delete_many({})
+    assert repo.ensure_latest() == 2
+    assert repo.ensure_latest() is None
+    assert {doc["price_id"]: doc["price"] for doc in mongo_db["latest_prices"].find()} == before
+
+    repo.delete_for_store(ShopName.NEPTUN.value)
+    assert repo.latest_prices_for_products(["n1"]) == {}
+
+
+def test_cheapest_by_category_reads_stamped_categories(mongo_db):
+    repo = MongoPriceRepository(mongo_db)
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    repo.add_prices(
+        _entries(
+            _point("phone", ShopName.AZTECH, 700.0, now, category=ProductCategory.SMARTPHONE),
+            _point("laptop", ShopName.AZTECH, 500.0, now, category=ProductCategory.LAPTOP),
+            _point("old-phone", ShopName.NEPTUN, 300.0, now),
+        )
+    )
+    # Written before categories were stamped: only the backfill makes it visible.
+    mongo_db["products"].insert_many(
+        [{"sku": sku, "name": sku, "category": "smartphone"} for sku in ("phone", "old-phone")]
+        + [{"sku": "laptop", "name": "laptop", "category": "laptop"}]
+    )
+    assert [p.product_sku for p in repo.cheapest_by_category("smartphone")] == ["phone"]
+
+    assert repo.backfill_categories(batch_size=1) == 1
+    assert repo.backfill_categories() == 0
+    assert repo.ensure_categories() is None
+    cheapest = repo.cheapest_by_category("smartphone", limit=5)
+    assert [(p.product_sku, p.category) for p in cheapest] == [
+        ("old-phone", ProductCategory.SMARTPHONE),
+        ("phone", ProductCategory.SMARTPHONE),
+    ]
+
+    assert repo.set_category("laptop", "smartphone") == 1
+    assert [p.product_sku for p in repo.cheapest_by_category("smartphone", limit=2)] == ["old-phone", "laptop"]
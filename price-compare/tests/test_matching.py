@@ -0,0 +1,55 @@
+from app.domain.models import Product
+from app.services.matching import MatchingIndex, extract_attributes
+
+
+def test_extracts_model_storage_and_colour_from_shop_titles():
+    attributes = extract_attributes("Samsung Galaxy S24 Ultra 5G SM-S928B 12GB/256GB Titanium Gray")
+
+    assert attributes.brand == "samsung"
+    assert attributes.model == ("galaxy", "s24", "ultra")
+    assert attributes.storage_gb == 256
+    assert attributes.colour == "titanium gray"
+    assert extract_attributes("Celular Apple iPhone 15, 128GB, i zi").colour == "black"
+    # A brand named in the title wins over the scraper's fallback brand.
+    assert extract_attributes("Redmi Note 13 Pro+ 512GB", brand="Apple").brand == "xiaomi"
+
+
+def test_matches_listings_across_shops_and_colours():
+    index = MatchingIndex()
+
+    first = index.match("apple-iphone-15-128gb-black", "Apple iPhone 15 128GB Black")
+    assert index.match("celular-iphone-15-128gb-i-zi", "Celular Apple iPhone 15, 128GB, i zi") == first
+    assert index.match("iphone-15-128-gb-blue", "iPhone 15 128 GB (Blue)", brand="Apple") == first
+    assert index.match("s24-ultra", "Samsung S24 Ultra 256GB Titanium Black") == index.match(
+        "galaxy-s24-ultra", "Samsung Galaxy S24 Ultra 5G 12GB/256GB Titanium Gray"
+    )
+
+    # Storage and variant words keep siblings apart.
+    assert index.match("iphone-15-256", "Apple iPhone 15 256GB Black") != first
+    assert index.match("iphone-15-plus", "Apple iPhone 15 Plus 128GB Black") != first
+    # Titles without a model number keep their own SKU.
+    assert index.match("spigen-case", "Spigen case") == "spigen-case"
+
+
+def test_index_restores_stored_matches():
+    stored = [
+        Product(sku="neptun-iphone", name="Apple iPhone 15 128GB", canonical_sku="apple-iphone-15-128gb"),
+        Product(sku="legacy", name="iPhone 15 128GB"),
+    ]
+    index = MatchingIndex.from_products(stored)
+
+    assert len(index) == 1
+    assert index.match("neptun-iphone", "renamed listing") == "apple-iphone-15-128gb"
+    assert index.match("gjirafa-iphone", "Apple iPhone 15 (128GB) Pink") == "apple-iphone-15-128gb"
+
+
+def test_listing_is_rematched_when_its_title_changes_model_or_storage():
+    stored = [Product(sku="neptun-iphone", name="Apple iPhone 15 128GB", canonical_sku="apple-iphone-15-128gb")]
+    index = MatchingIndex.from_products(stored)
+
+    # Colour or wording changes keep the stored match.
+    assert index.match("neptun-iphone", "Celular Apple iPhone 15, 128GB, i zi") == "apple-iphone-15-128gb"
+    # A corrected storage size moves the listing to the right product.
+    assert index.match("neptun-iphone", "Apple iPhone 15 256GB Black") == "apple-iphone-15-256gb"
+    assert index.match("gjirafa-iphone", "iPhone 15 256 GB", brand="Apple") == "apple-iphone-15-256gb"
+    assert index.match("neptun-iphone", "Apple iPhone 15 256GB Blue") == "apple-iphone-15-256gb"
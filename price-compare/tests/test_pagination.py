@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.domain.models import Product, User
+from app.domain.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.infrastructure.mongo.repositories import MongoProductRepository, MongoUserRepository
+
+
+def test_cursor_round_trips_sort_keys_and_rejects_garbage():
+    created = datetime(2026, 3, 1, 12, 30)
+    token = encode_cursor([created, "a@test", 2])
+    assert decode_cursor(token, 3) == [created, "a@test", 2]
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, 2)
+    with pytest.raises(InvalidCursor):
+        decode_cursor("%%%", 1)
+
+
+def _drain(fetch):
+    items, after, pages = [], None, 0
+    while True:
+        page = fetch(after)
+        items += page.items
+        pages += 1
+        if page.next_after is None:
+            return items, pages
+        after = page.next_after
+
+
+def test_mongo_keyset_pages_match_offset_listings(mongo_db):
+    products = MongoProductRepository(mongo_db)
+    for n in range(7):
+        # Duplicate names make the sku tie-breaker part of the cursor.
+        products.upsert(Product(sku=f"sku-{n}", name=f"iPhone {n % 3}"))
+    for query in (None, "iphone", "iphone 1"):
+        paged, pages = _drain(lambda after, query=query: products.page(query, limit=2, after=after))
+        assert [p.sku for p in paged] == [p.sku for p in products.search(query)]
+        assert pages == max(1, -(-len(paged) // 2))
+
+    users = MongoUserRepository(mongo_db)
+    start = datetime(2026, 1, 1)
+    for n in range(5):
+        users.create(User(email=f"user{n % 2}-{n}@test", password_hash="x", created_at=start + timedelta(days=n // 2)))
+    # Legacy accounts without created_at sort last and must still be reached across page boundaries.
+    users.collection.insert_many([{"email": f"legacy-{n}@test", "password_hash": "x"} for n in range(3)])
+    for limit in (1, 2, 3):
+        paged, _ = _drain(lambda after, limit=limit: users.page_users(limit=limit, after=after))
+        assert [u.email for u in paged] == [u.email for u in users.list_users(limit=0)]
+        assert [u.email for u in paged][-3:] == ["legacy-0@test", "legacy-1@test", "legacy-2@test"]
+    assert users.count() == 8
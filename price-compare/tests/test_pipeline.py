@@ -0,0 +1,72 @@
+import time
+
+import pytest
+
+from app.services.pipeline import StagedPipeline
+
+
+def test_pipeline_preserves_order_and_counts_items():
+    pipeline = StagedPipeline("test", "fetch", range(10))
+    pipeline.stage("double", lambda values: (value * 2 for value in values), maxsize=2)
+
+    assert list(pipeline.run("sink", maxsize=2)) == [value * 2 for value in range(10)]
+    assert [stage.name for stage in pipeline.metrics] == ["fetch", "double", "sink"]
+    assert [stage.items for stage in pipeline.metrics] == [10, 10, 10]
+
+
+def test_slow_sink_applies_backpressure_upstream():
+    produced = []
+
+    def source():
+        for value in range(6):
+            produced.append(value)
+            yield value
+
+    pipeline = StagedPipeline("test", "fetch", source())
+    for value in pipeline.run("persist", maxsize=1):
+        time.sleep(0.05)
+        # The source can only be a couple of hand-offs ahead of the slow consumer.
+        assert len(produced) <= value + 3
+
+    fetch, persist = pipeline.metrics
+    assert fetch.blocked_sec > 0.1
+    assert persist.busy_sec >= 0.25
+    assert persist.queue_max_depth <= 1
+
+
+def test_stage_stopping_early_stops_the_source():
+    produced = []
+
+    def source():
+        for value in range(1000):
+            produced.append(value)
+            yield value
+
+    def first_three(values):
+        for index, value in enumerate(values):
+            if index == 3:
+                return
+            yield value
+
+    pipeline = StagedPipeline("test", "fetch", source())
+    pipeline.stage("parse", first_three, maxsize=1)
+
+    assert list(pipeline.run("sink")) == [0, 1, 2]
+    assert len(produced) < 10
+
+
+def test_stage_errors_reach_the_caller():
+    def broken(values):
+        for value in values:
+            if value == 2:
+                raise ValueError("bad page")
+            yield value
+
+    pipeline = StagedPipeline("test", "fetch", range(5))
+    pipeline.stage("parse", broken)
+    received = []
+
+    with pytest.raises(ValueError, match="bad page"):
+        for value in pipeline.run("sink"):
+            received.append(value)
+    assert received == [0, 1]
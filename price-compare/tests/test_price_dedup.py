@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+
+from app.domain.enums import ShopName
+from app.infrastructure.mongo.repositories import MongoPriceRepository
+from tests.test_latest_prices import PRODUCT_ID, STORE_ID, _entries, _point
+
+START = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def _at(hours):
+    return START + timedelta(hours=hours)
+
+
+def _utc(value):
+    return value.replace(tzinfo=timezone.utc)
+
+
+def _history(repo, sku, limit=30):
+    return [(p.store, p.price, _utc(p.timestamp)) for p in repo.history_for_product(sku, limit=limit)]
+
+
+def _intervals(repo, sku):
+    return [(p.store, p.price, _utc(p.timestamp), _utc(p.last_seen_at)) for p in repo.history_for_product(sku)]
+
+
+def test_add_price_keeps_one_point_and_a_monotonic_heartbeat(mongo_db):
+    repo = MongoPriceRepository(mongo_db, dedup=True)
+    first = repo.add_price(_point("a1", ShopName.AZTECH, 900.0, _at(0)), PRODUCT_ID, STORE_ID)
+    assert repo.add_price(_point("a1", ShopName.AZTECH, 900.0, _at(2)), PRODUCT_ID, STORE_ID) == first
+    # A late write from an overlapping run must not move the heartbeat back.
+    assert repo.add_price(_point("a1", ShopName.AZTECH, 900.0, _at(1)), PRODUCT_ID, STORE_ID) == first
+
+    (stored,) = mongo_db["prices"].find()
+    assert _utc(stored["last_seen_at"]) == _at(2)
+    assert _utc(mongo_db["latest_prices"].find_one()["last_seen_at"]) == _at(2)
+    assert _utc(repo.latest_for_product("a1")[0].timestamp) == _at(2)
+
+    changed = repo.add_price(_point("a1", ShopName.AZTECH, 880.0, _at(3)), PRODUCT_ID, STORE_ID)
+    assert changed != first and repo.count() == 2
+    assert _intervals(repo, "a1") == [
+        (ShopName.AZTECH, 880.0, _at(3), _at(3)),
+        (ShopName.AZTECH, 900.0, _at(0), _at(2)),
+    ]
+
+
+def test_add_prices_folds_repeats_within_a_batch(mongo_db):
+    repo = MongoPriceRepository(mongo_db, dedup=True)
+    ids = repo.add_prices(
+        _entries(
+            _point("a1", ShopName.AZTECH, 900.0, _at(0)),
+            _point("a1", ShopName.AZTECH, 900.0, _at(1)),
+            _point("a1", ShopName.AZTECH, 880.0, _at(2)),
+            _point("a1", ShopName.AZTECH, 880.0, _at(3)),
+        )
+    ).ids
+
+    assert ids[0] == ids[1] and ids[2] == ids[3] and ids[0] != ids[2]
+    assert repo.count() == 2
+    assert _utc(repo.latest_for_product("a1")[0].timestamp) == _at(3)
+    assert [(price, seen) for _, price, _, seen in _intervals(repo, "a1")] == [(880.0, _at(3)), (900.0, _at(1))]
+
+
+def test_dedup_history_intervals_cover_every_run_without_growing_points(mongo_db):
+    runs = [
+        [("a1", ShopName.AZTECH, 900.0), ("a1", ShopName.NEPTUN, 950.0)],
+        [("a1", ShopName.AZTECH, 900.0), ("a1", ShopName.NEPTUN, 940.0)],
+        [("a1", ShopName.AZTECH, 900.0), ("a1", ShopName.NEPTUN, 940.0)],
+        [("a1", ShopName.AZTECH, 870.0)],
+        [("a1", ShopName.AZTECH, 870.0), ("a1", ShopName.NEPTUN, 940.0)],
+    ]
+    histories = []
+    for dedup in (False, True):
+        repo = MongoPriceRepository(mongo_db, dedup=dedup)
+        for hour, run in enumerate(runs):
+            repo.add_prices(_entries(*(_point(sku, store, price, _at(hour)) for sku, store, price in run)))
+        # Unchanged runs only move last_seen_at, so every stored point keeps the same fields.
+        (fields,) = {frozenset(doc) for doc in mongo_db["prices"].find()}
+        assert ("last_seen_at" in fields) == dedup
+        histories.append(repo.history_for_product("a1"))
+        mongo_db.drop_collection("prices")
+        mongo_db.drop_collection("latest_prices")
+
+    plain, deduped = histories
+    assert (len(plain), len(deduped)) == (9, 4)
+    for point in plain:
+        assert any(
+            (point.store, point.price) == (change.store, change.price)
+            and change.timestamp <= point.timestamp <= change.last_seen_at
+            for change in deduped
+        ), point
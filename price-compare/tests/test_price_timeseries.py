@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.domain.enums import ShopName
+from app.infrastructure.mongo.repositories import MongoPriceRepository, MongoTimeSeriesPriceRepository
+from tests.test_latest_prices import _entries, _point
+
+
+@pytest.fixture()
+def series_db(mongo_db):
+    if tuple(mongo_db.client.server_info()["versionArray"][:2]) < (6, 0):
+        pytest.skip("time-series backend needs MongoDB 6.0+")
+    return mongo_db
+
+
+def _utc(value):
+    return value.replace(tzinfo=timezone.utc)
+
+
+def test_timeseries_backend_stores_every_observation_under_sku_store_meta(series_db):
+    repo = MongoTimeSeriesPriceRepository(series_db, dedup=True)
+    start = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    ids = []
+    for hour in range(3):
+        ids += repo.add_prices(_entries(_point("a1", ShopName.AZTECH, 900.0, start + timedelta(hours=hour)))).ids
+
+    stored = series_db["price_series"].find_one()
+    assert stored["meta"] == {"sku": "a1", "store": "aztech"}
+    assert "product_sku" not in stored and "last_seen_at" not in stored
+    history = repo.history_for_product("a1")
+    assert [(p.id, _utc(p.timestamp)) for p in history] == [
+        (ids[2], start + timedelta(hours=2)),
+        (ids[1], start + timedelta(hours=1)),
+        (ids[0], start),
+    ]
+    (latest,) = repo.latest_for_product("a1")
+    assert (latest.id, _utc(latest.timestamp)) == (ids[2], start + timedelta(hours=2))
+    assert _utc(repo.latest_timestamp()) == start + timedelta(hours=2)
+
+    series_db["latest_prices"].delete_many({})
+    assert repo.rebuild_latest() == 1
+    assert repo.latest_for_product("a1")[0].id == ids[2]
+    assert repo.delete_for_store("aztech") == 3
+    assert repo.history_for_product("a1") == []
+
+
+def test_migration_copies_plain_history_with_ids_and_last_sightings(series_db):
+    plain = MongoPriceRepository(series_db, dedup=True)
+    start = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    for hour, price in [(0, 900.0), (1, 900.0), (2, 880.0), (3, 880.0)]:
+        plain.add_prices(_entries(_point("a1", ShopName.AZTECH, price, start + timedelta(hours=hour))))
+    assert plain.count() == 2
+
+    series = MongoTimeSeriesPriceRepository(series_db)
+    batches = list(series.migrate_from(series_db["prices"], batch_size=3))
+    assert sum(copied for copied, _ in batches) == 4
+    assert batches[-1][1] == series_db["prices"].find_one(sort=[("_id", -1)])["_id"]
+    assert [(p.price, _utc(p.timestamp)) for p in series.history_for_product("a1")] == [
+        (880.0, start + timedelta(hours=3)),
+        (880.0, start + timedelta(hours=2)),
+        (900.0, start + timedelta(hours=1)),
+        (900.0, start),
+    ]
+    # Points keep their ids, so the materialized latest prices still refer to them.
+    price_id = series_db["latest_prices"].find_one()["price_id"]
+    assert series_db["price_series"].count_documents({"_id": price_id}) == 1
+
+    # A crash before the checkpoint replays the batch; measurements already copied are skipped.
+    assert [copied for copied, _ in series.migrate_from(series_db["prices"], batch_size=10)] == [0]
+    assert series.count() == 4
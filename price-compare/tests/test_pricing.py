@@ -0,0 +1,66 @@
+from dataclasses import replace
+from datetime import datetime, timezone
+
+import pytest
+
+from app.domain.enums import ShopName
+from app.domain.models import PricePoint
+from app.services.pricing import (
+    NoOpPricingStrategy,
+    PricingStrategy,
+    apply_pricing_many,
+    apply_pricing_strategies,
+    default_pricing_strategies,
+)
+
+
+def _point(price, currency):
+    return PricePoint(
+        product_sku="iphone-15",
+        store=ShopName.AZTECH,
+        price=price,
+        currency=currency,
+        product_url="https://shop.test/iphone-15",
+        in_stock=True,
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+class StockOnlyWhenCheap(PricingStrategy):
+    """Per-item strategy without a batch implementation."""
+
+    def apply(self, price):
+        return replace(price, in_stock=price.price < 1000)
+
+
+def test_batch_matches_per_item_strategies():
+    strategies = default_pricing_strategies() + [StockOnlyWhenCheap(), NoOpPricingStrategy()]
+    rows = [(999.994, "eur"), (1200.5, None), (10.005, "usd")]
+
+    expected = [apply_pricing_strategies(_point(*row), strategies) for row in rows]
+    batched = apply_pricing_many([_point(*row) for row in rows], strategies)
+
+    assert batched == expected
+
+
+def test_batch_updates_points_in_place():
+    points = [_point(1.234, "eur"), _point(5.0, None)]
+
+    result = apply_pricing_many(points, default_pricing_strategies())
+
+    assert result[0] is points[0]
+    assert [(point.price, point.currency) for point in points] == [(1.23, "EUR"), (5.0, "EUR")]
+
+
+def test_failed_batch_leaves_points_untouched():
+    class Exploding(PricingStrategy):
+        def apply(self, price):
+            if price.price > 100:
+                raise ValueError("too expensive")
+            return price
+
+    points = [_point(1.234, "eur"), _point(500.0, "eur")]
+
+    with pytest.raises(ValueError):
+        apply_pricing_many(points, default_pricing_strategies() + [Exploding()])
+    assert [(point.price, point.currency) for point in points] == [(1.234, "eur"), (500.0, "eur")]
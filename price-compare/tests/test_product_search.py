@@ -0,0 +1,39 @@
+from app.domain.models import Product
+from app.domain.search import matches_query, search_tokens
+from app.infrastructure.mongo.repositories import MongoProductRepository
+
+
+def test_search_tokens_fold_case_accents_and_digit_runs():
+    assert search_tokens("Apple iPhone15 Pro 256GB – Çelik") == [
+        "apple", "iphone", "15", "pro", "256", "gb", "celik"
+    ]
+    assert search_tokens("  ") == []
+    assert matches_query("Apple iPhone 15 Pro Max", "iphone 15 pro m")
+    assert matches_query("Apple iPhone 15 Pro Max", "IPHONE15")
+    assert not matches_query("Apple iPhone 15 Pro Max", "phone 15")
+    assert not matches_query("Apple iPhone 15", ".*")
+    assert matches_query("Apple iPhone 15", None)
+
+
+def test_mongo_search_is_token_prefix_ordered_by_relevance(mongo_db):
+    # Stored before search tokens existed: the startup backfill fills them in.
+    mongo_db["products"].insert_one({"sku": "legacy", "name": "Samsung Galaxy S24", "category": "smartphone"})
+    repo = MongoProductRepository(mongo_db)
+    assert repo.backfill_search_fields() == 1
+    for sku, name in [
+        ("pro-max", "Apple iPhone 15 Pro Max 256GB"),
+        ("pro", "Apple iPhone 15 Pro"),
+        ("plain", "iPhone 15"),
+        ("case", "Silicone case for iPhone 15 (blue)"),
+        ("fifteen-hundred", "iPhone 150"),
+    ]:
+        repo.upsert(Product(sku=sku, name=name))
+
+    assert [p.sku for p in repo.search("iphone 15")] == ["plain", "pro", "case", "pro-max", "fifteen-hundred"]
+    assert [p.sku for p in repo.search("iphone 15 pro", limit=1, offset=1)] == ["pro-max"]
+    assert repo.count("iphone 15 pro") == 2
+    assert [p.sku for p in repo.search("galax")] == ["legacy"]
+    # Regex metacharacters are plain text, not patterns.
+    assert repo.search(".*") == [] and repo.count("(") == 0
+    assert repo.search("case (") == repo.search("case")
+    assert repo.count() == 6
@@ -1,7 +1,13 @@
+from html import escape
+
+import pytest
 from bs4 import BeautifulSoup
 
 from app.services.providers.aztech import AztechScraper
+from app.services.providers.neptun import NeptunKSScraper
 from app.services.providers.shopaz import ShopAzScraper
+from app.services.scraping.gallery import GalleryResolver
+from app.services.scraping.store import JsonFileStore
 
 
 def test_shopaz_scraper_parses_minimal_card():
@@ -146,3 +152,93 @@ def test_aztech_scraper_parses_search_template():
     assert item.price == 1699.00
     assert item.product_url.endswith("/apple-iphone-17-pro")
     assert item.image_url.startswith("https://")
+
+    # The selective parse keeps only the template subtree and must agree with a full parse.
+    assert scraper.parse_page("https://aztechonline.com", html) == items
+    scraper.parse_only = None
+    assert scraper.parse_page("https://aztechonline.com", html) == items
+
+
+def test_aztech_gallery_is_resolved_in_bulk_and_cached(tmp_path):
+    card = """
+    <div class="product-container">
+      <div class="title-container">
+        <a href="https://aztechonline.com/apple-iphone-{n}">Apple iPhone {n}</a>
+        <div class="product-price"><span>{n}99.00 EUR</span></div>
+      </div>
+    </div>
+    """
+    html = "".join(card.format(n=n) for n in (15, 16, 15))
+    gallery_html = '<div class="thumbnails"><img src="/media/{slug}.jpg" /></div>'
+    scraper = AztechScraper()
+    requested: list[str] = []
+    sessions: list = []
+
+    def fake_get(url: str) -> str:
+        requested.append(url)
+        sessions.append(scraper._http())
+        return gallery_html.format(slug=url.rsplit("/", 1)[-1])
+
+    scraper._get = fake_get
+    scraper.gallery_resolver = GalleryResolver(store=JsonFileStore(tmp_path, "galleries"), workers=2)
+
+    items = list(scraper.parse_products(BeautifulSoup(html, "lxml"), url="https://aztechonline.com"))
+    assert [item.gallery_url for item in items] == [
+        "https://aztechonline.com/apple-iphone-15",
+        "https://aztechonline.com/apple-iphone-16",
+        "https://aztechonline.com/apple-iphone-15",
+    ]
+
+    resolved = scraper.gallery_resolver.resolve(scraper, items)
+    assert sorted(requested) == ["https://aztechonline.com/apple-iphone-15", "https://aztechonline.com/apple-iphone-16"]
+    assert resolved[1].image_url == "https://aztechonline.com/media/apple-iphone-16.jpg"
+    assert all(item.gallery_url is None for item in resolved)
+    # Pool threads get their own sessions, still mounted on the scraper's adapters.
+    assert all(s is not scraper._session and s.adapters == scraper._session.adapters for s in sessions)
+
+    again = list(scraper.parse_products(BeautifulSoup(html, "lxml"), url="https://aztechonline.com"))
+    scraper.gallery_resolver.resolve(scraper, again)
+    assert len(requested) == 2
+    assert again[0].image_urls == ["https://aztechonline.com/media/apple-iphone-15.jpg"]
+
+
+def test_neptun_reads_model_variable_from_raw_html(monkeypatch):
+    model = (
+        '{\\"Category\\":{\\"Url\\":\\"smartphone\\"},\\"Products\\":['
+        '{\\"Title\\":\\"iPhone 15 pro 128GB\\",\\"ActualPrice\\":1099.5,'
+        '\\"Url\\":\\"iphone-15-pro\\",\\"Thumbnail\\":\\"/img/15.jpg\\"},'
+        '{\\"Title\\":\\"Maskë iPhone 15 \\u0026amp; case\\",\\"ActualPrice\\":9}]}'
+    )
+    html = f"""
+    <script>var productListModel = "{{}}";</script>
+    <script>window.shopCategoryModel = "{model}";</script>
+    """
+    scraper = NeptunKSScraper()
+    monkeypatch.setattr(scraper, "build_soup", lambda html: pytest.fail("soup should not be built"))
+
+    items = scraper.parse_page("https://www.neptun-ks.com/smartphone.nspx", html)
+
+    assert [(item.name, item.price) for item in items] == [("Apple iPhone 15 Pro 128GB", 1099.5)]
+    assert items[0].product_url == "https://www.neptun-ks.com/categories/iphone-15-pro"
+    assert items[0].image_url == "https://www.neptun-ks.com/img/15.jpg"
+
+
+def test_neptun_reads_angular_category_details_and_falls_back_to_cards():
+    details = '{"Products":[{"Title":"iPhone 16","ActualPrice":999,"Url":"iphone-16","Images":["/img/16.jpg"]}]}'
+    angular = f"""<div class="app" data-x='a > b' id="angularApp" data-categorydetails="{escape(details)}"></div>"""
+    cards = """
+    <div class="product-item">
+      <h3><a href="/iphone-13">iPhone 13</a></h3>
+      <span class="price">499,00 €</span>
+      <img src="/img/13.jpg" />
+    </div>
+    """
+    scraper = NeptunKSScraper()
+
+    from_details = scraper.parse_page("https://www.neptun-ks.com/smartphone.nspx", angular)
+    from_cards = scraper.parse_page("https://www.neptun-ks.com/smartphone.nspx", cards)
+
+    assert [(item.name, item.image_url) for item in from_details] == [
+        ("Apple iPhone 16", "https://www.neptun-ks.com/img/16.jpg")
+    ]
+    assert [(item.name, item.price) for item in from_cards] == [("Apple iPhone 13", 499.0)]
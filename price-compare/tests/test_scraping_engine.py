@@ -0,0 +1,347 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Future
+
+import httpx
+import pytest
+
+from app.domain.enums import ShopName
+from app.services.scraping.base import FetchedPage, PagedScraper, ScrapedItem, slugify_name
+from app.services.scraping.engine import AsyncFetchEngine
+from app.services.scraping.parse_pool import ParsePool
+from app.services.scraping.rate_limit import HostRateLimiter, TokenBucket, parse_host_rates
+from app.services.scraping.replay import FixtureArchive, ReplayTransport, install_recorder, install_replay
+from app.services.scraping.store import JsonFileStore
+
+
+class FakePagedScraper(PagedScraper):
+    store = ShopName.GJIRAFAMALL
+    max_pages = 3
+    host = "shop.test"
+
+    def __init__(self, pagination_store=None, http_cache=None, page_store=None) -> None:
+        super().__init__()
+        self.pagination_store = pagination_store
+        self.http_cache = http_cache
+        self.page_store = page_store
+        self.parse_calls = 0
+
+    def base_url(self) -> str:
+        return self.base_url_for_page(1)
+
+    def base_url_for_page(self, page: int) -> str:
+        return f"https://{self.host}/phones?page={page}"
+
+    def parse_products(self, soup, url):
+        self.parse_calls += 1
+        for card in soup.select(".card"):
+            name = card.get_text(strip=True)
+            yield ScrapedItem(
+                sku=slugify_name(name),
+                name=name,
+                price=100.0,
+                currency="EUR",
+                product_url=url,
+                in_stock=True,
+            )
+
+
+def _listing_transport(state: dict) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        state["in_flight"][host] = state["in_flight"].get(host, 0) + 1
+        state["peak"][host] = max(state["peak"].get(host, 0), state["in_flight"][host])
+        await asyncio.sleep(0.01)
+        state["in_flight"][host] -= 1
+        page = request.url.params.get("page")
+        return httpx.Response(200, text=f'<div class="card">{host} phone {page}</div>')
+
+    return httpx.MockTransport(handler)
+
+
+def test_engine_fetches_all_scrapers_with_host_limit():
+    state: dict = {"in_flight": {}, "peak": {}}
+    other = FakePagedScraper()
+    other.host = "other.test"
+    scrapers = [FakePagedScraper(), FakePagedScraper(), other]
+    engine = AsyncFetchEngine(host_concurrency=2, retries=0, transport=_listing_transport(state))
+
+    pages = engine.run(scrapers)
+
+    assert [len(scraper_pages) for scraper_pages in pages] == [3, 3, 3]
+    assert state["peak"]["shop.test"] <= 2
+    items = list(other.parse_pages(pages[2]))
+    assert [item.name for item in items] == ["other.test phone 1", "other.test phone 2", "other.test phone 3"]
+
+
+def test_fetch_and_parse_costs_are_recorded_per_scraper():
+    scraper = FakePagedScraper()
+    engine = AsyncFetchEngine(retries=0, transport=_listing_transport({"in_flight": {}, "peak": {}}))
+
+    (pages,) = engine.run([scraper])
+    list(scraper.parse_pages(pages))
+    list(scraper.parse_pages(pages[:1]))
+    metrics = scraper.metrics.as_dict(items=6, duration_sec=2.0)
+
+    assert (metrics["pages"], metrics["requests"], metrics["pages_replayed"]) == (3, 3, 1)
+    assert metrics["bytes"] == sum(len(page.html.encode()) for page in pages)
+    assert metrics["http_p50_ms"] >= 5 and metrics["http_p99_ms"] >= metrics["http_p50_ms"]
+    assert metrics["parse_cpu_sec"] > 0
+    assert metrics["items_per_sec"] == 3.0
+
+
+def test_engine_skips_failed_pages_and_retries_transient_errors():
+    calls: dict[str, int] = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = request.url.params.get("page")
+        calls[page] = calls.get(page, 0) + 1
+        if page == "2":
+            return httpx.Response(404)
+        if page == "3" and calls[page] == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, text=f'<div class="card">phone {page}</div>')
+
+    engine = AsyncFetchEngine(retries=1, backoff_sec=0, transport=httpx.MockTransport(handler))
+
+    (pages,) = engine.run([FakePagedScraper()])
+
+    assert [page.url.rsplit("=", 1)[-1] for page in pages] == ["1", "3"]
+    assert calls == {"1": 1, "2": 1, "3": 2}
+
+
+def test_async_fetch_stops_requesting_windows_after_the_listing_ends(tmp_path):
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = request.url.params.get("page")
+        requested.append(page)
+        return httpx.Response(200, text="" if page == "3" else f'<div class="card">phone {page}</div>')
+
+    scraper = FakePagedScraper(pagination_store=JsonFileStore(tmp_path, "pagination"))
+    scraper.max_pages = 8
+    engine = AsyncFetchEngine(host_concurrency=2, retries=0, transport=httpx.MockTransport(handler))
+
+    (pages,) = engine.run([scraper])
+
+    # Windows of two: page 3 ends the listing, so only its window-mate 4 is wasted.
+    assert sorted(requested) == ["1", "2", "3", "4"]
+    assert [page.url.rsplit("=", 1)[-1] for page in pages] == ["1", "2", "3"]
+    assert [item.name for item in scraper.parse_pages(pages)] == ["phone 1", "phone 2"]
+    # Pages checked while downloading are not parsed a second time.
+    assert scraper.parse_calls == 3
+
+    # With a learned budget of two pages the first window covers it in one round.
+    requested.clear()
+    engine.run([scraper])
+    assert sorted(requested) == ["1", "2", "3"]
+
+
+class CatalogScraper(FakePagedScraper):
+    max_pages = 5
+
+    def __init__(self, catalog: dict[int, str], pagination_store=None, page_store=None) -> None:
+        super().__init__(pagination_store, page_store=page_store)
+        self.catalog = catalog
+        self.requested: list[int] = []
+
+    def _fetch_page(self, url: str) -> FetchedPage:
+        page = int(url.rsplit("=", 1)[-1])
+        self.requested.append(page)
+        return FetchedPage(url=url, html=self.catalog.get(page, ""))
+
+
+def test_paged_scraper_stops_when_page_repeats_previous_items(tmp_path):
+    catalog = {
+        1: '<div class="card">phone a</div><div class="card">phone b</div>',
+        2: '<div class="card">phone c</div>',
+        3: '<div class="card">phone c</div>',
+    }
+    store = JsonFileStore(tmp_path, "pagination")
+    scraper = CatalogScraper(catalog, store)
+
+    names = [item.name for item in scraper.fetch()]
+
+    assert names == ["phone a", "phone b", "phone c", "phone c"]
+    assert scraper.requested == [1, 2, 3]
+    assert store.get(scraper.key) == {"pages": 2}
+
+    # The next run only probes one page past the last productive one.
+    scraper.requested = []
+    list(scraper.fetch())
+    assert scraper.requested == [1, 2, 3]
+    scraper.catalog = {1: catalog[1]}
+    scraper.requested = []
+    list(scraper.fetch())
+    assert scraper.requested == [1, 2]
+    assert store.get(scraper.key) == {"pages": 1}
+
+
+def test_paged_scraper_stops_at_last_page_reported_by_pager():
+    pager = '<a href="/phones?page=1">1</a><a href="/phones?page=2">2</a>'
+    catalog = {1: '<div class="card">phone a</div>' + pager, 2: '<div class="card">phone b</div>' + pager}
+    scraper = CatalogScraper(catalog)
+    scraper.page_param = "page"
+    scraper.stop_on_empty_page = False
+
+    names = [item.name for item in scraper.fetch()]
+
+    assert names == ["phone a", "phone b"]
+    assert scraper.requested == [1, 2]
+
+
+def test_conditional_get_replays_unchanged_pages(tmp_path):
+    seen_headers: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text='<div class="card">phone a</div>', headers={"ETag": '"v1"'})
+
+    scraper = FakePagedScraper(http_cache=JsonFileStore(tmp_path, "http"))
+    scraper.max_pages = 1
+    engine = AsyncFetchEngine(retries=0, transport=httpx.MockTransport(handler))
+
+    (first,) = engine.run([scraper])
+    first_items = list(scraper.parse_pages(first))
+    (second,) = engine.run([scraper])
+    second_items = list(scraper.parse_pages(second))
+
+    assert seen_headers == [None, '"v1"']
+    assert second[0].not_modified is True
+    assert second[0].html == first[0].html
+    assert [item.name for item in second_items] == [item.name for item in first_items] == ["phone a"]
+    assert scraper.parse_calls == 1
+
+
+def test_unchanged_page_body_replays_stored_items(tmp_path):
+    catalog = {1: '<div class="card">phone a</div><div class="card">phone b</div>'}
+    store = JsonFileStore(tmp_path, "pages")
+    scraper = CatalogScraper(catalog, page_store=store)
+    scraper.max_pages = 1
+
+    first = list(scraper.fetch())
+    # A fresh instance (as after a restart) reads the same store.
+    restarted = CatalogScraper(catalog, page_store=store)
+    restarted.max_pages = 1
+    second = list(restarted.fetch())
+    restarted.catalog = {1: '<div class="card">phone c</div>'}
+    third = list(restarted.fetch())
+
+    assert second == first
+    assert restarted.parse_calls == 1
+    assert [item.name for item in third] == ["phone c"]
+
+
+def test_http_cache_prunes_expired_then_least_recently_used_entries(tmp_path):
+    store = JsonFileStore(tmp_path, "http", max_entries=2, max_age_sec=3600)
+    for key in ("a", "b", "c", "d"):
+        store.set(key, {"body": key})
+    stale = time.time() - 7200
+    os.utime(store._path("a"), (stale, stale))
+    for age, key in enumerate(("d", "c", "b"), start=1):
+        os.utime(store._path(key), (time.time() - age, time.time() - age))
+    # Reading "b" marks it as recently used.
+    assert store.get("b") == {"body": "b"}
+
+    assert store.prune() == 2
+    assert [key for key in "abcd" if store.get(key)] == ["b", "d"]
+
+
+def test_token_bucket_allows_burst_then_spaces_requests():
+    bucket = TokenBucket(rate=10, burst=2)
+
+    waits = [bucket.reserve() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert 0.08 < waits[2] <= 0.1
+    assert 0.18 < waits[3] <= 0.2
+    assert TokenBucket(rate=0).reserve() == 0.0
+
+
+def test_host_rate_limiter_shares_buckets_and_applies_overrides():
+    limiter = HostRateLimiter(default_rate=5, host_rates=parse_host_rates("gjirafamall.com=2:4, bad, x.test=oops"))
+    listing = FakePagedScraper()
+    listing.rate_limiter = limiter
+    listing.rate_per_sec = 50
+    single = FakePagedScraper()
+    single.rate_limiter = limiter
+
+    assert listing.rate_bucket("https://www.gjirafamall.com/a") is single.rate_bucket("https://gjirafamall.com/b")
+    assert (limiter.bucket("https://gjirafamall.com/").rate, limiter.bucket("https://gjirafamall.com/").burst) == (2, 4)
+    # The first scraper to touch a host without an override sets its rate.
+    assert listing.rate_bucket("https://shop.test/").rate == 50
+    assert single.rate_bucket("https://shop.test/").rate == 50
+    assert limiter.bucket("https://other.test/").rate == 5
+    assert "x.test" not in limiter.host_rates
+
+
+def test_async_fetch_respects_host_rate():
+    scraper = FakePagedScraper()
+    scraper.rate_limiter = HostRateLimiter(default_rate=20, default_burst=1)
+    transport = _listing_transport({"in_flight": {}, "peak": {}})
+    engine = AsyncFetchEngine(host_concurrency=3, retries=0, transport=transport)
+
+    started = time.monotonic()
+    (pages,) = engine.run([scraper])
+
+    assert len(pages) == 3
+    # Three requests at 20/s with a burst of one need at least two refill intervals.
+    assert time.monotonic() - started >= 0.09
+
+
+def test_recorded_fixtures_replay_offline(tmp_path):
+    live = FixtureArchive(tmp_path / "live")
+    live.save("https://shop.test/phones?page=1", 200, '<div class="card">phone a</div>')
+    live.save("https://shop.test/phones?page=2", 200, '<div class="card">phone b</div>', {"ETag": '"2"', "Server": "x"})
+    # Stand in for the network: the recorder wraps whatever adapter the session already has.
+    recording = FakePagedScraper()
+    install_replay(recording, live)
+    recorded = FixtureArchive(tmp_path / "recorded")
+    install_recorder(recording, recorded)
+
+    names = [item.name for item in recording.fetch()]
+
+    assert names == ["phone a", "phone b"]
+    assert len(recorded) == 2
+    assert recorded.get("https://shop.test/phones?page=2")["headers"] == {"ETag": '"2"'}
+
+    replayed = FakePagedScraper()
+    install_replay(replayed, recorded)
+    assert [item.name for item in replayed.fetch()] == names
+    (pages,) = AsyncFetchEngine(retries=0, transport=ReplayTransport(recorded)).run([FakePagedScraper()])
+    assert [page.html for page in pages] == ['<div class="card">phone a</div>', '<div class="card">phone b</div>']
+
+
+def test_prepared_pages_are_parsed_in_worker_processes():
+    pages = [
+        FetchedPage(url=f"https://shop.test/phones?page={n}", html=f'<div class="card">phone {n}</div>') for n in (1, 2)
+    ]
+    pool = ParsePool(workers=2)
+    scraper = FakePagedScraper()
+    try:
+        scraper.prepare_pages(pages, pool)
+        # A page whose body changed after it was queued is parsed again locally.
+        pages[1] = FetchedPage(url=pages[1].url, html='<div class="card">phone 2b</div>')
+        names = [item.name for item in scraper.parse_pages(pages)]
+    finally:
+        pool.shutdown()
+
+    assert names == ["phone 1", "phone 2b"]
+    assert scraper.parse_calls == 1
+
+
+def test_worker_parse_is_not_awaited_past_the_scraper_deadline():
+    page = FetchedPage(url="https://shop.test/phones?page=1", html='<div class="card">phone 1</div>')
+    scraper = FakePagedScraper()
+    hung: Future = Future()
+    scraper._parse_futures[page.url] = (scraper._page_fingerprint(page.html), hung)
+    scraper.deadline = time.monotonic() + 0.05
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError, match="Scrape timed out"):
+        scraper.parse_fetched_page(page)
+    assert time.monotonic() - started < 1
+    assert hung.cancelled()